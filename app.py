@@ -1,6 +1,33 @@
 import argparse
+import json
+import multiprocessing
+import os
+import sys
+from typing import Literal
+
+from src.chair_calculator.cache import ResultCache
+from src.chair_calculator.output import OUTPUT_FORMATS, StatsWriter
+from src.chair_calculator.profiling import Profile
+from src.chair_calculator_batch import chairs_per_room_files, plan_file_paths
+from src.chair_calculator_building import building_stats, chairs_per_floor, read_floors
+from src.chair_calculator_main import (
+    chair_stats_diff,
+    chair_stats_file,
+    chair_stats_incremental,
+    chair_stats_selected,
+)
+from src.chair_calculator_server import serve
+from src.chair_calculator_worker import run_worker
+
+
+def server_address(text: str) -> tuple[str, int]:
+    """Parses the server address given as HOST:PORT or PORT."""
+    host, _separator, port = text.rpartition(":")
+    try:
+        return host or "127.0.0.1", int(port)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"The address must be given as HOST:PORT, '{text}' found.")
 
-from src.chair_calculator_main import chairs_per_room
 
 if __name__ == "__main__":
     """This is the main entry point of the application.
@@ -8,16 +35,278 @@ if __name__ == "__main__":
     It processes command line arguments, then calculates and prints chair type statistics for apartment and per room.
     """
 
+    # Worker processes of the binary built with PyInstaller start from this entry point
+    multiprocessing.freeze_support()
+
     parser = argparse.ArgumentParser(description="Prints the chair statistics of the floor plan.")
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument(
+        "--file",
+        metavar="file_path",
+        type=str,
+        nargs="+",
+        help="path to a file with the floor plan, several files, directories, or glob patterns "
+        "can be given to process them in parallel",
+    )
+    source.add_argument(
+        "--serve",
+        metavar="host:port",
+        type=server_address,
+        nargs="?",
+        const=("127.0.0.1", 8080),
+        help="run the HTTP server answering POST /chairs requests having the floor plan in the body "
+        "with the JSON statistics, defaults to 127.0.0.1:8080",
+    )
+    source.add_argument(
+        "--diff",
+        metavar=("old_file_path", "new_file_path"),
+        type=str,
+        nargs=2,
+        help="print the change of the chair statistics in the revised floor plan, in total and for each "
+        "changed room, relabeling only the rooms around the changed cells",
+    )
+    source.add_argument(
+        "--worker",
+        action="store_true",
+        help="read floor plans separated with the NUL character from the standard input until it ends, "
+        "and print one JSON line with the statistics or the error for each plan as soon as it's done",
+    )
+    input_mode = parser.add_mutually_exclusive_group()
+    input_mode.add_argument(
+        "--stream",
+        action="store_true",
+        help="read the floor plan line by line keeping memory bounded by the plan width, "
+        "room labels must fit in one line",
+    )
+    input_mode.add_argument(
+        "--mmap",
+        action="store_true",
+        help="map the floor plan file to memory instead of reading it, each byte is one cell of the plan",
+    )
     parser.add_argument(
-        "--file", metavar="file_path", type=str, help="path to a file with the floor plan", required=True
+        "--workers",
+        metavar="count",
+        type=int,
+        default=None,
+        help="number of worker processes for many files or the server, defaults to the number of CPUs",
+    )
+    parser.add_argument(
+        "--chunksize", metavar="count", type=int, default=1, help="number of files sent to a worker at once"
+    )
+    parser.add_argument(
+        "--tiles",
+        metavar="count",
+        type=int,
+        default=None,
+        help="split a single large plan into row bands labeled in parallel processes, not used with --stream",
+    )
+    parser.add_argument(
+        "--cache-dir",
+        metavar="dir_path",
+        type=str,
+        default=None,
+        help="directory to cache the statistics of the plans between runs, not used with --stream and --mmap",
+    )
+    parser.add_argument(
+        "--cache-size",
+        metavar="count",
+        type=int,
+        default=10000,
+        help="maximum number of the plans in the cache or in the memory of the server, "
+        "the least recently used are evicted",
+    )
+    parser.add_argument(
+        "--max-body-size",
+        metavar="bytes",
+        type=int,
+        default=16 * 1024 * 1024,
+        help="maximum size of the floor plan sent to the server, larger ones are rejected with 413 status",
+    )
+    parser.add_argument(
+        "--max-pending",
+        metavar="count",
+        type=int,
+        default=None,
+        help="maximum number of requests the server handles at once, more are rejected with 503 status, "
+        "defaults to four per worker",
+    )
+
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="print the statistics of each room as soon as its region is read, and the total after them, "
+        "reading the file line by line as with --stream, works with a single file",
+    )
+    parser.add_argument(
+        "--room",
+        metavar="name",
+        type=str,
+        action="append",
+        dest="rooms",
+        help="print the statistics only of this room, can be repeated, only the regions of the selected rooms "
+        "are filled and validated, works with a single file",
+    )
+    parser.add_argument(
+        "--total",
+        action="store_true",
+        help="print the total for apartment with the selected rooms, calculating every room of the plan",
+    )
+    parser.add_argument(
+        "--building",
+        action="store_true",
+        help="the file has the plans of many floors, each starting after the '=== name ===' line, "
+        "floors are processed in parallel worker processes and rolled up to the building total",
+    )
+    parser.add_argument(
+        "--format",
+        choices=OUTPUT_FORMATS,
+        default="text",
+        help="output format, json is an object with the total and rooms statistics, jsonl and csv have "
+        "one record per line for the total and each room, records have the file path for many files",
+    )
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="print the JSON report with the time and the peak memory of each phase of the calculation "
+        "to the standard error output, works with a single file",
     )
 
     args = parser.parse_args()
 
-    file_path = args.file
+    if args.serve is not None:
+        host, port = args.serve
+        try:
+            serve(
+                host,
+                port,
+                workers=args.workers,
+                max_body_size=args.max_body_size,
+                max_pending=args.max_pending,
+                cache_size=args.cache_size,
+            )
+        except (OSError, ValueError) as e:
+            print(e, file=sys.stderr)
+            sys.exit(1)
+        sys.exit(0)
+
+    if args.worker:
+        sys.exit(1 if run_worker(sys.stdin.buffer, sys.stdout) > 0 else 0)
+
+    if args.diff is not None:
+        old_file_path, new_file_path = args.diff
+        try:
+            with open(old_file_path, "r") as old_file, open(new_file_path, "r") as new_file:
+                delta = chair_stats_diff(old_file.read(), new_file.read())
+        except (OSError, ValueError) as e:
+            print(e, file=sys.stderr)
+            sys.exit(1)
+        with StatsWriter(sys.stdout, args.format) as writer:
+            writer.write(delta)
+        sys.exit(0)
+
+    mode: Literal["read", "stream", "mmap"] = "mmap" if args.mmap else "stream" if args.stream else "read"
+
+    is_single_file = len(args.file) == 1 and os.path.isfile(args.file[0])
+
+    if args.profile and not is_single_file:
+        parser.error("the --profile option works with a single file")
+
+    if args.incremental:
+        if not is_single_file or args.mmap or args.rooms is not None or args.building or args.profile:
+            parser.error(
+                "the --incremental option works with a single file without --mmap, --room, --building, and --profile"
+            )
+
+        with StatsWriter(sys.stdout, args.format) as writer:
+            try:
+                writer.write_records(chair_stats_incremental(args.file[0]))
+            except (OSError, ValueError) as e:
+                print(e, file=sys.stderr)
+                sys.exit(1)
+        sys.exit(0)
+
+    if args.total and args.rooms is None:
+        parser.error("the --total option works with --room")
+
+    if args.rooms is not None:
+        if not is_single_file or mode != "read":
+            parser.error("the --room option works with a single file read into memory")
+
+        profile = Profile(trace_memory=True) if args.profile else None
+        try:
+            with open(args.file[0], "r") as file:
+                stats = chair_stats_selected(file.read(), args.rooms, with_total=args.total, profile=profile)
+        except (OSError, ValueError) as e:
+            print(e, file=sys.stderr)
+            sys.exit(1)
+        with StatsWriter(sys.stdout, args.format) as writer:
+            writer.write(stats)
+        if profile is not None:
+            print(json.dumps(profile.report(), indent=2), file=sys.stderr)
+        sys.exit(0)
+
+    if args.building:
+        if not is_single_file:
+            parser.error("the --building option works with a single file")
+
+        has_errors = False
+        floor_stats = []
+        with open(args.file[0], "r") as building_file:
+            floor_results = chairs_per_floor(
+                read_floors(building_file),
+                workers=args.workers,
+                cache_dir=args.cache_dir,
+                cache_size=args.cache_size,
+            )
+            with StatsWriter(sys.stdout, args.format, with_file_path=True) as writer:
+                try:
+                    for floor_result in floor_results:
+                        if floor_result.stats is not None:
+                            floor_stats.append(floor_result.stats)
+                            writer.write(floor_result.stats, floor_result.floor)
+                        else:
+                            has_errors = True
+                            print(f"{floor_result.floor}: {floor_result.error}", file=sys.stderr, flush=True)
+                except ValueError as e:
+                    has_errors = True
+                    print(f"{args.file[0]}: {e}", file=sys.stderr, flush=True)
+
+                if not has_errors:
+                    writer.write(building_stats(floor_stats), args.file[0])
+
+        if has_errors:
+            sys.exit(1)
+        sys.exit(0)
 
-    with open(file_path, "r") as file:
-        plan_content = file.read()
+    if is_single_file:
+        cache = ResultCache(args.cache_dir, args.cache_size) if args.cache_dir is not None else None
+        profile = Profile(trace_memory=True) if args.profile else None
+        stats = chair_stats_file(args.file[0], mode, cache, args.tiles, profile)
+        with StatsWriter(sys.stdout, args.format) as writer:
+            if profile is not None:
+                with profile.phase("output"):
+                    writer.write(stats)
+                print(json.dumps(profile.report(), indent=2), file=sys.stderr)
+            else:
+                writer.write(stats)
+    else:
+        has_errors = False
+        file_paths = plan_file_paths(args.file)
+        results = chairs_per_room_files(
+            file_paths,
+            workers=args.workers,
+            chunksize=args.chunksize,
+            input_mode=mode,
+            cache_dir=args.cache_dir,
+            cache_size=args.cache_size,
+        )
+        with StatsWriter(sys.stdout, args.format, with_file_path=True) as writer:
+            for result in results:
+                if result.stats is not None:
+                    writer.write(result.stats, result.file_path)
+                else:
+                    has_errors = True
+                    print(f"{result.file_path}: {result.error}", file=sys.stderr, flush=True)
 
-    print(chairs_per_room(plan_content))
+        if has_errors:
+            sys.exit(1)
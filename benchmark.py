@@ -0,0 +1,69 @@
+import argparse
+import json
+import sys
+
+from src.benchmark.plan_generator import LABEL_PLACEMENTS, WALL_STYLES
+from src.benchmark.runner import run_benchmark
+
+
+def plan_size(text: str) -> tuple[int, int]:
+    """Parses the floor plan size given as WIDTHxHEIGHT."""
+    try:
+        width, height = map(int, text.lower().split("x"))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"The size must be given as WIDTHxHEIGHT, '{text}' found.")
+
+    return width, height
+
+
+if __name__ == "__main__":
+    """This is the entry point of the benchmark.
+
+    It generates floor plans of each size, times each phase of the chair statistics calculation,
+    and writes the results as JSON lines.
+    """
+
+    parser = argparse.ArgumentParser(description="Times the chair statistics calculation for generated floor plans.")
+    parser.add_argument(
+        "--sizes",
+        metavar="WIDTHxHEIGHT",
+        type=plan_size,
+        nargs="+",
+        default=[(64, 64), (128, 128), (256, 256), (512, 512), (1024, 1024)],
+        help="sizes of the floor plans to generate",
+    )
+    parser.add_argument(
+        "--rooms", metavar="count", type=int, default=None, help="number of rooms, defaults to one per 400 cells"
+    )
+    parser.add_argument("--wall-style", choices=WALL_STYLES, default="straight", help="style of the walls")
+    parser.add_argument(
+        "--chair-density", metavar="share", type=float, default=0.05, help="share of the floor cells having a chair"
+    )
+    parser.add_argument(
+        "--label-placement", choices=LABEL_PLACEMENTS, default="center", help="where to place the label in the room"
+    )
+    parser.add_argument("--repeats", metavar="count", type=int, default=3, help="number of timed runs of each plan")
+    parser.add_argument("--seed", metavar="number", type=int, default=0, help="seed of the plan generator")
+    parser.add_argument(
+        "--output", metavar="file_path", type=str, default=None, help="file to write the results to, default stdout"
+    )
+
+    args = parser.parse_args()
+
+    results = run_benchmark(
+        args.sizes,
+        rooms=args.rooms,
+        wall_style=args.wall_style,
+        chair_density=args.chair_density,
+        label_placement=args.label_placement,
+        repeats=args.repeats,
+        seed=args.seed,
+    )
+
+    output = open(args.output, "w") if args.output is not None else sys.stdout
+    try:
+        for result in results:
+            print(json.dumps(result._asdict()), file=output, flush=True)
+    finally:
+        if output is not sys.stdout:
+            output.close()
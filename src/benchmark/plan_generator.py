@@ -0,0 +1,211 @@
+import heapq
+import itertools
+import math
+import random
+from typing import Iterator
+
+from src.chair_calculator.constants import Constants
+from src.chair_calculator.validator import WallMap
+
+WALL_STYLES = ("straight", "diagonal")
+LABEL_PLACEMENTS = ("center", "corner", "random")
+
+# Number of random positions tried for the label before scanning the room in the reading order
+_RANDOM_LABEL_TRIES = 32
+
+
+def generate_floor_plan(
+    width: int,
+    height: int,
+    rooms: int = 1,
+    wall_style: str = "straight",
+    chair_density: float = 0.05,
+    label_placement: str = "center",
+    seed: int = 0,
+) -> str:
+    """Generates the valid floor plan with rectangular rooms for benchmarking.
+
+    The plan is split into rooms recursively, walls are drawn with `-` and `|` characters
+    and joined with `+` characters. With the "diagonal" wall style, one corner of each room is cut
+    with a `/` or `\\` wall. Each room gets the "(room N)" label, and the chairs are spread
+    over the floor cells having a margin from walls. The same arguments give the same plan.
+
+    Args:
+        width (int): The width of the floor plan.
+        height (int): The height of the floor plan.
+        rooms (int): The number of rooms.
+        wall_style (str): The style of walls, one of WALL_STYLES.
+        chair_density (float): The share of the floor cells with a margin from walls having a chair.
+        label_placement (str): Where to place the label in the room, one of LABEL_PLACEMENTS.
+        seed (int): The seed of the random generator.
+
+    Returns:
+        str: The floor plan text.
+
+    Raises:
+        ValueError: If the wall style or the label placement is unknown, the chair density is out of [0, 1] range,
+            or the floor plan is too small for the given number of rooms.
+    """
+    if wall_style not in WALL_STYLES:
+        raise ValueError(f"The wall style must be one of {', '.join(map(repr, WALL_STYLES))}.")
+
+    if label_placement not in LABEL_PLACEMENTS:
+        raise ValueError(f"The label placement must be one of {', '.join(map(repr, LABEL_PLACEMENTS))}.")
+
+    if not 0 <= chair_density <= 1:
+        raise ValueError("The chair density must be in the range from 0 to 1.")
+
+    rng = random.Random(seed)
+    label_width = len(f"(room {rooms})")
+    # The interior of the room fits the label with the margin and the diagonal wall in the corner
+    min_inner_width = label_width + 2 + (3 if wall_style == "diagonal" else 0)
+    min_inner_height = 3 + (2 if wall_style == "diagonal" else 0)
+
+    if rooms < 1 or width - 2 < min_inner_width or height - 2 < min_inner_height:
+        raise ValueError(f"The floor plan is too small for {rooms} rooms.")
+
+    rects = _split_rooms(rng, (0, 0, width - 1, height - 1), rooms, min_inner_width, min_inner_height)
+
+    grid = [[Constants.FLOOR_CHAR] * width for _y in range(height)]
+    for rect in rects:
+        _draw_walls(grid, rect)
+    if wall_style == "diagonal":
+        for rect in rects:
+            _draw_diagonal(grid, rect, rng.randrange(4))
+
+    walls_plan = ["".join(row) for row in grid]
+    wall_map = WallMap(walls_plan)
+
+    label_cells: set[tuple[int, int]] = set()
+    for room_idx, rect in enumerate(rects, start=1):
+        label = f"(room {room_idx})"
+        label_x, label_y = _label_position(rng, walls_plan, wall_map, rect, len(label), label_placement)
+        grid[label_y][label_x : label_x + len(label)] = label
+        label_cells.update((x, label_y) for x in range(label_x, label_x + len(label)))
+
+    if chair_density > 0:
+        # Jump between the cells getting a chair, the gaps between them are geometrically distributed,
+        # so sparse chairs don't cost a random number per cell.
+        log_miss = math.log(1 - chair_density) if chair_density < 1 else None
+        cell = -1
+        while True:
+            cell += 1 if log_miss is None else 1 + int(math.log(1 - rng.random()) / log_miss)
+            if cell >= width * height:
+                break
+            y, x = divmod(cell, width)
+            is_floor = grid[y][x] == Constants.FLOOR_CHAR and (x, y) not in label_cells
+            if is_floor and not wall_map.touches_wall(x, y):
+                grid[y][x] = rng.choice(Constants.CHAIR_CHARS)
+
+    return "\n".join("".join(row) for row in grid)
+
+
+def _split_rooms(
+    rng: random.Random, outer: tuple[int, int, int, int], rooms: int, min_inner_width: int, min_inner_height: int
+) -> list[tuple[int, int, int, int]]:
+    # Splits the outer rectangle (x0, y0, x1, y1) of walls into the given number of rectangles sharing walls,
+    # the largest rectangle is split along its longer side each time.
+    def area(rect):
+        x0, y0, x1, y1 = rect
+        return (x1 - x0) * (y1 - y0)
+
+    # The heap of rectangles to split ordered by the largest area first and then by the order of creation
+    heap = [(-area(outer), 0, outer)]
+    done: list[tuple[int, int, int, int]] = []
+    created = 1
+    while len(heap) + len(done) < rooms:
+        if not heap:
+            raise ValueError(f"The floor plan is too small for {rooms} rooms.")
+
+        _area, _order, rect = heapq.heappop(heap)
+        x0, y0, x1, y1 = rect
+        # Range of the wall positions leaving both parts large enough
+        x_low, x_high = x0 + min_inner_width + 1, x1 - min_inner_width - 1
+        y_low, y_high = y0 + min_inner_height + 1, y1 - min_inner_height - 1
+        can_split_x = x_low <= x_high
+        can_split_y = y_low <= y_high
+        if not can_split_x and not can_split_y:
+            done.append(rect)
+            continue
+
+        if can_split_x and (not can_split_y or x1 - x0 >= (y1 - y0) * 2):
+            wall = rng.randint(x_low, x_high)
+            parts = [(x0, y0, wall, y1), (wall, y0, x1, y1)]
+        else:
+            wall = rng.randint(y_low, y_high)
+            parts = [(x0, y0, x1, wall), (x0, wall, x1, y1)]
+
+        for part in parts:
+            heapq.heappush(heap, (-area(part), created, part))
+            created += 1
+
+    return sorted(done + [rect for _area, _order, rect in heap], key=lambda rect: (rect[1], rect[0]))
+
+
+def _draw_walls(grid: list[list[str]], rect: tuple[int, int, int, int]) -> None:
+    x0, y0, x1, y1 = rect
+    for x in range(x0 + 1, x1):
+        for y in (y0, y1):
+            if grid[y][x] != "+":
+                grid[y][x] = "-"
+    for y in range(y0 + 1, y1):
+        for x in (x0, x1):
+            if grid[y][x] != "+":
+                grid[y][x] = "|"
+    for x, y in ((x0, y0), (x1, y0), (x0, y1), (x1, y1)):
+        grid[y][x] = "+"
+
+
+def _draw_diagonal(grid: list[list[str]], rect: tuple[int, int, int, int], corner: int) -> None:
+    # Cuts the corner of the room interior with the diagonal wall, the cut off cells are left as a closed pocket.
+    # Corners are numbered clockwise from the top left one.
+    x0, y0, x1, y1 = rect
+    size = min(3, (x1 - x0 - 1) // 3, (y1 - y0 - 1) // 3)
+    for idx in range(size):
+        if corner == 0:
+            grid[y0 + 1 + idx][x0 + size - idx] = "/"
+        elif corner == 1:
+            grid[y0 + 1 + idx][x1 - size + idx] = "\\"
+        elif corner == 2:
+            grid[y1 - size + idx][x1 - 1 - idx] = "/"
+        else:
+            grid[y1 - size + idx][x0 + 1 + idx] = "\\"
+
+
+def _label_position(
+    rng: random.Random,
+    walls_plan: list[str],
+    wall_map: WallMap,
+    rect: tuple[int, int, int, int],
+    label_width: int,
+    placement: str,
+) -> tuple[int, int]:
+    # Finds the position of the label having the margin from walls in the room
+    x0, y0, x1, y1 = rect
+    xs = range(x0 + 2, x1 - label_width)
+    ys = range(y0 + 2, y1 - 1)
+
+    def fits(x, y):
+        is_floor = walls_plan[y][x : x + label_width].isspace()
+        return is_floor and wall_map.has_margin((x, y), (x + label_width - 1, y))
+
+    candidates: Iterator[tuple[int, int]]
+    if placement == "center":
+        center_x = (x0 + x1 - label_width + 1) // 2
+        center_y = (y0 + y1) // 2
+        candidates = (
+            (x, y)
+            for y in sorted(ys, key=lambda y: abs(y - center_y))
+            for x in sorted(xs, key=lambda x: abs(x - center_x))
+        )
+    elif placement == "random":
+        random_points = [(rng.choice(xs), rng.choice(ys)) for _try in range(_RANDOM_LABEL_TRIES)]
+        candidates = itertools.chain(random_points, ((x, y) for y in ys for x in xs))
+    else:
+        candidates = ((x, y) for y in ys for x in xs)
+
+    for x, y in candidates:
+        if fits(x, y):
+            return x, y
+
+    raise ValueError("The room is too small for the label.")
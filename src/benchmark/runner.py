@@ -0,0 +1,104 @@
+from typing import Iterator, NamedTuple
+
+from src.benchmark.plan_generator import generate_floor_plan
+from src.chair_calculator.constants import Constants
+from src.chair_calculator.profiling import Profile
+from src.chair_calculator_main import chairs_per_room
+
+# Phases of the `chairs_per_room` function in the order of execution
+PHASES = ("normalize", "labels", "filter", "fill", "stats", "output")
+
+
+class BenchmarkResult(NamedTuple):
+    """Timings of calculating the chair statistics for one generated floor plan.
+
+    Attributes:
+        width (int): The width of the floor plan.
+        height (int): The height of the floor plan.
+        rooms (int): The number of rooms in the floor plan.
+        chairs (int): The number of chairs in the floor plan.
+        seconds (dict[str, float]): The best time of each phase from PHASES over the repeats,
+            and the best "total" time of all phases.
+    """
+
+    width: int
+    height: int
+    rooms: int
+    chairs: int
+    seconds: dict[str, float]
+
+
+def time_phases(plan_content: str, repeats: int = 3) -> dict[str, float]:
+    """Calculates the chair statistics of the floor plan timing each phase of the `chairs_per_room` function.
+
+    Args:
+        plan_content (str): The floor plan containing room labels and chair characters.
+        repeats (int): The number of times to repeat the calculation, the best time of each phase is kept.
+
+    Returns:
+        dict[str, float]: The best time in seconds of each phase from PHASES and of the "total".
+
+    Raises:
+        ValueError: If the number of repeats is less than one or the floor plan is invalid.
+    """
+    if repeats < 1:
+        raise ValueError("The number of repeats must be at least one.")
+
+    seconds = {phase: float("inf") for phase in PHASES + ("total",)}
+
+    for _repeat in range(repeats):
+        profile = Profile()
+        chairs_per_room(plan_content, profile=profile)
+
+        report = profile.report()
+        for phase, phase_report in report["phases"].items():
+            seconds[phase] = min(seconds[phase], phase_report["seconds"])
+        seconds["total"] = min(seconds["total"], report["total_seconds"])
+
+    return seconds
+
+
+def run_benchmark(
+    sizes: list[tuple[int, int]],
+    rooms: int | None = None,
+    wall_style: str = "straight",
+    chair_density: float = 0.05,
+    label_placement: str = "center",
+    repeats: int = 3,
+    seed: int = 0,
+) -> Iterator[BenchmarkResult]:
+    """Times the phases of the chair statistics calculation for the generated floor plans of each size.
+
+    Args:
+        sizes (list[tuple[int, int]]): The (width, height) of the floor plans to generate.
+        rooms (int | None): The number of rooms in each floor plan,
+            defaults to one room per 400 cells, so the room size stays the same across sizes.
+        wall_style (str): The style of walls, see the `generate_floor_plan` function.
+        chair_density (float): The share of the floor cells having a chair.
+        label_placement (str): Where to place the label in the room, see the `generate_floor_plan` function.
+        repeats (int): The number of times to repeat the calculation for each plan.
+        seed (int): The seed of the random generator.
+
+    Yields:
+        BenchmarkResult: The timings for each size in the given order.
+
+    Raises:
+        ValueError: If the floor plan can't be generated, see the `generate_floor_plan` function.
+    """
+    for width, height in sizes:
+        plan_rooms = rooms if rooms is not None else max(width * height // 400, 1)
+        plan_content = generate_floor_plan(
+            width,
+            height,
+            rooms=plan_rooms,
+            wall_style=wall_style,
+            chair_density=chair_density,
+            label_placement=label_placement,
+            seed=seed,
+        )
+        seconds = time_phases(plan_content, repeats=repeats)
+        # Generated labels have no chair characters
+        chairs = sum(map(plan_content.count, Constants.CHAIR_CHARS))
+
+        yield BenchmarkResult(width, height, plan_rooms, chairs, seconds)
+
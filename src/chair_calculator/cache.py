@@ -0,0 +1,195 @@
+import hashlib
+import json
+import os
+import tempfile
+from collections import OrderedDict
+from typing import Any, Sequence
+
+from src.chair_calculator.constants import Constants
+
+# Version of the stored statistics format, changing it invalidates all cached results.
+CACHE_FORMAT_VERSION = 2
+
+
+def plan_cache_key(floor_plan: Sequence[str]) -> str:
+    """Calculates the content hash of the normalized floor plan and the characters configuration.
+
+    Args:
+        floor_plan (Sequence[str]): The normalized floor plan represented as a sequence of strings.
+
+    Returns:
+        str: The hexadecimal SHA-256 digest identifying the chair statistics of the plan.
+    """
+    digest = hashlib.sha256()
+    configuration = [CACHE_FORMAT_VERSION, Constants.ROOM_LABEL_CHARS, Constants.CHAIR_CHARS, Constants.FLOOR_CHAR]
+    digest.update(json.dumps(configuration).encode())
+    for line in floor_plan:
+        digest.update(b"\n")
+        digest.update(line.encode("utf-8", errors="surrogatepass"))
+
+    return digest.hexdigest()
+
+
+class ResultCache:
+    """On-disk cache of the chair statistics of the floor plan keyed by its content hash.
+
+    Each result is stored in its own file written atomically, so several processes can share the cache directory.
+    The least recently used results are evicted when the number of stored results exceeds the maximum.
+    The number of results is counted once and then kept up to date with the writes of this process,
+    so the directory is scanned again only to evict, that also refreshes the count with the writes of others.
+    """
+
+    # Share of the maximum number of results left after the eviction, so the eviction doesn't run on every write
+    EVICTION_RATIO = 0.9
+
+    def __init__(self, directory: str, max_entries: int = 10000):
+        """Initializes the cache creating its directory if needed.
+
+        Args:
+            directory (str): The path to the cache directory.
+            max_entries (int): The maximum number of the stored results.
+
+        Raises:
+            ValueError: If the maximum number of results is less than one.
+        """
+        if max_entries < 1:
+            raise ValueError("The cache size must be at least one.")
+
+        self.directory = directory
+        self.max_entries = max_entries
+        # Number of the stored results as of the last scan and the writes since then, None until the first write
+        self._entries: int | None = None
+        os.makedirs(directory, exist_ok=True)
+
+    def get(self, key: str) -> dict | None:
+        """Returns the cached chair statistics marking them as recently used.
+
+        Args:
+            key (str): The key of the floor plan from the `plan_cache_key` function.
+
+        Returns:
+            dict | None: The chair statistics as they were stored, or None if they are not cached.
+        """
+        path = self._path(key)
+        try:
+            with open(path, "r") as file:
+                stats = json.load(file)
+        except (OSError, ValueError):
+            # Missing, evicted concurrently, or unreadable results are recalculated
+            return None
+
+        try:
+            os.utime(path)
+        except OSError:
+            # The read results are valid even if they can't be marked as used, for example,
+            # in the read-only cache directory or when they are evicted concurrently
+            pass
+
+        return stats
+
+    def put(self, key: str, stats: dict) -> None:
+        """Stores the chair statistics evicting the least recently used results if the cache is full.
+
+        Args:
+            key (str): The key of the floor plan from the `plan_cache_key` function.
+            stats (dict): The chair statistics as the JSON object, for example, per room.
+        """
+        path = self._path(key)
+        is_new = not os.path.exists(path)
+
+        # Write to the temporary file first and replace the result file atomically,
+        # so readers never see the partial result and concurrent writers don't interfere.
+        file_descriptor, temp_path = tempfile.mkstemp(dir=self.directory, prefix=".", suffix=".tmp")
+        try:
+            with os.fdopen(file_descriptor, "w") as file:
+                json.dump(stats, file)
+            os.replace(temp_path, path)
+        except BaseException:
+            os.unlink(temp_path)
+            raise
+
+        if self._entries is None:
+            self._entries = len(self._scan())
+        elif is_new:
+            self._entries += 1
+
+        if self._entries > self.max_entries:
+            self._evict()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.json")
+
+    def _scan(self) -> list[os.DirEntry]:
+        with os.scandir(self.directory) as entries:
+            return [entry for entry in entries if entry.name.endswith(".json")]
+
+    def _evict(self) -> None:
+        entries = self._scan()
+        self._entries = len(entries)
+        if len(entries) <= self.max_entries:
+            return
+
+        def last_used(entry: os.DirEntry) -> float:
+            try:
+                return entry.stat().st_mtime
+            except FileNotFoundError:
+                return 0.0
+
+        entries.sort(key=last_used)
+        evicted_entries = entries[: len(entries) - int(self.max_entries * self.EVICTION_RATIO)]
+        self._entries -= len(evicted_entries)
+        for entry in evicted_entries:
+            try:
+                os.unlink(entry.path)
+            except FileNotFoundError:
+                # Evicted by another process
+                pass
+
+
+class MemoryCache:
+    """In-memory cache of the recently used results evicting the least recently used one when it's full."""
+
+    def __init__(self, max_entries: int = 1000):
+        """Initializes the empty cache.
+
+        Args:
+            max_entries (int): The maximum number of the stored results.
+
+        Raises:
+            ValueError: If the maximum number of results is less than one.
+        """
+        if max_entries < 1:
+            raise ValueError("The cache size must be at least one.")
+
+        self.max_entries = max_entries
+        self._results: OrderedDict[str, Any] = OrderedDict()
+
+    def get(self, key: str) -> Any | None:
+        """Returns the cached result marking it as recently used.
+
+        Args:
+            key (str): The key of the result.
+
+        Returns:
+            Any | None: The result, or None if it's not cached.
+        """
+        result = self._results.get(key)
+        if result is not None:
+            self._results.move_to_end(key)
+
+        return result
+
+    def put(self, key: str, result: Any) -> None:
+        """Stores the result evicting the least recently used one if the cache is full.
+
+        Args:
+            key (str): The key of the result.
+            result (Any): The result to store, not None.
+        """
+        self._results[key] = result
+        self._results.move_to_end(key)
+        if len(self._results) > self.max_entries:
+            self._results.popitem(last=False)
+
+    def __len__(self) -> int:
+        return len(self._results)
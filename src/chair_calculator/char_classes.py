@@ -0,0 +1,67 @@
+import re
+from typing import NamedTuple
+
+from src.chair_calculator.constants import Constants
+
+# Codes of the character classes, `CharClasses.translate_table` maps each character of the row to one of them
+FLOOR = " "
+CHAIR = "c"
+LABEL = "l"
+WALL = "#"
+
+
+class _WallByDefault(dict):
+    # Every character that is not the floor, a chair, or a room label is a wall.
+    # The class of a new character is stored, so the next lookup of it doesn't call this method.
+    def __missing__(self, key):
+        self[key] = WALL
+        return WALL
+
+
+class CharClasses(NamedTuple):
+    """Tables classifying the floor plan characters as the floor, a chair, a room label, or a wall in one lookup.
+
+    The floor character is the floor, then chair characters are chairs even if they can be used in labels,
+    then the rest of the room label characters are labels, and every other character is a wall.
+
+    Attributes:
+        by_char (dict[str, str]): Maps the character to its class code.
+        translate_table (dict[int, str]): Maps the character code to its class code for `str.translate`,
+            so the whole row is classified at once, and `str.find` locates the first cell of a class.
+        room_run_pattern (re.Pattern): Matches the horizontal runs of the cells that can be filled,
+            every cell in a run is not a wall.
+    """
+
+    by_char: dict[str, str]
+    translate_table: dict[int, str]
+    room_run_pattern: re.Pattern
+
+
+# Tables by the characters configuration they were built for
+_char_classes_cache: dict[tuple[str, str, str], CharClasses] = {}
+
+
+def char_classes() -> CharClasses:
+    """Returns the classification tables for the current characters configuration of `Constants`.
+
+    The tables are built once per configuration, so they follow the changes of the chair or label characters.
+
+    Returns:
+        CharClasses: The classification tables.
+    """
+    configuration = (Constants.FLOOR_CHAR, Constants.CHAIR_CHARS, Constants.ROOM_LABEL_CHARS)
+    classes = _char_classes_cache.get(configuration)
+    if classes is None:
+        by_char = _WallByDefault()
+        for chars, char_class in [
+            (Constants.ROOM_LABEL_CHARS, LABEL),
+            (Constants.CHAIR_CHARS, CHAIR),
+            (Constants.FLOOR_CHAR, FLOOR),
+        ]:
+            by_char.update(dict.fromkeys(chars, char_class))
+
+        translate_table = _WallByDefault({ord(char): char_class for char, char_class in by_char.items()})
+        room_run_pattern = re.compile(f"[{re.escape(''.join(by_char))}]+")
+        classes = _char_classes_cache[configuration] = CharClasses(by_char, translate_table, room_run_pattern)
+
+    return classes
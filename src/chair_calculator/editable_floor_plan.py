@@ -0,0 +1,512 @@
+from collections import deque
+
+from src.chair_calculator.char_classes import CHAIR, WALL, char_classes
+from src.chair_calculator.constants import Constants
+from src.chair_calculator.floor_plan import (
+    filter_chairs,
+    label_spans,
+    normalize_floor_plan,
+    room_label_coordinates,
+    without_labels,
+)
+from src.chair_calculator.labeling import label_regions, region_chair_stats
+from src.chair_calculator.output import PlanStats, shared_rooms
+from src.chair_calculator.validator import WallMap, validate_non_chair_chars
+
+# Offsets of the horizontal and vertical neighbours of the cell, rooms are connected through them
+_NEIGHBOURS = ((-1, 0), (1, 0), (0, -1), (0, 1))
+
+
+class FloorPlan:
+    """Floor plan keeping the labeled rooms and their chair statistics up to date while it is edited.
+
+    Chair edits update the statistics in constant time. Wall edits relabel only the rooms around the edited cell:
+    a new floor cell merges the neighbouring rooms, and a new wall cell splits its room
+    if the neighbouring cells are no longer connected, exploring the parts of the room in parallel
+    and stopping as soon as all of them but one are explored. A revision of the whole plan relabels only the rooms
+    touching the changed cells.
+    """
+
+    def __init__(
+        self,
+        floor_plan: list[str],
+        dimensions: tuple[int, int],
+        coords_by_room: dict[str, tuple[tuple[int, int], tuple[int, int]]],
+    ):
+        """Initializes the floor plan labeling its rooms, use the `from_text` method to parse one.
+
+        Args:
+            floor_plan (list[str]): The floor plan without room labels represented as a list of strings.
+            dimensions (tuple[int, int]): The dimensions of the floor plan (width, height).
+            coords_by_room (dict[str, tuple[tuple[int, int], tuple[int, int]]]): The room names mapped
+                to their label coordinates returned by the `room_label_coordinates` function.
+
+        Raises:
+            ValueError: If any chair of a labeled room has no margin from walls.
+        """
+        self._label(floor_plan, dimensions, coords_by_room)
+
+    @classmethod
+    def from_text(cls, plan_content: str) -> "FloorPlan":
+        """Parses the floor plan text as the `chairs_per_room` function does.
+
+        Args:
+            plan_content (str): The floor plan containing room labels and chair characters.
+
+        Returns:
+            FloorPlan: The floor plan with labeled rooms.
+
+        Raises:
+            ValueError: If the plan is invalid, see the `chairs_per_room` function.
+        """
+        floor_plan, dimensions = normalize_floor_plan(plan_content)
+        coords_by_room = room_label_coordinates(floor_plan, dimensions=dimensions)
+        unlabeled_plan = filter_chairs(floor_plan, label_coords=label_spans(coords_by_room))
+
+        return cls(unlabeled_plan, dimensions, coords_by_room)
+
+    def cell(self, x: int, y: int) -> str:
+        """Returns the character of the cell, room labels are erased to the floor.
+
+        Raises:
+            ValueError: If the cell is outside of the plan.
+        """
+        self._validate_inside(x, y)
+        return self._chars[y][x]
+
+    def region_at(self, x: int, y: int) -> int:
+        """Returns the id of the region containing the cell, or 0 for walls.
+
+        Raises:
+            ValueError: If the cell is outside of the plan.
+        """
+        self._validate_inside(x, y)
+        return self._labels[y][x]
+
+    def stats_by_room(self) -> dict[str, dict[str, int]]:
+        """Returns the chair statistics per room sorted by room names.
+
+        Returns:
+            dict[str, dict[str, int]]: The room names mapped to the count of each chair character in the room.
+        """
+        stats_by_room = {}
+        for room, (label_start_x, label_start_y) in sorted(self._rooms.items()):
+            counts = self._chairs[self._labels[label_start_y][label_start_x]]
+            stats_by_room[room] = dict(zip(Constants.CHAIR_CHARS, counts))
+
+        return stats_by_room
+
+    def plan_stats(self) -> PlanStats:
+        """Returns the chair statistics of the floor plan with the rooms sorted by room names.
+
+        Returns:
+            PlanStats: The chair statistics total for apartment and per each room,
+                the region shared by several rooms is counted once in the total.
+        """
+        region_by_room = {room: self._labels[y][x] for room, (x, y) in self._rooms.items()}
+        return PlanStats.from_rooms(self.stats_by_room(), shared_rooms(region_by_room))
+
+    def place_chair(self, x: int, y: int, chair: str) -> None:
+        """Places the chair on the floor cell.
+
+        Raises:
+            ValueError: If the cell is not a floor, or the chair is invalid or has no margin from walls.
+        """
+        if chair not in Constants.CHAIR_CHARS or len(chair) != 1:
+            raise ValueError(f"The chair must be one of '{Constants.CHAIR_CHARS}' characters.")
+
+        if self.cell(x, y) != Constants.FLOOR_CHAR:
+            raise ValueError("The chair can be placed only on the floor.")
+
+        self.set_cell(x, y, chair)
+
+    def remove_chair(self, x: int, y: int) -> str:
+        """Removes the chair from the cell leaving the floor.
+
+        Returns:
+            str: The removed chair character.
+
+        Raises:
+            ValueError: If there is no chair in the cell.
+        """
+        chair = self.cell(x, y)
+        if chair not in Constants.CHAIR_CHARS:
+            raise ValueError("There is no chair to remove.")
+
+        self.set_cell(x, y, Constants.FLOOR_CHAR)
+
+        return chair
+
+    def set_cell(self, x: int, y: int, char: str) -> None:
+        """Sets the character of the cell updating the rooms and their chair statistics.
+
+        Args:
+            x (int): The zero-based column of the cell.
+            y (int): The zero-based row of the cell.
+            char (str): The floor, chair, or wall character.
+
+        Raises:
+            ValueError: If the cell is outside of the plan, the character is not a floor, chair, or wall,
+                the chair has no margin from walls, the wall is in the margin of a chair or a room label,
+                or the cell is a part of a room label.
+        """
+        old_char = self.cell(x, y)
+
+        if len(char) != 1:
+            raise ValueError("The cell character must be a single character.")
+
+        if not self._is_wall(char) and char != Constants.FLOOR_CHAR and char not in Constants.CHAIR_CHARS:
+            raise ValueError(f"The floor plan should have only room labels and chair characters, '{char}' found.")
+
+        is_wall = self._is_wall(char)
+        was_wall = self._is_wall(old_char)
+
+        if char != Constants.FLOOR_CHAR and self._in_label_margin(x, y, margin=0):
+            raise ValueError("The cell of the room label can't be changed.")
+
+        if char in Constants.CHAIR_CHARS and (
+            self._on_border(x, y) or any(self._is_wall(around_char) for around_char in self._chars_around(x, y))
+        ):
+            raise ValueError(f"The chair '{char}' must have at least one space margin from each wall.")
+
+        if is_wall and not was_wall:
+            if self._in_label_margin(x, y, margin=1):
+                raise ValueError("The room label must have at least one space margin from each wall.")
+            for around_char in self._chars_around(x, y):
+                if around_char in Constants.CHAIR_CHARS:
+                    raise ValueError(f"The chair '{around_char}' must have at least one space margin from each wall.")
+
+        if not was_wall:
+            self._count_cell(self._labels[y][x], old_char, -1)
+
+        self._chars[y][x] = char
+
+        if was_wall and not is_wall:
+            self._add_floor_cell(x, y)
+        elif not was_wall and is_wall:
+            self._add_wall_cell(x, y)
+
+        if not is_wall:
+            self._count_cell(self._labels[y][x], char, 1)
+
+    def revise(self, plan_content: str) -> None:
+        """Replaces the floor plan with its revision relabeling only the rooms around the changed cells.
+
+        The rows of the revision are compared with the current rows to find the changed span of each row.
+        The rooms touching the changed spans and the rooms getting a new label are labeled again from scratch,
+        other rooms keep their statistics, so the cost is proportional to the size of the changed rooms
+        rather than of the whole plan. The revision of other dimensions is labeled as a whole.
+
+        Args:
+            plan_content (str): The revised floor plan containing room labels and chair characters.
+
+        Raises:
+            ValueError: If the revised plan is invalid, see the `chairs_per_room` function.
+                The floor plan is left unchanged then.
+        """
+        floor_plan, dimensions = normalize_floor_plan(plan_content)
+        coords_by_room = room_label_coordinates(floor_plan, dimensions=dimensions)
+
+        if dimensions != self.dimensions:
+            self._label(filter_chairs(floor_plan, label_coords=label_spans(coords_by_room)), dimensions, coords_by_room)
+            return
+
+        unlabeled_plan = without_labels(floor_plan, label_spans(coords_by_room))
+        changed_spans = self._changed_spans(unlabeled_plan)
+        validate_non_chair_chars(
+            [unlabeled_plan[y] for y in changed_spans],
+            lambda char: f"The floor plan should have only room labels and chair characters, '{char}' found.",
+        )
+
+        # Regions touching the changed cells, including the diagonal ones, and the regions getting a new label
+        # are labeled again. Other regions don't touch the changed cells, so they are left as they are.
+        width, height = self.dimensions
+        seeds: dict[int, tuple[int, int]] = {}
+        for y, (start_x, end_x) in changed_spans.items():
+            for around_y in range(max(y - 1, 0), min(y + 2, height)):
+                row = self._labels[around_y]
+                for x in range(max(start_x - 1, 0), min(end_x + 2, width)):
+                    if row[x] != 0:
+                        seeds.setdefault(row[x], (x, around_y))
+        labeled_ids = {self._labels[label_y][label_x] for label_x, label_y in self._rooms.values()}
+        for (label_x, label_y), _label_end in coords_by_room.values():
+            region_id = self._labels[label_y][label_x]
+            if region_id != 0 and region_id not in labeled_ids:
+                seeds.setdefault(region_id, (label_x, label_y))
+
+        cells = set()
+        for seed_x, seed_y in seeds.values():
+            cells.update(self._region_cells(seed_x, seed_y))
+        for y, (start_x, end_x) in changed_spans.items():
+            cells.update((x, y) for x in range(start_x, end_x + 1))
+
+        wall_map = WallMap(unlabeled_plan)
+        regions = _connected_regions(unlabeled_plan, cells, wall_map)
+
+        region_by_cell = {cell: region for region in regions for cell in region[0]}
+        for label_start, _label_end in coords_by_room.values():
+            region = region_by_cell.get(label_start)
+            if region is not None and region[1] is not None:
+                chair_x, chair_y = region[1]
+                chair_char = unlabeled_plan[chair_y][chair_x]
+                wall_map.validate_margin(
+                    start=(chair_x, chair_y),
+                    end=(chair_x, chair_y),
+                    error_text=f"The chair '{chair_char}' must have at least one space margin from each wall.",
+                )
+
+        # The revision is valid, update the state
+        for y in changed_spans:
+            self._chars[y] = list(unlabeled_plan[y])
+        for region_id in seeds:
+            del self._areas[region_id]
+            del self._chairs[region_id]
+        for x, y in cells:
+            self._labels[y][x] = 0
+        for region_cells, _chair in regions:
+            region_id = self._new_region()
+            for x, y in region_cells:
+                self._labels[y][x] = region_id
+                self._count_cell(region_id, self._chars[y][x], 1)
+        self._set_rooms(coords_by_room)
+
+    def _label(
+        self,
+        floor_plan: list[str],
+        dimensions: tuple[int, int],
+        coords_by_room: dict[str, tuple[tuple[int, int], tuple[int, int]]],
+    ) -> None:
+        # Labels the whole plan, the state is replaced only when the plan is valid
+        labels, regions = label_regions(floor_plan, dimensions)
+        for (label_start_x, label_start_y), _label_end in coords_by_room.values():
+            region_chair_stats(floor_plan, regions[labels[label_start_y][label_start_x]])
+
+        self.dimensions = dimensions
+        self._chars = [list(line) for line in floor_plan]
+        self._labels = labels
+        self._set_rooms(coords_by_room)
+        self._chairs = {
+            region_id: [region.chairs[chair_char] for chair_char in Constants.CHAIR_CHARS]
+            for region_id, region in regions.items()
+        }
+        self._areas = {region_id: region.area for region_id, region in regions.items()}
+        self._next_region_id = len(regions) + 1
+
+    def _set_rooms(self, coords_by_room: dict[str, tuple[tuple[int, int], tuple[int, int]]]) -> None:
+        self._rooms = {room: label_start for room, (label_start, _label_end) in coords_by_room.items()}
+        self._label_spans_by_row: dict[int, list[tuple[int, int]]] = {}
+        for (start_x, start_y), (end_x, _end_y) in coords_by_room.values():
+            self._label_spans_by_row.setdefault(start_y, []).append((start_x, end_x))
+
+    def _changed_spans(self, floor_plan: list[str]) -> dict[int, tuple[int, int]]:
+        # Returns the span from the first to the last changed cell of each changed row in the reading order
+        changed_spans = {}
+        for y, line in enumerate(floor_plan):
+            old_line = "".join(self._chars[y])
+            if line == old_line:
+                continue
+            start_x = 0
+            while line[start_x] == old_line[start_x]:
+                start_x += 1
+            end_x = len(line) - 1
+            while line[end_x] == old_line[end_x]:
+                end_x -= 1
+            changed_spans[y] = (start_x, end_x)
+        return changed_spans
+
+    def _validate_inside(self, x: int, y: int) -> None:
+        width, height = self.dimensions
+        if not (0 <= x < width and 0 <= y < height):
+            raise ValueError(f"The cell ({x}, {y}) is outside of the floor plan ({width}x{height}).")
+
+    @staticmethod
+    def _is_wall(char: str) -> bool:
+        return char_classes().by_char[char] == WALL
+
+    def _on_border(self, x: int, y: int) -> bool:
+        width, height = self.dimensions
+        return x == 0 or y == 0 or x == width - 1 or y == height - 1
+
+    def _chars_around(self, x: int, y: int) -> list[str]:
+        width, height = self.dimensions
+        return [
+            self._chars[y + dy][x + dx]
+            for dy in (-1, 0, 1)
+            for dx in (-1, 0, 1)
+            if (dx != 0 or dy != 0) and 0 <= x + dx < width and 0 <= y + dy < height
+        ]
+
+    def _in_label_margin(self, x: int, y: int, margin: int) -> bool:
+        for label_y in range(y - margin, y + margin + 1):
+            for start_x, end_x in self._label_spans_by_row.get(label_y, []):
+                if start_x - margin <= x <= end_x + margin:
+                    return True
+        return False
+
+    def _count_cell(self, region_id: int, char: str, delta: int) -> None:
+        self._areas[region_id] += delta
+        chair_idx = Constants.CHAIR_CHARS.find(char)
+        if chair_idx != -1:
+            self._chairs[region_id][chair_idx] += delta
+
+    def _neighbour_cells(self, x: int, y: int) -> list[tuple[int, int]]:
+        width, height = self.dimensions
+        return [
+            (x + dx, y + dy)
+            for dx, dy in _NEIGHBOURS
+            if 0 <= x + dx < width and 0 <= y + dy < height and self._labels[y + dy][x + dx] != 0
+        ]
+
+    def _add_floor_cell(self, x: int, y: int) -> None:
+        # The new cell joins the largest neighbouring region, other neighbouring regions are merged into it
+        neighbour_regions = {self._labels[ny][nx]: (nx, ny) for nx, ny in self._neighbour_cells(x, y)}
+
+        if not neighbour_regions:
+            region_id = self._new_region()
+        else:
+            region_id = max(neighbour_regions, key=lambda neighbour_id: self._areas[neighbour_id])
+            for other_id, (other_x, other_y) in neighbour_regions.items():
+                if other_id != region_id:
+                    self._relabel(self._region_cells(other_x, other_y), other_id, region_id)
+                    del self._areas[other_id]
+                    del self._chairs[other_id]
+
+        self._labels[y][x] = region_id
+
+    def _add_wall_cell(self, x: int, y: int) -> None:
+        region_id = self._labels[y][x]
+        self._labels[y][x] = 0
+
+        sources = self._neighbour_cells(x, y)
+        if len(sources) < 2:
+            if not sources:
+                del self._areas[region_id]
+                del self._chairs[region_id]
+            return
+
+        # Explore the region from each neighbour of the wall cell one cell at a time in turns.
+        # Explorations meeting each other are in the same part of the region. The part which exploration
+        # is finished is split to the new region, until the only part is left that keeps the region id.
+        parent = list(range(len(sources)))
+
+        def find(group):
+            while parent[group] != group:
+                parent[group] = parent[parent[group]]
+                group = parent[group]
+            return group
+
+        owners: dict[tuple[int, int], int] = {}
+        frontiers: list[deque] = []
+        for group, source in enumerate(sources):
+            if source in owners:
+                parent[find(group)] = find(owners[source])
+                frontiers.append(deque())
+            else:
+                owners[source] = group
+                frontiers.append(deque([source]))
+
+        width, height = self.dimensions
+        split_parts: set[int] = set()
+        while True:
+            # Parts that are not split yet mapped to whether they are still explored
+            parts: dict[int, bool] = {}
+            for group, frontier in enumerate(frontiers):
+                part = find(group)
+                if part not in split_parts:
+                    parts[part] = parts.get(part, False) or bool(frontier)
+
+            if len(parts) < 2:
+                break
+
+            finished_parts = [part for part, is_exploring in parts.items() if not is_exploring]
+            if len(finished_parts) == len(parts):
+                # Every part is explored, the first part keeps the region id
+                finished_parts = finished_parts[1:]
+
+            if finished_parts:
+                for part in finished_parts:
+                    cells = [cell for cell, group in owners.items() if find(group) == part]
+                    self._relabel(cells, region_id, self._new_region())
+                    split_parts.add(part)
+                continue
+
+            for group, frontier in enumerate(frontiers):
+                if not frontier:
+                    continue
+                cell_x, cell_y = frontier.popleft()
+                for dx, dy in _NEIGHBOURS:
+                    nx, ny = cell_x + dx, cell_y + dy
+                    if not (0 <= nx < width and 0 <= ny < height) or self._labels[ny][nx] != region_id:
+                        continue
+                    owner = owners.get((nx, ny))
+                    if owner is None:
+                        owners[(nx, ny)] = group
+                        frontier.append((nx, ny))
+                    elif find(owner) != find(group):
+                        parent[find(owner)] = find(group)
+
+    def _region_cells(self, x: int, y: int) -> list[tuple[int, int]]:
+        width, height = self.dimensions
+        region_id = self._labels[y][x]
+        cells = [(x, y)]
+        visited = {(x, y)}
+        idx = 0
+        while idx < len(cells):
+            cell_x, cell_y = cells[idx]
+            idx += 1
+            for dx, dy in _NEIGHBOURS:
+                nx, ny = cell_x + dx, cell_y + dy
+                if not (0 <= nx < width and 0 <= ny < height) or (nx, ny) in visited:
+                    continue
+                if self._labels[ny][nx] == region_id:
+                    visited.add((nx, ny))
+                    cells.append((nx, ny))
+        return cells
+
+    def _relabel(self, cells: list[tuple[int, int]], old_region_id: int, new_region_id: int) -> None:
+        for cell_x, cell_y in cells:
+            self._labels[cell_y][cell_x] = new_region_id
+            self._count_cell(old_region_id, self._chars[cell_y][cell_x], -1)
+            self._count_cell(new_region_id, self._chars[cell_y][cell_x], 1)
+
+    def _new_region(self) -> int:
+        region_id = self._next_region_id
+        self._next_region_id += 1
+        self._areas[region_id] = 0
+        self._chairs[region_id] = [0] * len(Constants.CHAIR_CHARS)
+        return region_id
+
+
+def _connected_regions(
+    floor_plan: list[str], cells: set[tuple[int, int]], wall_map: WallMap
+) -> list[tuple[list[tuple[int, int]], tuple[int, int] | None]]:
+    # Splits the cells that are not walls into the regions connected through the given cells.
+    # Returns the cells of each region and its first chair in the reading order having no margin from walls.
+    by_char = char_classes().by_char
+    regions = []
+    visited = set()
+    for cell in cells:
+        cell_x, cell_y = cell
+        if cell in visited or by_char[floor_plan[cell_y][cell_x]] == WALL:
+            continue
+
+        visited.add(cell)
+        region_cells = [cell]
+        unmargined_chair = None
+        idx = 0
+        while idx < len(region_cells):
+            cell_x, cell_y = region_cells[idx]
+            idx += 1
+            if by_char[floor_plan[cell_y][cell_x]] == CHAIR and wall_map.touches_wall(cell_x, cell_y):
+                if unmargined_chair is None or (cell_y, cell_x) < unmargined_chair[::-1]:
+                    unmargined_chair = (cell_x, cell_y)
+            for dx, dy in _NEIGHBOURS:
+                neighbour = (cell_x + dx, cell_y + dy)
+                if neighbour in cells and neighbour not in visited:
+                    if by_char[floor_plan[neighbour[1]][neighbour[0]]] != WALL:
+                        visited.add(neighbour)
+                        region_cells.append(neighbour)
+
+        regions.append((region_cells, unmargined_chair))
+
+    return regions
@@ -1,9 +1,20 @@
-from src.chair_calculator.validator import validate_margin, validate_non_chair_chars
+import mmap
+import re
+from array import array
+from typing import Iterator, Sequence, overload
+
+from src.chair_calculator.constants import Constants
+from src.chair_calculator.validator import WallMap, validate_non_chair_chars
+
+# Matches the room label within the row, the name is any text between the brackets.
+ROOM_LABEL_PATTERN = re.compile(r"\(([^()]*)\)")
 
 
 def normalize_floor_plan(floor_plan: str) -> tuple[list[str], tuple[int, int]]:
     """Normalizes the given floor plan by padding each line with spaces to make them equal in length.
 
+    Lines can end with "\\n", "\\r\\n", or "\\r" as in the file read in the text mode.
+
     Args:
         floor_plan (str): The original floor plan as a string.
 
@@ -14,6 +25,8 @@ def normalize_floor_plan(floor_plan: str) -> tuple[list[str], tuple[int, int]]:
                and height is the number of lines.
     """
 
+    if "\r" in floor_plan:
+        floor_plan = floor_plan.replace("\r\n", "\n").replace("\r", "\n")
     lines = floor_plan.split("\n")
 
     height = 0
@@ -27,13 +40,163 @@ def normalize_floor_plan(floor_plan: str) -> tuple[list[str], tuple[int, int]]:
     return normalized_lines, (width, height)
 
 
+class MappedFloorPlan(Sequence[str]):
+    """Floor plan file mapped to memory and accessed row by row.
+
+    Rows are located with the precomputed table of newline offsets and decoded only when accessed,
+    short rows are padded with the floor characters virtually. Each byte of the file is one cell of the plan,
+    that is exact for ASCII plans. The carriage return at the row end is dropped as the text mode reading does.
+
+    The instance behaves as the normalized floor plan returned by the `normalize_floor_plan` function,
+    so it can be given to the functions that accept the floor plan as a sequence of strings.
+    """
+
+    # Number of the recently decoded rows to keep, validating margins reads three neighbouring rows
+    _ROWS_CACHE_SIZE = 4
+
+    def __init__(
+        self,
+        plan_map: mmap.mmap | None,
+        row_starts: array,
+        row_ends: array,
+        dimensions: tuple[int, int],
+        label_coords: list[tuple[tuple[int, int], int]] | None = None,
+    ):
+        """Initializes the floor plan, use the `load_floor_plan_mmap` function to make one.
+
+        Args:
+            plan_map (mmap.mmap | None): The memory mapped file, or None for the empty plan.
+            row_starts (array): The offsets of the first byte of each row.
+            row_ends (array): The offsets of the byte after the last character of each row.
+            dimensions (tuple[int, int]): The dimensions of the floor plan (width, height).
+            label_coords (list[tuple[tuple[int, int], int]] | None): The coordinates of the labels to be erased
+                when reading rows. Each label's coordinate is a tuple of two tuples (start_x, end_x) and y.
+        """
+        self._map = plan_map
+        self._row_starts = row_starts
+        self._row_ends = row_ends
+        self.dimensions = dimensions
+        self._label_coords = label_coords or []
+        self._label_coords_by_row: dict[int, list[tuple[int, int]]] = {}
+        for (start_x, end_x), y in self._label_coords:
+            self._label_coords_by_row.setdefault(y, []).append((start_x, end_x))
+        self._rows_cache: dict[int, str] = {}
+
+    def without_labels(self, label_coords: list[tuple[tuple[int, int], int]]) -> "MappedFloorPlan":
+        """Returns the view of the floor plan with labels erased at the given coordinates without copying it.
+
+        Args:
+            label_coords (list[tuple[tuple[int, int], int]]): The coordinates of the labels to be erased.
+                Each label's coordinate is a tuple of two tuples (start_x, end_x) and y.
+
+        Returns:
+            MappedFloorPlan: The floor plan sharing the same memory map.
+        """
+        return MappedFloorPlan(
+            self._map, self._row_starts, self._row_ends, self.dimensions, self._label_coords + label_coords
+        )
+
+    def close(self) -> None:
+        """Closes the memory map, the views made with the `without_labels` method are closed too."""
+        if self._map is not None:
+            self._map.close()
+
+    def __enter__(self) -> "MappedFloorPlan":
+        return self
+
+    def __exit__(self, *_args) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return self.dimensions[1]
+
+    @overload
+    def __getitem__(self, y: int) -> str: ...
+
+    @overload
+    def __getitem__(self, y: slice) -> list[str]: ...
+
+    def __getitem__(self, y):
+        if isinstance(y, slice):
+            return [self[row_y] for row_y in range(*y.indices(len(self)))]
+
+        width, height = self.dimensions
+        if y < 0:
+            y += height
+        if not 0 <= y < height:
+            raise IndexError("Floor plan row index out of range.")
+
+        row = self._rows_cache.get(y)
+        if row is None:
+            plan_map: mmap.mmap = self._map  # type: ignore[assignment]
+            row = plan_map[self._row_starts[y] : self._row_ends[y]].decode("latin-1").ljust(width)
+            for start_x, end_x in self._label_coords_by_row.get(y, []):
+                row = row[:start_x] + Constants.FLOOR_CHAR * (end_x - start_x + 1) + row[end_x + 1 :]
+
+            if len(self._rows_cache) == self._ROWS_CACHE_SIZE:
+                del self._rows_cache[next(iter(self._rows_cache))]
+            self._rows_cache[y] = row
+
+        return row
+
+    def __iter__(self) -> Iterator[str]:
+        for y in range(len(self)):
+            yield self[y]
+
+
+def load_floor_plan_mmap(file_path: str) -> MappedFloorPlan:
+    """Maps the floor plan file to memory and indexes its rows.
+
+    Args:
+        file_path (str): The path to the file with the floor plan.
+
+    Returns:
+        MappedFloorPlan: The floor plan having the same rows and dimensions as the `normalize_floor_plan` function
+            returns for the file content. It should be closed after use.
+    """
+    with open(file_path, "rb") as file:
+        try:
+            plan_map = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            # Empty file can't be mapped
+            return MappedFloorPlan(None, array("q"), array("q"), (0, 0))
+
+    row_starts = array("q")
+    row_ends = array("q")
+    row_start = 0
+    while True:
+        newline_idx = plan_map.find(b"\n", row_start)
+        line_end = len(plan_map) if newline_idx == -1 else newline_idx
+        # Carriage returns end rows too as in the file read in the text mode,
+        # the one just before the newline is the part of the "\\r\\n" line end.
+        ends_with_return = False
+        return_idx = plan_map.find(b"\r", row_start, line_end)
+        while return_idx != -1:
+            row_starts.append(row_start)
+            row_ends.append(return_idx)
+            row_start = return_idx + 1
+            ends_with_return = row_start == line_end
+            return_idx = plan_map.find(b"\r", row_start, line_end)
+
+        if not (ends_with_return and newline_idx != -1):
+            row_starts.append(row_start)
+            row_ends.append(line_end)
+        if newline_idx == -1:
+            break
+        row_start = newline_idx + 1
+
+    width = max(row_end - row_start for row_start, row_end in zip(row_starts, row_ends))
+
+    return MappedFloorPlan(plan_map, row_starts, row_ends, (width, len(row_starts)))
+
+
 def room_label_coordinates(
-    floor_plan: list[str], dimensions: tuple[int, int]
+    floor_plan: Sequence[str], dimensions: tuple[int, int]
 ) -> dict[str, tuple[tuple[int, int], tuple[int, int]]]:
     """Extracts the room labels and their coordinates from a given floor plan.
 
     Args:
-        floor_plan (list[str]): The floor plan represented as a list of strings.
+        floor_plan (Sequence[str]): The floor plan represented as a sequence of strings.
         dimensions (tuple[int, int]): The dimensions of the floor plan (width, height).
 
     Returns:
@@ -45,9 +208,34 @@ def room_label_coordinates(
         ValueError: If the length of the floor plan does not match the specified dimensions.
 
     """
+    coords_by_room = {
+        room: (label_start, label_end) for room, label_start, label_end in iter_room_labels(floor_plan, dimensions)
+    }
+    coords_by_room = {k: coords_by_room[k] for k in sorted(coords_by_room)}
 
-    # Iterate over the floor plan character by character,
-    # detect the room name and its coordinates
+    return coords_by_room
+
+
+def iter_room_labels(
+    floor_plan: Sequence[str], dimensions: tuple[int, int]
+) -> Iterator[tuple[str, tuple[int, int], tuple[int, int]]]:
+    """Finds the room labels of the floor plan one at a time in the reading order of their ends.
+
+    The plan is scanned only as far as the caller takes the labels, so looking for some rooms can stop early.
+
+    Args:
+        floor_plan (Sequence[str]): The floor plan represented as a sequence of strings.
+        dimensions (tuple[int, int]): The dimensions of the floor plan (width, height).
+
+    Yields:
+        tuple[str, tuple[int, int], tuple[int, int]]: The room name, the starting and the ending coordinates
+            of each label.
+
+    Raises:
+        ValueError: If the length of the floor plan does not match the specified dimensions.
+        ValueError: If the room label has no margin from walls.
+
+    """
     width, height = dimensions
     floor_square = width * height
     floor_plan_len = sum(map(len, floor_plan))
@@ -55,32 +243,61 @@ def room_label_coordinates(
         raise ValueError(f"The floor plan length ({floor_plan_len}) \
 does not match the dimensions ({width}x{height}={floor_square}).")
 
-    coords_by_room = {}
+    # Jump between brackets with str.find, so rows without labels are scanned at the C speed.
+    # The label can continue on the next row, then its name is joined from the parts of both rows.
+    wall_map = WallMap(floor_plan)
     room_started = False
-    name = ""
+    name_parts: list[str] = []
     label_start: tuple[int, int]
     for row, line in enumerate(floor_plan):
-        for col, char in enumerate(line):
-            if char == "(":
+        col = 0
+        while True:
+            open_col = line.find("(", col)
+            if not room_started:
+                if open_col == -1:
+                    break
                 room_started = True
-                name = ""
-                label_start = (col, row)
-            elif char == ")" and room_started:
+                name_parts = []
+                label_start = (open_col, row)
+                col = open_col + 1
+                continue
+
+            close_col = line.find(")", col)
+            if open_col != -1 and (close_col == -1 or open_col < close_col):
+                # The opening bracket inside the label starts it again
+                name_parts = []
+                label_start = (open_col, row)
+                col = open_col + 1
+            elif close_col == -1:
+                name_parts.append(line[col:])
+                break
+            else:
+                name_parts.append(line[col:close_col])
                 room_started = False
-                label_end = (col, row)
-                validate_margin(
-                    floor_plan,
+                label_end = (close_col, row)
+                wall_map.validate_margin(
                     start=label_start,
                     end=label_end,
                     error_text="The room label must have at least one space margin from each wall.",
                 )
-                coords_by_room[name] = (label_start, label_end)
-            elif room_started:
-                name += char
+                yield "".join(name_parts), label_start, label_end
+                col = close_col + 1
 
-    coords_by_room = {k: coords_by_room[k] for k in sorted(coords_by_room)}
 
-    return coords_by_room
+def label_spans(
+    coords_by_room: dict[str, tuple[tuple[int, int], tuple[int, int]]]
+) -> list[tuple[tuple[int, int], int]]:
+    """Converts the room label coordinates to the spans of the labels to erase with the `filter_chairs` function.
+
+    Args:
+        coords_by_room (dict[str, tuple[tuple[int, int], tuple[int, int]]]): The room names mapped
+            to their label coordinates returned by the `room_label_coordinates` function.
+
+    Returns:
+        list[tuple[tuple[int, int], int]]: The coordinates of the labels, each is a tuple of (start_x, end_x) and y.
+
+    """
+    return [((start_x, end_x), start_y) for (start_x, start_y), (end_x, _end_y) in coords_by_room.values()]
 
 
 def filter_chairs(floor_plan: list[str], label_coords: list[tuple[tuple[int, int], int]]) -> list[str]:
@@ -97,15 +314,32 @@ def filter_chairs(floor_plan: list[str], label_coords: list[tuple[tuple[int, int
         list[str]: The updated floor plan without room labels.
 
     """
-    plan_chars = [list(line) for line in floor_plan]
-
-    for (start_x, end_x), y in label_coords:
-        plan_chars[y][start_x : end_x + 1] = " " * (end_x - start_x + 1)
-
-    updated_plan = ["".join(line) for line in plan_chars]
+    updated_plan = without_labels(floor_plan, label_coords)
 
     validate_non_chair_chars(
         updated_plan, lambda char: f"The floor plan should have only room labels and chair characters, '{char}' found."
     )
 
     return updated_plan
+
+
+def without_labels(floor_plan: list[str], label_coords: list[tuple[tuple[int, int], int]]) -> list[str]:
+    """Erases labels from a floor plan based on the given coordinates without validating the rest of the plan.
+
+    Args:
+        floor_plan (list[str]): The original floor plan as a list of strings.
+        label_coords (list[tuple[tuple[int, int], int]]): The coordinates of the labels to be erased.
+            Each label's coordinate is a tuple of two tuples (start_x, end_x) and y.
+
+    Returns:
+        list[str]: The floor plan with labels replaced by the floor.
+    """
+    # Rebuild only the rows having labels, other rows are shared with the original plan
+    updated_plan = list(floor_plan)
+
+    for (start_x, end_x), y in label_coords:
+        if start_x <= end_x:
+            line = updated_plan[y]
+            updated_plan[y] = line[:start_x] + " " * (end_x - start_x + 1) + line[end_x + 1 :]
+
+    return updated_plan
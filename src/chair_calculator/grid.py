@@ -0,0 +1,137 @@
+from typing import Any, Callable
+
+from src.chair_calculator.constants import Constants
+
+np: Any
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - numpy is an optional dependency
+    np = None
+
+# Character code used for characters that don't fit into a byte, they are all walls.
+WALL_CODE = ord("?")
+
+
+def _require_numpy() -> None:
+    if np is None:
+        raise ImportError("The grid representation requires numpy, install it with `poetry install -E grid`.")
+
+
+def _codes_table(chars: str) -> Any:
+    table = np.zeros(256, dtype=bool)
+    table[list(chars.encode("ascii"))] = True
+    return table
+
+
+def to_grid(floor_plan: list[str], dimensions: tuple[int, int]) -> Any:
+    """Converts the floor plan to the grid of character codes.
+
+    Args:
+        floor_plan (list[str]): The normalized floor plan represented as a list of strings.
+        dimensions (tuple[int, int]): The dimensions of the floor plan (width, height).
+
+    Returns:
+        numpy.ndarray: The 2-D `uint8` array of character codes with the shape (height, width).
+            Characters that don't fit into a byte are stored as the wall code.
+
+    Raises:
+        ValueError: If the floor plan length does not match the dimensions.
+        ImportError: If numpy is not installed.
+    """
+    _require_numpy()
+
+    width, height = dimensions
+    floor_square = width * height
+    floor_plan_len = sum(map(len, floor_plan))
+
+    if floor_square != floor_plan_len:
+        raise ValueError(f"The floor plan length ({floor_plan_len}) \
+does not match the dimensions ({width}x{height}={floor_square}).")
+
+    codes = "".join(floor_plan[:height]).encode("ascii", errors="replace")
+    grid = np.frombuffer(codes, dtype=np.uint8).reshape((height, width)).copy()
+    return grid
+
+
+def erase_labels(grid: Any, label_coords: list[tuple[tuple[int, int], int]]) -> Any:
+    """Erases labels from the grid based on the given coordinates.
+
+    Args:
+        grid (numpy.ndarray): The grid of character codes.
+        label_coords (list[tuple[tuple[int, int], int]]): The coordinates of the labels to be erased.
+            Each label's coordinate is a tuple of two tuples (start_x, end_x) and y.
+
+    Returns:
+        numpy.ndarray: The copy of the grid without room labels.
+    """
+    _require_numpy()
+
+    erased_grid = grid.copy()
+    for (start_x, end_x), y in label_coords:
+        erased_grid[y, start_x : end_x + 1] = ord(Constants.FLOOR_CHAR)
+
+    return erased_grid
+
+
+def validate_non_chair_codes(grid: Any, error_message_fun: Callable[[str], str]) -> None:
+    """Validates the non-chair characters in the given grid.
+
+    Args:
+        grid (numpy.ndarray): The grid of character codes without room labels.
+        error_message_fun (Callable[[str], str]): A function that takes a non-chair character as input
+            and returns an error message.
+
+    Raises:
+        ValueError: If a non-chair character is found in the grid.
+
+    Returns:
+        None
+    """
+    _require_numpy()
+
+    non_chair_floor_wall_chars = "".join(
+        char
+        for char in Constants.ROOM_MARKUP_CHARS
+        if char != Constants.FLOOR_CHAR and char not in Constants.CHAIR_CHARS
+    )
+    is_non_chair = _codes_table(non_chair_floor_wall_chars)[grid]
+
+    if is_non_chair.any():
+        # argmax returns the first index of the non-chair character in the reading order
+        first_idx = int(is_non_chair.argmax())
+        raise ValueError(error_message_fun(chr(grid.flat[first_idx])))
+
+
+def count_chairs(grid: Any, labels: Any) -> dict[int, dict[str, int]]:
+    """Counts chairs of each type per region with a single histogram over (region id, chair code) pairs.
+
+    Args:
+        grid (numpy.ndarray): The grid of character codes without room labels.
+        labels (numpy.ndarray | list[list[int]]): The region ids for each cell of the grid, 0 is for walls.
+
+    Returns:
+        dict[int, dict[str, int]]: A dictionary mapping each region id found in labels to
+            the count of each chair character in the region. Chair characters are from Constants.CHAIR_CHARS.
+    """
+    _require_numpy()
+
+    chairs_count = len(Constants.CHAIR_CHARS)
+    labels = np.asarray(labels, dtype=np.int64).reshape(grid.shape)
+
+    # Chair codes are mapped to their index in Constants.CHAIR_CHARS, other codes are mapped to -1
+    chair_idx_table = np.full(256, -1, dtype=np.int64)
+    chair_idx_table[list(Constants.CHAIR_CHARS.encode("ascii"))] = np.arange(chairs_count)
+    chair_idx = chair_idx_table[grid]
+
+    is_chair = (chair_idx >= 0) & (labels > 0)
+    regions_count = int(labels.max()) + 1 if labels.size else 1
+    histogram = np.bincount(
+        labels[is_chair] * chairs_count + chair_idx[is_chair], minlength=regions_count * chairs_count
+    ).reshape((regions_count, chairs_count))
+
+    region_ids = np.unique(labels[labels > 0])
+    count_by_region = {
+        int(region_id): dict(zip(Constants.CHAIR_CHARS, map(int, histogram[region_id]))) for region_id in region_ids
+    }
+
+    return count_by_region
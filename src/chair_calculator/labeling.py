@@ -0,0 +1,442 @@
+import bisect
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import NamedTuple, Sequence
+
+from src.chair_calculator.char_classes import char_classes
+from src.chair_calculator.constants import Constants
+from src.chair_calculator.validator import WallMap, validate_margin
+
+
+class Region(NamedTuple):
+    """Statistics of the enclosed region of the floor plan.
+
+    Attributes:
+        area (int): The number of cells in the region.
+        bounding_box (tuple[tuple[int, int], tuple[int, int]]): The top left and the bottom right (x, y)
+            coordinates of the cells in the region.
+        chairs (dict[str, int]): The count of each chair character in the region.
+            Chair characters are from Constants.CHAIR_CHARS.
+        unmargined_chair (tuple[int, int] | None): The (x, y) coordinates of the first chair in the region
+            having no margin from walls, or None if every chair has it.
+    """
+
+    area: int
+    bounding_box: tuple[tuple[int, int], tuple[int, int]]
+    chairs: dict[str, int]
+    unmargined_chair: tuple[int, int] | None
+
+
+def label_regions(
+    floor_plan: Sequence[str], dimensions: tuple[int, int]
+) -> tuple[list[list[int]], dict[int, Region]]:
+    """Labels every enclosed region of the floor plan in one sweep over the grid.
+
+    The region is a set of cells that are not walls connected horizontally and vertically,
+    which is the same set of cells that the `mask_room` function fills starting from any of them.
+
+    The plan is scanned row by row for the runs of the cells that are not walls,
+    runs overlapping the runs of the previous row are merged with the union-find structure.
+    The chairs are counted and validated once while scanning.
+
+    Args:
+        floor_plan (Sequence[str]): The floor plan without room labels represented as a sequence of strings.
+        dimensions (tuple[int, int]): The dimensions of the floor plan (width, height).
+
+    Returns:
+        tuple[list[list[int]], dict[int, Region]]: A tuple containing (labels, regions)
+            The labels are the rows of the region ids for each cell of the plan, 0 is for walls.
+            Region ids start from 1 and are numbered in the order of the first cell of the region
+            when reading the plan from left to right and top to bottom.
+            The regions are mapping region ids to their statistics.
+
+    Raises:
+        ValueError: If the floor plan length does not match the dimensions.
+    """
+    width, height = dimensions
+    floor_square = width * height
+    floor_plan_len = sum(map(len, floor_plan))
+
+    if floor_square != floor_plan_len:
+        raise ValueError(f"The floor plan length ({floor_plan_len}) \
+does not match the dimensions ({width}x{height}={floor_square}).")
+
+    runs_by_row, components = _label_runs(floor_plan, range(height))
+
+    labels = []
+    for runs in runs_by_row:
+        row = [0] * width
+        for start, end, region_id in runs:
+            row[start:end] = [region_id] * (end - start)
+        labels.append(row)
+
+    regions = {
+        region_id: Region(
+            area=area,
+            bounding_box=((box[0], box[1]), (box[2], box[3])),
+            chairs=dict(zip(Constants.CHAIR_CHARS, counts)),
+            unmargined_chair=None if unmargined_chair is None else unmargined_chair[::-1],
+        )
+        for region_id, (area, box, counts, unmargined_chair) in enumerate(components, start=1)
+    }
+
+    return labels, regions
+
+
+def label_points(
+    floor_plan: Sequence[str], dimensions: tuple[int, int], points: list[tuple[int, int]]
+) -> tuple[dict[tuple[int, int], int], dict[int, Region]]:
+    """Labels every enclosed region of the floor plan returning the region ids only of the given points.
+
+    The regions are identical to the ones of the `label_regions` function including their ids,
+    but the labels of each cell are not built. Only the runs of the cells that are not walls are kept,
+    and the region id of each point is found by the binary search in the runs of its row,
+    so the memory is bounded by the number of runs rather than by the area of the plan.
+
+    Args:
+        floor_plan (Sequence[str]): The floor plan without room labels represented as a sequence of strings.
+        dimensions (tuple[int, int]): The dimensions of the floor plan (width, height).
+        points (list[tuple[int, int]]): The (x, y) coordinates of the cells to return the region ids for.
+
+    Returns:
+        tuple[dict[tuple[int, int], int], dict[int, Region]]: A tuple containing (point_regions, regions)
+            The point regions are mapping each of the given points to its region id, 0 is for walls.
+            The regions are mapping region ids to their statistics.
+
+    Raises:
+        ValueError: If the floor plan length does not match the dimensions.
+    """
+    width, height = dimensions
+    floor_square = width * height
+    floor_plan_len = sum(map(len, floor_plan))
+
+    if floor_square != floor_plan_len:
+        raise ValueError(f"The floor plan length ({floor_plan_len}) \
+does not match the dimensions ({width}x{height}={floor_square}).")
+
+    runs_by_row, components = _label_runs(floor_plan, range(height))
+
+    regions = {
+        region_id: Region(
+            area=area,
+            bounding_box=((box[0], box[1]), (box[2], box[3])),
+            chairs=dict(zip(Constants.CHAIR_CHARS, counts)),
+            unmargined_chair=None if unmargined_chair is None else unmargined_chair[::-1],
+        )
+        for region_id, (area, box, counts, unmargined_chair) in enumerate(components, start=1)
+    }
+
+    return _point_components(runs_by_row, 0, points), regions
+
+
+def label_regions_tiled(
+    floor_plan: Sequence[str],
+    dimensions: tuple[int, int],
+    points: list[tuple[int, int]],
+    tiles: int,
+    workers: int | None = None,
+) -> tuple[dict[tuple[int, int], int], dict[int, Region]]:
+    """Labels every enclosed region of the floor plan splitting it into row bands labeled in parallel processes.
+
+    Each band is labeled in a worker process the same way as with the `label_regions` function,
+    then the components touching across the seams between bands are merged, and their statistics are summed.
+    The regions are identical to the ones of the `label_regions` function including their ids.
+    The labels of each cell are not sent back from workers, only the region ids of the requested points.
+
+    Args:
+        floor_plan (Sequence[str]): The floor plan without room labels represented as a sequence of strings.
+        dimensions (tuple[int, int]): The dimensions of the floor plan (width, height).
+        points (list[tuple[int, int]]): The (x, y) coordinates of the cells to return the region ids for.
+        tiles (int): The number of row bands to split the floor plan into.
+        workers (int | None): The number of worker processes, defaults to the number of bands
+            but not more than the number of CPUs. With one worker the bands are labeled in the current process.
+
+    Returns:
+        tuple[dict[tuple[int, int], int], dict[int, Region]]: A tuple containing (point_regions, regions)
+            The point regions are mapping each of the given points to its region id, 0 is for walls.
+            The regions are mapping region ids to their statistics.
+
+    Raises:
+        ValueError: If the floor plan length does not match the dimensions,
+            or the number of tiles or workers is less than one.
+    """
+    width, height = dimensions
+    floor_square = width * height
+    floor_plan_len = sum(map(len, floor_plan))
+
+    if floor_square != floor_plan_len:
+        raise ValueError(f"The floor plan length ({floor_plan_len}) \
+does not match the dimensions ({width}x{height}={floor_square}).")
+
+    if tiles < 1:
+        raise ValueError("The number of tiles must be at least one.")
+
+    if workers is not None and workers < 1:
+        raise ValueError("The number of workers must be at least one.")
+
+    tile_height = max(-(-height // tiles), 1)
+    bands = [range(y, min(y + tile_height, height)) for y in range(0, height, tile_height)]
+
+    # Each band is sent with one row above and below it to validate the margin of chairs on its edges
+    tile_args = []
+    for band in bands:
+        first_y = max(band.start - 1, 0)
+        band_points = [(x, y) for x, y in points if y in band]
+        tile_args.append((list(floor_plan[first_y : band.stop + 1]), first_y, band, band_points))
+
+    # More processes than bands would only be started to stay idle
+    workers = workers or min(len(bands), os.cpu_count() or 1)
+    if workers == 1:
+        tile_labels = [_label_tile(*args) for args in tile_args]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            tile_labels = list(executor.map(_label_tile, *zip(*tile_args)))
+
+    # Components of all tiles are numbered in the order of tiles, that is the reading order of their first cells
+    offsets = []
+    components: list[list] = []
+    for tile in tile_labels:
+        offsets.append(len(components))
+        components.extend(tile.components)
+
+    parent = list(range(len(components)))
+
+    def find(component):
+        while parent[component] != component:
+            parent[component] = parent[parent[component]]
+            component = parent[component]
+        return component
+
+    # Union the components having overlapping runs on both sides of each seam
+    for tile_idx in range(1, len(tile_labels)):
+        upper_runs = tile_labels[tile_idx - 1].last_runs
+        upper_offset = offsets[tile_idx - 1] - 1
+        upper_idx = 0
+        for start, end, component in tile_labels[tile_idx].first_runs:
+            while upper_idx < len(upper_runs) and upper_runs[upper_idx][1] <= start:
+                upper_idx += 1
+
+            overlap_idx = upper_idx
+            while overlap_idx < len(upper_runs) and upper_runs[overlap_idx][0] < end:
+                root_a = find(upper_offset + upper_runs[overlap_idx][2])
+                root_b = find(offsets[tile_idx] - 1 + component)
+                if root_a != root_b:
+                    parent[max(root_a, root_b)] = min(root_a, root_b)
+                overlap_idx += 1
+
+    # Merge statistics of the components into their regions numbered in the order of appearance
+    region_ids: dict[int, int] = {}
+    merged: dict[int, list] = {}
+    for component, (area, box, counts, unmargined_chair) in enumerate(components):
+        region_id = region_ids.setdefault(find(component), len(region_ids) + 1)
+        _merge_stats(merged.setdefault(region_id, []), area, box, counts, unmargined_chair)
+
+    point_regions = {}
+    for tile_idx, tile in enumerate(tile_labels):
+        for point, component in tile.point_components.items():
+            point_regions[point] = 0 if component == 0 else region_ids[find(offsets[tile_idx] - 1 + component)]
+
+    regions = {
+        region_id: Region(
+            area=area,
+            bounding_box=((box[0], box[1]), (box[2], box[3])),
+            chairs=dict(zip(Constants.CHAIR_CHARS, counts)),
+            unmargined_chair=None if unmargined_chair is None else unmargined_chair[::-1],
+        )
+        for region_id, (area, box, counts, unmargined_chair) in merged.items()
+    }
+
+    return point_regions, regions
+
+
+class _TileLabels(NamedTuple):
+    # Components of one row band, see the `_label_runs` function for the format of the runs and the statistics.
+    # Only the runs of the first and the last rows of the band are kept to merge the components across seams.
+    first_runs: list[tuple[int, int, int]]
+    last_runs: list[tuple[int, int, int]]
+    components: list[list]
+    point_components: dict[tuple[int, int], int]
+
+
+class _RowBand(Sequence[str]):
+    # Rows of the floor plan addressed by their y coordinates in the whole plan,
+    # reading the rows out of the band raises IndexError as reading out of the plan does.
+
+    def __init__(self, rows: list[str], first_y: int):
+        self._rows = rows
+        self._first_y = first_y
+
+    def __len__(self) -> int:
+        return self._first_y + len(self._rows)
+
+    def __getitem__(self, y):
+        if y < self._first_y or y >= len(self):
+            raise IndexError("The row is out of the band.")
+
+        return self._rows[y - self._first_y]
+
+
+def _label_tile(rows: list[str], first_y: int, band: range, points: list[tuple[int, int]]) -> _TileLabels:
+    runs_by_row, components = _label_runs(_RowBand(rows, first_y), band)
+    point_components = _point_components(runs_by_row, band.start, points)
+
+    return _TileLabels(runs_by_row[0], runs_by_row[-1], components, point_components)
+
+
+def _point_components(
+    runs_by_row: list[list[tuple[int, int, int]]], first_y: int, points: list[tuple[int, int]]
+) -> dict[tuple[int, int], int]:
+    # Finds the component id of each point in the runs of its row, the first row of the runs is first_y
+    point_components = {}
+    for x, y in points:
+        runs = runs_by_row[y - first_y]
+        run_idx = bisect.bisect_right(runs, (x, float("inf"))) - 1
+        is_in_run = run_idx >= 0 and x < runs[run_idx][1]
+        point_components[(x, y)] = runs[run_idx][2] if is_in_run else 0
+
+    return point_components
+
+
+def _label_runs(floor_plan: Sequence[str], rows: range) -> tuple[list[list[tuple[int, int, int]]], list[list]]:
+    # Labels the runs of the given rows of the plan, returns the runs of each row as (start, end, component id)
+    # and the statistics of each component as [area, [x0, y0, x1, y1], chair counts, unmargined chair (y, x)].
+    # Component ids start from 1 in the order of appearance, the statistics list is indexed by id - 1.
+    # Rows out of the range are read only to validate the margin of chairs.
+
+    # Provisional labels are indexes in the following lists, 0 is reserved for walls
+    parent = [0]
+    areas = [0]
+    chair_counts = [[0] * len(Constants.CHAIR_CHARS)]
+    boxes = [[0, 0, 0, 0]]
+    # Coordinates are (y, x) to compare them in the reading order
+    unmargined: list[tuple[int, int] | None] = [None]
+
+    def find(label):
+        while parent[label] != label:
+            parent[label] = parent[parent[label]]
+            label = parent[label]
+        return label
+
+    def union(label_a, label_b):
+        root_a = find(label_a)
+        root_b = find(label_b)
+        if root_a != root_b:
+            parent[max(root_a, root_b)] = min(root_a, root_b)
+
+    runs_by_row: list[list[tuple[int, int, int]]] = []
+    previous_runs: list[tuple[int, int, int]] = []
+    wall_map = WallMap(floor_plan)
+    room_run_pattern = char_classes().room_run_pattern
+
+    for y in rows:
+        line = floor_plan[y]
+        runs = []
+        previous_idx = 0
+
+        for match in room_run_pattern.finditer(line):
+            start, end = match.span()
+
+            # Skip the runs of the previous row that end before the current one,
+            # the remaining overlapping runs are connected vertically with the current one.
+            while previous_idx < len(previous_runs) and previous_runs[previous_idx][1] <= start:
+                previous_idx += 1
+
+            label = 0
+            overlap_idx = previous_idx
+            while overlap_idx < len(previous_runs) and previous_runs[overlap_idx][0] < end:
+                overlap_label = previous_runs[overlap_idx][2]
+                if label == 0:
+                    label = overlap_label
+                else:
+                    union(label, overlap_label)
+                overlap_idx += 1
+
+            if label == 0:
+                label = len(parent)
+                parent.append(label)
+                areas.append(0)
+                chair_counts.append([0] * len(Constants.CHAIR_CHARS))
+                boxes.append([start, y, end - 1, y])
+                unmargined.append(None)
+
+            areas[label] += end - start
+            box = boxes[label]
+            box[0] = min(box[0], start)
+            box[2] = max(box[2], end - 1)
+            box[3] = y
+
+            counts = chair_counts[label]
+            for chair_idx, chair_char in enumerate(Constants.CHAIR_CHARS):
+                chair_x = line.find(chair_char, start, end)
+                while chair_x != -1:
+                    counts[chair_idx] += 1
+                    if wall_map.touches_wall(chair_x, y):
+                        first_unmargined = unmargined[label]
+                        if first_unmargined is None or (y, chair_x) < first_unmargined:
+                            unmargined[label] = (y, chair_x)
+                    chair_x = line.find(chair_char, chair_x + 1, end)
+
+            runs.append((start, end, label))
+
+        runs_by_row.append(runs)
+        previous_runs = runs
+
+    # Resolve provisional labels to the component ids in the order of appearance
+    component_ids: dict[int, int] = {}
+    for runs_idx, runs in enumerate(runs_by_row):
+        runs_by_row[runs_idx] = [
+            (start, end, component_ids.setdefault(find(label), len(component_ids) + 1)) for start, end, label in runs
+        ]
+
+    # Merge statistics of the provisional labels into their components
+    components: list[list] = [[] for _id in component_ids]
+    for label in range(1, len(parent)):
+        stats = components[component_ids[find(label)] - 1]
+        _merge_stats(stats, areas[label], boxes[label], chair_counts[label], unmargined[label])
+
+    return runs_by_row, components
+
+
+def _merge_stats(
+    stats: list, area: int, box: list[int], counts: list[int], unmargined_chair: tuple[int, int] | None
+) -> None:
+    # Adds the statistics of the part of the region to the region statistics in the `_label_runs` function format,
+    # empty statistics are initialized with the part ones.
+    if not stats:
+        stats.extend([0, list(box), [0] * len(Constants.CHAIR_CHARS), None])
+    stats[0] += area
+    merged_box = stats[1]
+    merged_box[0] = min(merged_box[0], box[0])
+    merged_box[1] = min(merged_box[1], box[1])
+    merged_box[2] = max(merged_box[2], box[2])
+    merged_box[3] = max(merged_box[3], box[3])
+    stats[2] = [total + count for total, count in zip(stats[2], counts)]
+    if unmargined_chair is not None and (stats[3] is None or unmargined_chair < stats[3]):
+        stats[3] = unmargined_chair
+
+
+def region_chair_stats(floor_plan: Sequence[str], region: Region) -> dict[str, int]:
+    """Returns the chair statistics of the region validating that every chair has a margin from walls.
+
+    Args:
+        floor_plan (Sequence[str]): The floor plan without room labels which was labeled.
+        region (Region): The region of the floor plan.
+
+    Returns:
+        dict[str, int]: A dictionary containing the count of each chair character found in the region.
+            Chair characters are from Constants.CHAIR_CHARS.
+
+    Raises:
+        ValueError: If any chair in the region has no margin from walls.
+    """
+    if region.unmargined_chair is not None:
+        chair_x, chair_y = region.unmargined_chair
+        chair_char = floor_plan[chair_y][chair_x]
+        validate_margin(
+            floor_plan,
+            start=(chair_x, chair_y),
+            end=(chair_x, chair_y),
+            error_text=f"The chair '{chair_char}' must have at least one space margin from each wall.",
+        )
+
+    return dict(region.chairs)
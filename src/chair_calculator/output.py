@@ -0,0 +1,345 @@
+import csv
+import io
+import json
+from typing import Hashable, Iterable, Iterator, Mapping, NamedTuple, TextIO
+
+from src.chair_calculator.constants import Constants
+from src.chair_calculator.room import stats_totals, str_stats
+
+OUTPUT_FORMATS = ("text", "json", "jsonl", "csv")
+
+
+class PlanStats(NamedTuple):
+    """Chair statistics of the floor plan.
+
+    Attributes:
+        total (dict[str, int] | None): The count of each chair character in all rooms,
+            the chairs of the region shared by several rooms are counted once,
+            or None if only the selected rooms were calculated without the total.
+        rooms (dict[str, dict[str, int]]): The count of each chair character per room name,
+            rooms are in the order of the output.
+        shared_with (dict[str, list[str]] | None): The names of the other rooms labeled in the same region
+            per room name, only the rooms sharing their region are included, or None if no rooms share it.
+    """
+
+    total: dict[str, int] | None
+    rooms: dict[str, dict[str, int]]
+    shared_with: dict[str, list[str]] | None = None
+
+    @classmethod
+    def from_rooms(
+        cls, stats_by_room: dict[str, dict[str, int]], shared_with: dict[str, list[str]] | None = None
+    ) -> "PlanStats":
+        """Creates the statistics of the floor plan summing the statistics of its rooms.
+
+        Args:
+            stats_by_room (dict[str, dict[str, int]]): The count of each chair character per room name.
+            shared_with (dict[str, list[str]] | None): The rooms sharing the region per room name,
+                see the `shared_rooms` function, or None if every room has its own region.
+
+        Returns:
+            PlanStats: The statistics with the total of all rooms counting each region once.
+        """
+        counted_rooms: set[str] = set()
+        for room in stats_by_room:
+            if counted_rooms.isdisjoint((shared_with or {}).get(room, ())):
+                counted_rooms.add(room)
+        total = stats_totals([stats for room, stats in stats_by_room.items() if room in counted_rooms])
+
+        return cls(total, stats_by_room, shared_with or None)
+
+    def delta(self, revised: "PlanStats") -> "PlanStats":
+        """Returns the change of the statistics in the revised floor plan.
+
+        Args:
+            revised (PlanStats): The statistics of the revised floor plan.
+
+        Returns:
+            PlanStats: The difference of the count of each chair character in total and per room,
+                only the rooms which statistics changed are included, sorted by room names.
+                The added rooms have their counts, and the removed rooms have their counts negated.
+        """
+        rooms = {}
+        for room in sorted(self.rooms.keys() | revised.rooms.keys()):
+            old_stats = self.rooms.get(room)
+            new_stats = revised.rooms.get(room)
+            if old_stats != new_stats:
+                rooms[room] = _stats_delta(old_stats or {}, new_stats or {})
+
+        return PlanStats(_stats_delta(self.total or {}, revised.total or {}), rooms)
+
+
+def shared_rooms(region_by_room: Mapping[str, Hashable]) -> dict[str, list[str]]:
+    """Finds the rooms labeled in the same region.
+
+    Args:
+        region_by_room (Mapping[str, Hashable]): The room names mapped to the identifiers of their regions.
+
+    Returns:
+        dict[str, list[str]]: The names of the other rooms sorted alphabetically per room name,
+            only the rooms sharing their region are included.
+    """
+    rooms_by_region: dict[Hashable, list[str]] = {}
+    for room, region in region_by_room.items():
+        rooms_by_region.setdefault(region, []).append(room)
+
+    shared_with = {}
+    for room, region in region_by_room.items():
+        if len(rooms_by_region[region]) > 1:
+            shared_with[room] = sorted(other_room for other_room in rooms_by_region[region] if other_room != room)
+
+    return shared_with
+
+
+def stats_document(stats: PlanStats) -> dict:
+    """Returns the chair statistics as the JSON object of the "json" output format.
+
+    Args:
+        stats (PlanStats): The chair statistics of the floor plan.
+
+    Returns:
+        dict: The object with the "total" if it's calculated and the "rooms" statistics, and the "shared_with" rooms
+            if any rooms share their region.
+    """
+    document: dict = {"total": stats.total} if stats.total is not None else {}
+    document["rooms"] = stats.rooms
+    if stats.shared_with:
+        document["shared_with"] = stats.shared_with
+
+    return document
+
+
+class StatsWriter:
+    """Writes the chair statistics of floor plans to the text file one plan at a time.
+
+    The "text" format is the one the `chairs_per_room` function returns. The "json" format is an object
+    with the "total" and the "rooms" statistics, see the `stats_document` function. The "jsonl" and "csv" formats
+    have one record per line for the total and then for each room, with the "kind" field being "total" or "room".
+    The rooms sharing their region with other rooms list them in every format: the text has them
+    after the room name, for example, `office (shared with desk area):`, the "jsonl" room records have
+    the "shared_with" field, and the "csv" records have the "shared_with" column with the JSON array of the names,
+    empty for other records.
+    The total is left out in every format when it's not calculated.
+    When the statistics of several files are written, each record has the "file" field,
+    the texts have the `==> file_path <==` headers, and the JSON objects are written as an array.
+    """
+
+    def __init__(self, file: TextIO, output_format: str = "text", with_file_path: bool = False):
+        """Initializes the writer.
+
+        Args:
+            file (TextIO): The file to write to.
+            output_format (str): The output format, one of OUTPUT_FORMATS.
+            with_file_path (bool): Whether the statistics of several files are written.
+
+        Raises:
+            ValueError: If the output format is unknown.
+        """
+        if output_format not in OUTPUT_FORMATS:
+            raise ValueError(f"The output format must be one of {', '.join(map(repr, OUTPUT_FORMATS))}.")
+
+        self.file = file
+        self.output_format = output_format
+        self.with_file_path = with_file_path
+        self._written_plans = 0
+        self._fields = (["file"] if with_file_path else []) + ["kind", "room", *Constants.CHAIR_CHARS]
+        self._csv_fields = self._fields + ["shared_with"]
+        self._csv_writer = csv.writer(file, lineterminator="\n") if output_format == "csv" else None
+
+    def write(self, stats: PlanStats, file_path: str | None = None) -> None:
+        """Writes the statistics of one floor plan streaming its records to the file.
+
+        Args:
+            stats (PlanStats): The chair statistics of the floor plan.
+            file_path (str | None): The path to the file with the floor plan, written when the writer is
+                initialized with the file path.
+        """
+        prefix = [file_path] if self.with_file_path else []
+        is_first_plan = self._written_plans == 0
+        self._written_plans += 1
+
+        if self.output_format == "text":
+            if self.with_file_path:
+                self.file.write(f"==> {file_path} <==\n")
+            write_text(self.file, stats)
+            # Plans are separated by the empty line
+            self.file.write("\n")
+
+        elif self.output_format == "json":
+            document: dict[str, object] = {"file": file_path} if self.with_file_path else {}
+            document.update(stats_document(stats))
+            if not self.with_file_path:
+                self.file.write(f"{json.dumps(document)}\n")
+            else:
+                self.file.write("[\n" if is_first_plan else ",\n")
+                self.file.write(json.dumps(document))
+
+        elif self.output_format == "jsonl":
+            for record in _records(stats):
+                document = dict(zip(self._fields, prefix + record))
+                if stats.shared_with is not None and document["room"] in stats.shared_with:
+                    document["shared_with"] = stats.shared_with[document["room"]]
+                self.file.write(f"{json.dumps(document)}\n")
+
+        elif self._csv_writer is not None:
+            shared_with = stats.shared_with or {}
+            if is_first_plan:
+                self._csv_writer.writerow(self._csv_fields)
+            for record in _records(stats):
+                self._csv_writer.writerow(prefix + record + [_csv_shared_with(shared_with.get(record[1], []))])
+
+        self.file.flush()
+
+    def write_records(
+        self, records: Iterable[tuple[str | None, dict[str, int], list[str]]], file_path: str | None = None
+    ) -> None:
+        """Writes the statistics of one floor plan record by record as the records are calculated.
+
+        Each record is flushed as soon as it's taken, so the records of a large plan are not held in memory.
+        The records have the fields of the `write` method, but the total comes after the rooms. In the "json"
+        format, the object is written in parts, and only the rooms sharing their region are kept to write
+        the "shared_with" object at the end. If taking a record fails, the started object is closed,
+        or left out if no record was taken, before the error is raised, so the output stays valid.
+
+        Args:
+            records (Iterable[tuple[str | None, dict[str, int], list[str]]]): The (room name, chair statistics,
+                names of the other rooms labeled in the same region) records of the floor plan, the total
+                is the last record with None as the room name, for example, from the `iter_chair_stats` function.
+            file_path (str | None): The path to the file with the floor plan, written when the writer is
+                initialized with the file path.
+        """
+        prefix = [file_path] if self.with_file_path else []
+        is_first_plan = self._written_plans == 0
+        # The JSON object is started with the first record, so nothing is written if taking it fails
+        if self.output_format != "json":
+            self._written_plans += 1
+
+        if self.output_format == "text" and self.with_file_path:
+            self.file.write(f"==> {file_path} <==\n")
+        elif self._csv_writer is not None and is_first_plan:
+            self._csv_writer.writerow(self._csv_fields)
+
+        shared_with: dict[str, list[str]] = {}
+        is_document_open = False
+        is_rooms_open = False
+        is_finished = False
+        separator = ""
+        try:
+            for room, stats, other_rooms in records:
+                if self.output_format == "text":
+                    self.file.write(_text_record(room if room is not None else "total", stats, other_rooms))
+                elif self.output_format == "json":
+                    if not is_document_open:
+                        self._open_json_document(file_path)
+                        is_document_open = is_rooms_open = True
+                    if room is not None:
+                        self.file.write(f"{separator}{json.dumps(room)}: {json.dumps(stats)}")
+                        separator = ", "
+                    else:
+                        self.file.write(f'}}, "total": {json.dumps(stats)}')
+                        is_rooms_open = False
+                else:
+                    record = prefix + _record(stats, room)
+                    if self._csv_writer is not None:
+                        self._csv_writer.writerow(record + [_csv_shared_with(other_rooms)])
+                    else:
+                        document = dict(zip(self._fields, record))
+                        if other_rooms:
+                            document["shared_with"] = other_rooms
+                        self.file.write(f"{json.dumps(document)}\n")
+                if room is not None and other_rooms:
+                    shared_with[room] = other_rooms
+                self.file.flush()
+            is_finished = True
+        finally:
+            if self.output_format == "text" and is_finished:
+                # Plans are separated by the empty line
+                self.file.write("\n")
+            elif self.output_format == "json" and (is_document_open or is_finished):
+                if not is_document_open:
+                    self._open_json_document(file_path)
+                    is_rooms_open = True
+                shared_field = f', "shared_with": {json.dumps(shared_with)}' if shared_with else ""
+                self.file.write(f"{'}' if is_rooms_open else ''}{shared_field}}}")
+                if not self.with_file_path:
+                    self.file.write("\n")
+            self.file.flush()
+
+    def _open_json_document(self, file_path: str | None) -> None:
+        # Writes the start of the "json" object up to the opening of the "rooms" object
+        if self.with_file_path:
+            self.file.write("[\n" if self._written_plans == 0 else ",\n")
+        self._written_plans += 1
+        file_field = f'"file": {json.dumps(file_path)}, ' if self.with_file_path else ""
+        self.file.write(f'{{{file_field}"rooms": {{')
+
+    def close(self) -> None:
+        """Finishes the output, for example, closes the JSON array. The file is left open."""
+        if self.output_format == "json" and self.with_file_path:
+            self.file.write("[]\n" if self._written_plans == 0 else "\n]\n")
+        elif self._csv_writer is not None and self._written_plans == 0:
+            self._csv_writer.writerow(self._csv_fields)
+        self.file.flush()
+
+    def __enter__(self) -> "StatsWriter":
+        return self
+
+    def __exit__(self, *_args) -> None:
+        self.close()
+
+
+def write_text(file: TextIO, stats: PlanStats) -> None:
+    """Writes the chair statistics as the text of the `chairs_per_room` function.
+
+    Args:
+        file (TextIO): The file to write to.
+        stats (PlanStats): The chair statistics of the floor plan.
+    """
+    shared_with = stats.shared_with or {}
+    if stats.total is not None:
+        file.write(_text_record("total", stats.total))
+    for room, room_stats in stats.rooms.items():
+        file.write(_text_record(room, room_stats, shared_with.get(room, [])))
+
+
+def stats_text(stats: PlanStats) -> str:
+    """Returns the chair statistics as the text of the `chairs_per_room` function.
+
+    Args:
+        stats (PlanStats): The chair statistics of the floor plan.
+
+    Returns:
+        str: The output text containing the chair statistics total for apartment and per each room.
+    """
+    text = io.StringIO()
+    write_text(text, stats)
+
+    return text.getvalue()
+
+
+def _records(stats: PlanStats) -> Iterator[list]:
+    # Rows of the total and each room statistics as [kind, room, count of each chair character]
+    if stats.total is not None:
+        yield _record(stats.total)
+    for room, room_stats in stats.rooms.items():
+        yield _record(room_stats, room)
+
+
+def _text_record(name: str, stats: dict[str, int], other_rooms: list[str] | None = None) -> str:
+    # Lines of the total or the room statistics with the other rooms of the region after the room name
+    shared = f" (shared with {', '.join(other_rooms)})" if other_rooms else ""
+    return f"{name}{shared}:\n{str_stats(stats)}\n"
+
+
+def _csv_shared_with(other_rooms: list[str]) -> str:
+    # Names of the other rooms of the region as the JSON array in one cell, as room names can have any separator
+    return json.dumps(other_rooms) if other_rooms else ""
+
+
+def _record(stats: dict[str, int], room: str | None = None) -> list:
+    # Row of the total if the room is None, otherwise of the room
+    return ["total" if room is None else "room", room, *(stats.get(chair, 0) for chair in Constants.CHAIR_CHARS)]
+
+
+def _stats_delta(old_stats: dict[str, int], new_stats: dict[str, int]) -> dict[str, int]:
+    return {chair: new_stats.get(chair, 0) - old_stats.get(chair, 0) for chair in Constants.CHAIR_CHARS}
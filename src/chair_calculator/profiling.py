@@ -0,0 +1,103 @@
+import time
+import tracemalloc
+from contextlib import contextmanager
+from typing import Callable, Iterator, NamedTuple
+
+
+class PhaseStats(NamedTuple):
+    """Measurements of one run of the phase of the chair statistics calculation.
+
+    Attributes:
+        name (str): The name of the phase.
+        seconds (float): The wall time of the phase.
+        peak_memory (int | None): The peak memory in bytes allocated during the phase above the memory
+            allocated before it, or None if memory is not traced.
+    """
+
+    name: str
+    seconds: float
+    peak_memory: int | None
+
+
+class Profile:
+    """Collects the wall time and the peak memory of each phase and the counters of the calculation.
+
+    Tracing memory with `tracemalloc` slows the calculation down several times,
+    so it's enabled only on request.
+    """
+
+    def __init__(self, trace_memory: bool = False, on_phase: Callable[[PhaseStats], None] | None = None):
+        """Initializes the empty profile.
+
+        Args:
+            trace_memory (bool): Whether to trace the peak memory of each phase with `tracemalloc`.
+            on_phase (Callable[[PhaseStats], None] | None): The function called with the measurements
+                of each phase as soon as it ends, for example, to export them as metrics.
+        """
+        self.trace_memory = trace_memory
+        self.on_phase = on_phase
+        self.phases: list[PhaseStats] = []
+        self.counters: dict[str, int] = {}
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """Measures the code running in the context as the phase with the given name.
+
+        Args:
+            name (str): The name of the phase.
+        """
+        started_tracing = False
+        if self.trace_memory:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+                started_tracing = True
+            tracemalloc.reset_peak()
+            memory_before, _peak = tracemalloc.get_traced_memory()
+
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            seconds = time.perf_counter() - started
+            peak_memory = None
+            if self.trace_memory:
+                _memory, peak = tracemalloc.get_traced_memory()
+                peak_memory = max(peak - memory_before, 0)
+                if started_tracing:
+                    tracemalloc.stop()
+
+            stats = PhaseStats(name, seconds, peak_memory)
+            self.phases.append(stats)
+            if self.on_phase is not None:
+                self.on_phase(stats)
+
+    def count(self, name: str, amount: int = 1) -> None:
+        """Adds the amount to the counter with the given name.
+
+        Args:
+            name (str): The name of the counter.
+            amount (int): The amount to add.
+        """
+        self.counters[name] = self.counters.get(name, 0) + amount
+
+    def report(self) -> dict:
+        """Returns the profile as a dictionary ready to be serialized to JSON.
+
+        Returns:
+            dict: The "phases" mapping each phase name to its total "seconds", number of "calls",
+                and the largest "peak_memory" in bytes, the "counters", and the "total_seconds" of all phases.
+                Phases are in the order of their first run.
+        """
+        phases: dict[str, dict] = {}
+        for stats in self.phases:
+            phase = phases.setdefault(stats.name, {"seconds": 0.0, "calls": 0, "peak_memory": None})
+            phase["seconds"] += stats.seconds
+            phase["calls"] += 1
+            if stats.peak_memory is not None:
+                phase["peak_memory"] = max(phase["peak_memory"] or 0, stats.peak_memory)
+
+        return {
+            "phases": phases,
+            "counters": dict(self.counters),
+            "total_seconds": sum(stats.seconds for stats in self.phases),
+        }
@@ -1,5 +1,105 @@
+from array import array
+from typing import Iterator, NamedTuple
+
+from src.chair_calculator.char_classes import CHAIR, WALL, char_classes
 from src.chair_calculator.constants import Constants
-from src.chair_calculator.validator import validate_margin
+from src.chair_calculator.validator import WallMap
+
+
+class RoomMeasure(NamedTuple):
+    """Statistics of the room collected while filling it.
+
+    Attributes:
+        chairs (dict[str, int]): The count of each chair character in the room.
+            Chair characters are from Constants.CHAIR_CHARS.
+        bounding_box (tuple[tuple[int, int], tuple[int, int]] | None): The top left and the bottom right (x, y)
+            coordinates of the filled cells, or None if no cell was filled.
+        area (int): The number of filled cells.
+    """
+
+    chairs: dict[str, int]
+    bounding_box: tuple[tuple[int, int], tuple[int, int]] | None
+    area: int
+
+
+class RoomMask:
+    """Compact mask of the room keeping only the filled spans of each row.
+
+    Spans are (y, start_x, end_x) tuples with inclusive ends sorted in the reading order
+    and stored in arrays, so the mask takes memory proportional to the number of spans
+    rather than to the floor plan area.
+    """
+
+    def __init__(self, spans: list[tuple[int, int, int]]):
+        """Initializes the mask with the given spans.
+
+        Args:
+            spans (list[tuple[int, int, int]]): The filled spans as (y, start_x, end_x) tuples.
+                Spans must not overlap.
+        """
+        spans = sorted(spans)
+        self._ys = array("i", [y for y, _start_x, _end_x in spans])
+        self._starts = array("i", [start_x for _y, start_x, _end_x in spans])
+        self._ends = array("i", [end_x for _y, _start_x, end_x in spans])
+        self._area = sum(end_x - start_x + 1 for _y, start_x, end_x in spans)
+
+    @property
+    def area(self) -> int:
+        """int: The number of cells in the mask."""
+        return self._area
+
+    def spans(self) -> Iterator[tuple[int, int, int]]:
+        """Iterates over the filled spans as (y, start_x, end_x) tuples in the reading order."""
+        return zip(self._ys, self._starts, self._ends)
+
+    def __iter__(self) -> Iterator[tuple[int, int]]:
+        """Iterates over the (x, y) coordinates of the filled cells in the reading order."""
+        for y, start_x, end_x in self.spans():
+            for x in range(start_x, end_x + 1):
+                yield x, y
+
+    def __len__(self) -> int:
+        return self._area
+
+    def __contains__(self, point: object) -> bool:
+        """Checks if the given (x, y) point is filled with the binary search over the spans."""
+        if not isinstance(point, tuple) or len(point) != 2:
+            return False
+        x, y = point
+
+        # Find the last span starting before or at the point
+        low, high = 0, len(self._ys)
+        while low < high:
+            middle = (low + high) // 2
+            if (self._ys[middle], self._starts[middle]) <= (y, x):
+                low = middle + 1
+            else:
+                high = middle
+        idx = low - 1
+
+        return idx >= 0 and self._ys[idx] == y and x <= self._ends[idx]
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, RoomMask):
+            return NotImplemented
+        return self._ys == other._ys and self._starts == other._starts and self._ends == other._ends
+
+    def to_lines(self, floor_plan: list[str], filler: str) -> list[str]:
+        """Renders the mask over the floor plan as the `mask_room` function does.
+
+        Args:
+            floor_plan (list[str]): The floor plan the mask was made for.
+            filler (str): The character used to fill the room.
+
+        Returns:
+            list[str]: The masked floor plan with the room filled.
+        """
+        masked_lines = list(floor_plan)
+        for y, start_x, end_x in self.spans():
+            line = masked_lines[y]
+            masked_lines[y] = line[:start_x] + filler * (end_x - start_x + 1) + line[end_x + 1 :]
+
+        return masked_lines
 
 
 def mask_room(
@@ -38,6 +138,108 @@ does not match the dimensions ({width}x{height}={floor_square}).")
 
     masked_chars = [list(line) for line in floor_plan]
 
+    for y, start_x, end_x in _fill_spans(floor_plan, dimensions, seed_point):
+        masked_chars[y][start_x : end_x + 1] = filler * (end_x - start_x + 1)
+
+    masked_lines = list(map("".join, masked_chars))
+
+    return masked_lines
+
+
+def mask_room_spans(floor_plan: list[str], dimensions: tuple[int, int], seed_point: tuple[int, int]) -> RoomMask:
+    """Masks a room in the floor plan keeping only the filled spans.
+
+    Fills the same cells as the `mask_room` function does without copying the floor plan.
+
+    Args:
+        floor_plan (list[str]): The floor plan represented as a list of strings.
+        dimensions (tuple[int, int]): The dimensions of the floor plan (width, height).
+        seed_point (tuple[int, int]): The zero-based starting point for masking (x, y).
+
+    Returns:
+        RoomMask: The compact mask of the room.
+
+    Raises:
+        ValueError: If the floor plan length does not match the dimensions.
+
+    """
+    width, height = dimensions
+    floor_square = width * height
+    floor_plan_len = sum(map(len, floor_plan))
+
+    if floor_square != floor_plan_len:
+        raise ValueError(f"The floor plan length ({floor_plan_len}) \
+does not match the dimensions ({width}x{height}={floor_square}).")
+
+    return RoomMask(list(_fill_spans(floor_plan, dimensions, seed_point)))
+
+
+def measure_room(floor_plan: list[str], dimensions: tuple[int, int], seed_point: tuple[int, int]) -> RoomMeasure:
+    """Measures the room of the floor plan counting chairs while filling it from the seed point.
+
+    Fills the same cells as the `mask_room` function does, but visits only the cells of the room
+    without copying the floor plan, so it costs proportionally to the room area.
+
+    Args:
+        floor_plan (list[str]): The floor plan without room labels represented as a list of strings.
+        dimensions (tuple[int, int]): The dimensions of the floor plan (width, height).
+        seed_point (tuple[int, int]): The zero-based starting point for filling (x, y).
+
+    Returns:
+        RoomMeasure: The chair statistics, the bounding box, and the area of the room.
+
+    Raises:
+        ValueError: If the floor plan length does not match the dimensions.
+        ValueError: If any chair in the room has no margin from walls.
+
+    """
+    width, height = dimensions
+    floor_square = width * height
+    floor_plan_len = sum(map(len, floor_plan))
+
+    if floor_square != floor_plan_len:
+        raise ValueError(f"The floor plan length ({floor_plan_len}) \
+does not match the dimensions ({width}x{height}={floor_square}).")
+
+    count_by_chair = {chair_char: 0 for chair_char in Constants.CHAIR_CHARS}
+    area = 0
+    min_x, min_y, max_x, max_y = width, height, -1, -1
+    unmargined_chair: tuple[int, int, str] | None = None
+    wall_map = WallMap(floor_plan)
+
+    for y, start_x, end_x in _fill_spans(floor_plan, dimensions, seed_point):
+        area += end_x - start_x + 1
+        min_x, min_y, max_x, max_y = min(min_x, start_x), min(min_y, y), max(max_x, end_x), max(max_y, y)
+
+        line = floor_plan[y]
+        for chair_char in Constants.CHAIR_CHARS:
+            chair_x = line.find(chair_char, start_x, end_x + 1)
+            while chair_x != -1:
+                count_by_chair[chair_char] += 1
+                if wall_map.touches_wall(chair_x, y):
+                    # Spans are filled out of the reading order, keep the first chair to report it
+                    if unmargined_chair is None or (y, chair_x) < unmargined_chair[:2]:
+                        unmargined_chair = (y, chair_x, chair_char)
+                chair_x = line.find(chair_char, chair_x + 1, end_x + 1)
+
+    if unmargined_chair is not None:
+        _y, _x, chair_char = unmargined_chair
+        raise ValueError(f"The chair '{chair_char}' must have at least one space margin from each wall.")
+
+    bounding_box = ((min_x, min_y), (max_x, max_y)) if area > 0 else None
+
+    return RoomMeasure(chairs=count_by_chair, bounding_box=bounding_box, area=area)
+
+
+def _fill_spans(
+    floor_plan: list[str], dimensions: tuple[int, int], seed_point: tuple[int, int]
+) -> Iterator[tuple[int, int, int]]:
+    # Yields the filled spans as (y, start_x, end_x) tuples running the span fill from the seed point.
+    # Filled cells are tracked per row to not copy the floor plan.
+    width, height = dimensions
+    filled_rows: dict[int, bytearray] = {}
+    by_char = char_classes().by_char
+
     stack = [seed_point]
 
     def can_fill(x, y):
@@ -46,9 +248,11 @@ does not match the dimensions ({width}x{height}={floor_square}).")
             return False
 
         # Don't fill chars that we already filled
-        char = masked_chars[y][x]
-        can = char in Constants.ROOM_MARKUP_CHARS and char != filler
-        return can
+        filled = filled_rows.get(y)
+        if filled is not None and filled[x]:
+            return False
+
+        return by_char[floor_plan[y][x]] != WALL
 
     def find_seed_points(lx, rx, y):
         for x in range(lx, rx + 1):
@@ -61,15 +265,18 @@ does not match the dimensions ({width}x{height}={floor_square}).")
 
         # Fill to the left
         while can_fill(lx, y):
-            masked_chars[y][lx] = filler
             lx -= 1
 
         # Fill to the right
         rx = x + 1
         while can_fill(rx, y):
-            masked_chars[y][rx] = filler
             rx += 1
 
+        if rx - lx > 1:
+            filled = filled_rows.setdefault(y, bytearray(width))
+            filled[lx + 1 : rx] = b"\x01" * (rx - lx - 1)
+            yield y, lx + 1, rx - 1
+
         # Find new seed points above and below.
         # We span till the edge fillable points in the current row
         # to check for a wall because we might have diagonal piece of it
@@ -77,21 +284,28 @@ does not match the dimensions ({width}x{height}={floor_square}).")
         find_seed_points(lx + 1, rx - 1, y + 1)
         find_seed_points(lx + 1, rx - 1, y - 1)
 
-    masked_lines = list(map("".join, masked_chars))
-
-    return masked_lines
-
 
-def print_mask(mask: list[str]) -> str:
+def print_mask(mask: list[str] | RoomMask, floor_plan: list[str] | None = None, filler: str = "*") -> str:
     """Prints the masked floor plan.
 
     Args:
-        mask (list[str]): The masked floor plan represented as a list of strings.
+        mask (list[str] | RoomMask): The masked floor plan represented as a list of strings,
+            or the compact mask of the room.
+        floor_plan (list[str] | None): The floor plan to render the compact mask over.
+        filler (str): The character used to render the compact mask.
 
     Returns:
         str: The masked floor plan as a single string with each line separated by the newline characters.
 
+    Raises:
+        ValueError: If the compact mask is given without the floor plan.
+
     """
+    if isinstance(mask, RoomMask):
+        if floor_plan is None:
+            raise ValueError("The floor plan is required to print the room mask.")
+        mask = mask.to_lines(floor_plan, filler)
+
     return "\n".join(mask)
 
 
@@ -112,15 +326,16 @@ def stats_for_masked_chairs(floor_plan: list[str], mask: list[str], filler: str)
     """
 
     count_by_chair: dict[str, int] = {}
+    wall_map = WallMap(floor_plan)
+    by_char = char_classes().by_char
     try:
         for line_idx, floor_line in enumerate(floor_plan):
             mask_line = mask[line_idx]
             for char_idx, floor_char in enumerate(floor_line):
                 mask_char = mask_line[char_idx]
 
-                if mask_char == filler and floor_char in Constants.CHAIR_CHARS:
-                    validate_margin(
-                        floor_plan,
+                if mask_char == filler and by_char[floor_char] == CHAIR:
+                    wall_map.validate_margin(
                         start=(char_idx, line_idx),
                         end=(char_idx, line_idx),
                         error_text=f"The chair '{floor_char}' must have at least one space margin from each wall.",
@@ -0,0 +1,118 @@
+from array import array
+from itertools import chain
+from typing import Any, Sequence
+
+from src.chair_calculator.floor_plan import filter_chairs, label_spans, normalize_floor_plan, room_label_coordinates
+from src.chair_calculator.labeling import label_regions
+
+np: Any
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - numpy is an optional dependency
+    np = None
+
+
+class RoomIndex:
+    """Index answering which room contains the cell of the floor plan in constant time.
+
+    The rooms are labeled once when the index is built, then each lookup reads the region id of the cell
+    from the label grid and the room name of the region from the room table.
+    The label grid is kept as one flat array of integers, so it takes four bytes per cell.
+    """
+
+    def __init__(
+        self,
+        floor_plan: Sequence[str],
+        dimensions: tuple[int, int],
+        coords_by_room: dict[str, tuple[tuple[int, int], tuple[int, int]]],
+    ):
+        """Builds the index labeling the rooms of the floor plan, use the `from_text` method to parse one.
+
+        Args:
+            floor_plan (Sequence[str]): The floor plan without room labels represented as a sequence of strings.
+            dimensions (tuple[int, int]): The dimensions of the floor plan (width, height).
+            coords_by_room (dict[str, tuple[tuple[int, int], tuple[int, int]]]): The room names mapped
+                to their label coordinates returned by the `room_label_coordinates` function.
+
+        Raises:
+            ValueError: If the floor plan length does not match the dimensions.
+        """
+        self.dimensions = dimensions
+        labels, regions = label_regions(floor_plan, dimensions)
+        self._labels = array("i", chain.from_iterable(labels))
+
+        # Room names by region id, None for walls and regions without a label.
+        # When several labels are in the same region, the region is named after the first room in name order.
+        self._room_names: list[str | None] = [None] * (len(regions) + 1)
+        for room, ((label_start_x, label_start_y), _label_end) in sorted(coords_by_room.items(), reverse=True):
+            self._room_names[labels[label_start_y][label_start_x]] = room
+
+    @classmethod
+    def from_text(cls, plan_content: str) -> "RoomIndex":
+        """Parses the floor plan text as the `chairs_per_room` function does and builds the index.
+
+        Args:
+            plan_content (str): The floor plan containing room labels and chair characters.
+
+        Returns:
+            RoomIndex: The index of the rooms of the plan.
+
+        Raises:
+            ValueError: If the floor plan or its labels are invalid.
+        """
+        floor_plan, dimensions = normalize_floor_plan(plan_content)
+        coords_by_room = room_label_coordinates(floor_plan, dimensions=dimensions)
+        unlabeled_plan = filter_chairs(floor_plan, label_coords=label_spans(coords_by_room))
+
+        return cls(unlabeled_plan, dimensions, coords_by_room)
+
+    def room_at(self, x: int, y: int) -> str | None:
+        """Returns the name of the room containing the cell.
+
+        Args:
+            x (int): The column of the cell.
+            y (int): The row of the cell.
+
+        Returns:
+            str | None: The room name, or None if the cell is a wall or belongs to a region without a label.
+
+        Raises:
+            ValueError: If the cell is outside of the plan.
+        """
+        width, height = self.dimensions
+        if not (0 <= x < width and 0 <= y < height):
+            raise ValueError(f"The cell ({x}, {y}) is outside of the floor plan ({width}x{height}).")
+
+        return self._room_names[self._labels[y * width + x]]
+
+    def rooms_at(self, points: Sequence[tuple[int, int]] | Any) -> list[str | None]:
+        """Returns the names of the rooms containing each cell, see the `room_at` method.
+
+        With numpy installed, all points are looked up at once with array indexing,
+        and the points can be given as the numpy array of the shape (count, 2).
+
+        Args:
+            points (Sequence[tuple[int, int]] | numpy.ndarray): The (x, y) coordinates of the cells.
+
+        Returns:
+            list[str | None]: The room name or None for each point in the given order.
+
+        Raises:
+            ValueError: If any cell is outside of the plan.
+        """
+        if np is None:
+            return [self.room_at(x, y) for x, y in points]
+
+        width, height = self.dimensions
+        coords = np.asarray(points, dtype=np.int64).reshape((-1, 2))
+        xs, ys = coords[:, 0], coords[:, 1]
+        outside = (xs < 0) | (xs >= width) | (ys < 0) | (ys >= height)
+        if outside.any():
+            x, y = coords[outside.argmax()]
+            raise ValueError(f"The cell ({x}, {y}) is outside of the floor plan ({width}x{height}).")
+
+        # The grid shares the memory of the flat label array
+        grid = np.frombuffer(self._labels, dtype=np.intc)
+        room_names = np.array(self._room_names, dtype=object)
+
+        return room_names[grid[ys * width + xs]].tolist()
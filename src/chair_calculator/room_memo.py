@@ -0,0 +1,145 @@
+import hashlib
+from typing import Sequence
+
+from src.chair_calculator.cache import MemoryCache
+from src.chair_calculator.constants import Constants
+
+
+def room_fingerprint(
+    floor_plan: Sequence[str],
+    dimensions: tuple[int, int],
+    bounding_box: tuple[tuple[int, int], tuple[int, int]],
+    point: tuple[int, int],
+) -> bytes:
+    """Calculates the fingerprint of the room geometry relative to its bounding box.
+
+    The fingerprint covers the cells of the bounding box and the one cell wide ring of walls around it,
+    and the point in the room relative to the box. Rooms having the same fingerprint have the same shape
+    and the same chair layout wherever they are in the plan, because the ring encloses the room,
+    and the margins of the chairs are inside the ring.
+
+    Args:
+        floor_plan (Sequence[str]): The floor plan without room labels represented as a sequence of strings.
+        dimensions (tuple[int, int]): The dimensions of the floor plan (width, height).
+        bounding_box (tuple[tuple[int, int], tuple[int, int]]): The top left and the bottom right (x, y)
+            coordinates of the cells in the room.
+        point (tuple[int, int]): The (x, y) coordinates of a cell in the room, for example, its label start.
+
+    Returns:
+        bytes: The digest identifying the room geometry.
+    """
+    width, height = dimensions
+    (min_x, min_y), (max_x, max_y) = bounding_box
+    point_x, point_y = point
+    window_x, window_y = max(min_x - 1, 0), max(min_y - 1, 0)
+    window_end_x, window_end_y = min(max_x + 2, width), min(max_y + 2, height)
+
+    digest = hashlib.blake2b(digest_size=16)
+    # The characters configuration changes the walls, and the window cut by the plan borders
+    # differs from the one having the ring at the same place
+    digest.update(
+        repr(
+            (
+                Constants.ROOM_LABEL_CHARS,
+                Constants.CHAIR_CHARS,
+                Constants.FLOOR_CHAR,
+                point_x - window_x,
+                point_y - window_y,
+                min_x - window_x,
+                min_y - window_y,
+                window_end_x - max_x,
+                window_end_y - max_y,
+            )
+        ).encode()
+    )
+    for y in range(window_y, window_end_y):
+        digest.update(b"\n")
+        digest.update(floor_plan[y][window_x:window_end_x].encode("utf-8", errors="surrogatepass"))
+
+    return digest.digest()
+
+
+class RoomMemo:
+    """In-memory memo of the chair statistics of the rooms by the fingerprint of their geometry.
+
+    The memo remembers the bounding box of each stored room relative to its label start, both by the point
+    of the label and by the room name. So the room labeled at the same point of the next plan, or the room
+    of the same name at another place of it, is looked up by the fingerprint of the box without labeling the plan.
+    The least recently used rooms are evicted when the memo is full.
+    """
+
+    def __init__(self, max_entries: int = 10000):
+        """Initializes the empty memo.
+
+        Args:
+            max_entries (int): The maximum number of the stored rooms.
+
+        Raises:
+            ValueError: If the maximum number of rooms is less than one.
+        """
+        self._stats = MemoryCache(max_entries)
+        self._boxes_by_point = MemoryCache(max_entries)
+        self._boxes_by_name = MemoryCache(max_entries)
+
+    def get(
+        self, floor_plan: Sequence[str], dimensions: tuple[int, int], room: str, label_start: tuple[int, int]
+    ) -> tuple[tuple[tuple[int, int], tuple[int, int]], dict[str, int]] | None:
+        """Returns the room labeled at the point if a room of the same geometry is stored.
+
+        Args:
+            floor_plan (Sequence[str]): The floor plan without room labels represented as a sequence of strings.
+            dimensions (tuple[int, int]): The dimensions of the floor plan (width, height).
+            room (str): The name of the room.
+            label_start (tuple[int, int]): The (x, y) coordinates of the room label start.
+
+        Returns:
+            tuple[tuple[tuple[int, int], tuple[int, int]], dict[str, int]] | None: The bounding box of the room
+                and the count of each chair character in it, or None if it's not stored.
+        """
+        width, height = dimensions
+        label_x, label_y = label_start
+        tried_boxes = []
+        for label_box in [self._boxes_by_point.get(repr(label_start)), self._boxes_by_name.get(room)]:
+            if label_box is None or label_box in tried_boxes:
+                continue
+            tried_boxes.append(label_box)
+
+            (min_dx, min_dy), (max_dx, max_dy) = label_box
+            bounding_box = ((label_x + min_dx, label_y + min_dy), (label_x + max_dx, label_y + max_dy))
+            (min_x, min_y), (max_x, max_y) = bounding_box
+            if min_x < 0 or min_y < 0 or max_x >= width or max_y >= height:
+                continue
+
+            # The box is only a guess, the room is the stored one if the box and its ring are the same
+            stats = self._stats.get(room_fingerprint(floor_plan, dimensions, bounding_box, label_start).hex())
+            if stats is not None:
+                return bounding_box, dict(stats)
+
+        return None
+
+    def put(
+        self,
+        floor_plan: Sequence[str],
+        dimensions: tuple[int, int],
+        room: str,
+        label_start: tuple[int, int],
+        bounding_box: tuple[tuple[int, int], tuple[int, int]],
+        stats: dict[str, int],
+    ) -> None:
+        """Stores the chair statistics of the room labeled at the point.
+
+        Args:
+            floor_plan (Sequence[str]): The floor plan without room labels represented as a sequence of strings.
+            dimensions (tuple[int, int]): The dimensions of the floor plan (width, height).
+            room (str): The name of the room.
+            label_start (tuple[int, int]): The (x, y) coordinates of the room label start.
+            bounding_box (tuple[tuple[int, int], tuple[int, int]]): The bounding box of the room.
+            stats (dict[str, int]): The count of each chair character in the room, its chairs have margins.
+        """
+        label_x, label_y = label_start
+        (min_x, min_y), (max_x, max_y) = bounding_box
+        label_box = ((min_x - label_x, min_y - label_y), (max_x - label_x, max_y - label_y))
+
+        self._boxes_by_point.put(repr(label_start), label_box)
+        self._boxes_by_name.put(room, label_box)
+        self._stats.put(room_fingerprint(floor_plan, dimensions, bounding_box, label_start).hex(), dict(stats))
@@ -0,0 +1,194 @@
+import re
+from typing import Collection, NamedTuple, Sequence
+
+from src.chair_calculator.constants import Constants
+from src.chair_calculator.floor_plan import ROOM_LABEL_PATTERN, iter_room_labels
+from src.chair_calculator.room import RoomMask, mask_room_spans
+from src.chair_calculator.validator import WallMap, validate_non_chair_chars
+
+
+class SelectedRegion(NamedTuple):
+    """Region of the floor plan filled from the label of the selected room.
+
+    Attributes:
+        mask (RoomMask): The filled spans of the region.
+        chairs (dict[str, int]): The count of each chair character in the region, chairs have margins from walls.
+        rooms (list[str]): The names of all room labels found in the region in the reading order.
+    """
+
+    mask: RoomMask
+    chairs: dict[str, int]
+    rooms: list[str]
+
+
+def find_room_labels(
+    floor_plan: Sequence[str], dimensions: tuple[int, int], rooms: Collection[str]
+) -> dict[str, tuple[int, int]]:
+    """Finds the labels of the selected rooms stopping the scan of the plan as soon as all of them are found.
+
+    The selected room labeled more than once makes the plan invalid, as the label left after erasing the other one
+    does when the whole plan is calculated. Its other labels are looked up as the text of the label in each row.
+
+    Args:
+        floor_plan (Sequence[str]): The floor plan represented as a sequence of strings.
+        dimensions (tuple[int, int]): The dimensions of the floor plan (width, height).
+        rooms (Collection[str]): The names of the selected rooms.
+
+    Returns:
+        dict[str, tuple[int, int]]: The selected room names mapped to the (x, y) coordinates of their label starts.
+
+    Raises:
+        ValueError: If any selected room has no label or several labels on the plan,
+            or any label found so far has no margin from walls.
+    """
+    missing_rooms = set(rooms)
+    label_starts: dict[str, tuple[int, int]] = {}
+    if not missing_rooms:
+        return label_starts
+
+    for room, label_start, _label_end in iter_room_labels(floor_plan, dimensions):
+        if room in missing_rooms:
+            missing_rooms.remove(room)
+            label_starts[room] = label_start
+            if not missing_rooms:
+                break
+
+    if missing_rooms:
+        raise ValueError(f"The room '{min(missing_rooms)}' is not found on the floor plan.")
+
+    for room in label_starts:
+        label = f"({room})"
+        if sum(line.count(label) for line in floor_plan) > 1:
+            raise ValueError(f"The floor plan should have only room labels and chair characters, '{label[0]}' found.")
+
+    return label_starts
+
+
+def measure_selected_region(
+    floor_plan: Sequence[str],
+    unlabeled_plan: list[str],
+    dimensions: tuple[int, int],
+    label_start: tuple[int, int],
+    wall_maps: tuple[WallMap, WallMap],
+) -> SelectedRegion:
+    """Fills the region from the room label counting its chairs and validating only its cells.
+
+    The labels of the region and its chairs must have margins from walls,
+    and it must have no text other than room labels and chair characters.
+
+    Args:
+        floor_plan (Sequence[str]): The floor plan with room labels represented as a sequence of strings.
+        unlabeled_plan (list[str]): The same floor plan with room labels erased, see the `erase_room_labels`
+            function.
+        dimensions (tuple[int, int]): The dimensions of the floor plan (width, height).
+        label_start (tuple[int, int]): The (x, y) coordinates of the room label start.
+        wall_maps (tuple[WallMap, WallMap]): The wall maps of the floor plan and of the unlabeled plan
+            shared by the regions.
+
+    Returns:
+        SelectedRegion: The filled spans, the chair statistics, and the room labels of the region.
+
+    Raises:
+        ValueError: If the region is invalid.
+    """
+    wall_map, unlabeled_wall_map = wall_maps
+    mask = mask_room_spans(unlabeled_plan, dimensions, label_start)
+    chairs = {chair_char: 0 for chair_char in Constants.CHAIR_CHARS}
+    rooms = []
+    unmargined_chair: tuple[int, int, str] | None = None
+
+    for y, start_x, end_x in mask.spans():
+        # Labels are erased to the floor, so every label of the region is within one of its spans
+        labeled_span = floor_plan[y][start_x : end_x + 1]
+        if "(" in labeled_span:
+            for match in ROOM_LABEL_PATTERN.finditer(labeled_span):
+                wall_map.validate_margin(
+                    start=(start_x + match.start(), y),
+                    end=(start_x + match.end() - 1, y),
+                    error_text="The room label must have at least one space margin from each wall.",
+                )
+                rooms.append(match.group(1))
+
+        span = unlabeled_plan[y][start_x : end_x + 1]
+        validate_non_chair_chars(
+            [span], lambda char: f"The floor plan should have only room labels and chair characters, '{char}' found."
+        )
+
+        for chair_char in Constants.CHAIR_CHARS:
+            chair_x = span.find(chair_char)
+            while chair_x != -1:
+                chairs[chair_char] += 1
+                if unlabeled_wall_map.touches_wall(start_x + chair_x, y) and (
+                    unmargined_chair is None or (y, start_x + chair_x) < unmargined_chair[:2]
+                ):
+                    unmargined_chair = (y, start_x + chair_x, chair_char)
+                chair_x = span.find(chair_char, chair_x + 1)
+
+    if unmargined_chair is not None:
+        _y, _x, chair_char = unmargined_chair
+        raise ValueError(f"The chair '{chair_char}' must have at least one space margin from each wall.")
+
+    return SelectedRegion(mask, chairs, rooms)
+
+
+def erase_room_labels(floor_plan: Sequence[str]) -> list[str]:
+    """Erases the room labels fitting in one row from the floor plan without looking them up.
+
+    Only the rows having the opening bracket are changed, so the rest of the rows are shared with the plan.
+
+    Args:
+        floor_plan (Sequence[str]): The floor plan with room labels represented as a sequence of strings.
+
+    Returns:
+        list[str]: The floor plan with labels replaced by the floor.
+    """
+
+    def erase(match: re.Match) -> str:
+        return Constants.FLOOR_CHAR * len(match.group())
+
+    return [ROOM_LABEL_PATTERN.sub(erase, line) if "(" in line else line for line in floor_plan]
+
+
+def selected_room_stats(
+    floor_plan: Sequence[str], dimensions: tuple[int, int], rooms: Collection[str]
+) -> tuple[dict[str, dict[str, int]], dict[str, list[str]]]:
+    """Calculates the chair statistics of the selected rooms filling only their regions.
+
+    The labels are looked up until all selected rooms are found, and the region shared by several
+    selected rooms is filled once. The rest of the plan is neither filled nor validated.
+    Room labels must start and end on the same row.
+
+    Args:
+        floor_plan (Sequence[str]): The floor plan with room labels represented as a sequence of strings.
+        dimensions (tuple[int, int]): The dimensions of the floor plan (width, height).
+        rooms (Collection[str]): The names of the selected rooms.
+
+    Returns:
+        tuple[dict[str, dict[str, int]], dict[str, list[str]]]: A tuple containing (stats_by_room, shared_with)
+            The statistics are mapping the selected room names sorted alphabetically to their chair counts.
+            The shared rooms are mapping the selected room names to the other rooms labeled in the same region
+            sorted alphabetically, only the rooms sharing their region are included.
+
+    Raises:
+        ValueError: If any selected room is not found, or its region is invalid.
+    """
+    label_starts = find_room_labels(floor_plan, dimensions, rooms)
+    unlabeled_plan = erase_room_labels(floor_plan)
+    wall_maps = (WallMap(floor_plan), WallMap(unlabeled_plan))
+    regions: list[SelectedRegion] = []
+    stats_by_room = {}
+    shared_with = {}
+
+    for room in sorted(label_starts):
+        label_start = label_starts[room]
+        region = next((region for region in regions if label_start in region.mask), None)
+        if region is None:
+            region = measure_selected_region(floor_plan, unlabeled_plan, dimensions, label_start, wall_maps)
+            regions.append(region)
+
+        stats_by_room[room] = dict(region.chairs)
+        other_rooms = sorted(set(region.rooms) - {room})
+        if other_rooms:
+            shared_with[room] = other_rooms
+
+    return stats_by_room, shared_with
@@ -0,0 +1,349 @@
+from typing import Collection, Iterable, Iterator, TextIO
+
+from src.chair_calculator.char_classes import char_classes
+from src.chair_calculator.constants import Constants
+from src.chair_calculator.floor_plan import ROOM_LABEL_PATTERN
+from src.chair_calculator.output import PlanStats, shared_rooms
+from src.chair_calculator.validator import validate_margin, validate_non_chair_chars
+
+
+class _StreamRegion:
+    # Region of the plan that is still open, meaning that it has cells in the last processed row.
+    # Regions merged into another one keep the reference to it in the parent attribute.
+
+    __slots__ = ("parent", "chairs", "rooms", "unmargined_chair")
+
+    def __init__(self):
+        self.parent: _StreamRegion | None = None
+        self.chairs = [0] * len(Constants.CHAIR_CHARS)
+        # Rooms are (label order, name) tuples
+        self.rooms: list[tuple[int, str]] = []
+        # Coordinates are (y, x, chair char) to compare them in the reading order
+        self.unmargined_chair: tuple[int, int, str] | None = None
+
+    def root(self) -> "_StreamRegion":
+        region = self
+        while region.parent is not None:
+            if region.parent.parent is not None:
+                region.parent = region.parent.parent
+            region = region.parent
+        return region
+
+    def merge(self, other: "_StreamRegion") -> "_StreamRegion":
+        root = self.root()
+        other_root = other.root()
+        if root is other_root:
+            return root
+
+        root.chairs = [count + other_count for count, other_count in zip(root.chairs, other_root.chairs)]
+        root.rooms.extend(other_root.rooms)
+        if other_root.unmargined_chair is not None and (
+            root.unmargined_chair is None or other_root.unmargined_chair < root.unmargined_chair
+        ):
+            root.unmargined_chair = other_root.unmargined_chair
+        other_root.parent = root
+        # Release the merged statistics
+        other_root.rooms = []
+
+        return root
+
+
+def plan_rows(lines: Iterable[str]) -> Iterator[str]:
+    """Iterates over the rows of the floor plan read line by line.
+
+    Yields the same rows as the `normalize_floor_plan` function splits the whole plan into, without padding.
+
+    Args:
+        lines (Iterable[str]): The lines of the floor plan with the trailing newline characters,
+            like the ones read from a text file. Lines can end with "\\n", "\\r\\n", or "\\r", for example,
+            when the file is opened without translating newlines.
+
+    Yields:
+        str: The rows of the floor plan without the newline characters.
+    """
+    ends_with_newline = False
+    for line in lines:
+        ends_with_newline = line.endswith(("\n", "\r"))
+        if ends_with_newline:
+            line = line[:-2] if line.endswith("\r\n") else line[:-1]
+        yield line
+
+    # The plan ending with the newline has the last empty row
+    if ends_with_newline:
+        yield ""
+
+
+def plan_width(lines: Iterable[str]) -> int:
+    """Calculates the width of the floor plan read line by line.
+
+    Args:
+        lines (Iterable[str]): The lines of the floor plan with the trailing newline characters.
+
+    Returns:
+        int: The maximum row length.
+    """
+    return max(map(len, plan_rows(lines)), default=0)
+
+
+def iter_room_stats(lines: Iterable[str], width: int) -> Iterator[tuple[int, str, dict[str, int]]]:
+    """Calculates chair statistics of the rooms reading the floor plan line by line.
+
+    Keeps only the window of three rows and the runs of the cells that are not walls of the last row.
+    The runs are labeled incrementally, merging the regions connected through the current row.
+    The region is finished when none of its cells are in the next row, then its rooms are yielded.
+
+    Room labels must start and end on the same row. Errors are raised as soon as the rows having them are read.
+
+    Args:
+        lines (Iterable[str]): The lines of the floor plan with the trailing newline characters.
+        width (int): The width of the floor plan, shorter rows are padded with the floor characters.
+
+    Yields:
+        tuple[int, str, dict[str, int]]: The (label order, room name, chair statistics) tuples
+            in the order of regions finishing. The label order is the index of the room label
+            in the reading order of the plan.
+
+    Raises:
+        ValueError: If any room label or chair has no margin from walls, the plan has text
+            other than room labels and chair characters, or a row is longer than the width.
+    """
+    for region_rooms in iter_region_rooms(lines, width):
+        yield from region_rooms
+
+
+def iter_region_rooms(lines: Iterable[str], width: int) -> Iterator[list[tuple[int, str, dict[str, int]]]]:
+    """Calculates chair statistics of the rooms reading the floor plan line by line grouped by their regions.
+
+    See the `iter_room_stats` function, the rooms labeled in the same region are yielded together.
+
+    Args:
+        lines (Iterable[str]): The lines of the floor plan with the trailing newline characters.
+        width (int): The width of the floor plan, shorter rows are padded with the floor characters.
+
+    Yields:
+        list[tuple[int, str, dict[str, int]]]: The (label order, room name, chair statistics) tuples
+            of the rooms of each region having labels in the order of regions finishing.
+
+    Raises:
+        ValueError: If any room label or chair has no margin from walls, the plan has text
+            other than room labels and chair characters, or a row is longer than the width.
+    """
+    label_order = 0
+    # The window of (raw row, unlabeled row, labels) tuples for the last three rows,
+    # labels are (label order, start_x, end_x, name) tuples.
+    window: list[tuple[str, str, list[tuple[int, int, int, str]]]] = []
+    previous_runs: list[tuple[int, int, _StreamRegion]] = []
+    room_run_pattern = char_classes().room_run_pattern
+
+    def process_row(y: int, row_idx: int) -> Iterator[list[tuple[int, str, dict[str, int]]]]:
+        nonlocal previous_runs
+
+        # Margins are validated within the window, row_idx is the index of the row y in it
+        raw_rows = [raw_row for raw_row, _row, _labels in window]
+        rows = [row for _raw_row, row, _labels in window]
+        _raw_line, line, line_labels = window[row_idx]
+
+        for _order, start_x, end_x, _name in line_labels:
+            validate_margin(
+                raw_rows,
+                start=(start_x, row_idx),
+                end=(end_x, row_idx),
+                error_text="The room label must have at least one space margin from each wall.",
+            )
+
+        runs = []
+        previous_idx = 0
+        for match in room_run_pattern.finditer(line):
+            start, end = match.span()
+
+            # Skip the runs of the previous row that end before the current one,
+            # the remaining overlapping runs are connected vertically with the current one.
+            while previous_idx < len(previous_runs) and previous_runs[previous_idx][1] <= start:
+                previous_idx += 1
+
+            region = None
+            overlap_idx = previous_idx
+            while overlap_idx < len(previous_runs) and previous_runs[overlap_idx][0] < end:
+                overlap_region = previous_runs[overlap_idx][2]
+                region = overlap_region.root() if region is None else region.merge(overlap_region)
+                overlap_idx += 1
+
+            if region is None:
+                region = _StreamRegion()
+
+            for chair_idx, chair_char in enumerate(Constants.CHAIR_CHARS):
+                chair_x = line.find(chair_char, start, end)
+                while chair_x != -1:
+                    region.chairs[chair_idx] += 1
+                    try:
+                        validate_margin(rows, start=(chair_x, row_idx), end=(chair_x, row_idx), error_text="")
+                    except ValueError:
+                        if region.unmargined_chair is None or (y, chair_x) < region.unmargined_chair[:2]:
+                            region.unmargined_chair = (y, chair_x, chair_char)
+                    chair_x = line.find(chair_char, chair_x + 1, end)
+
+            runs.append((start, end, region))
+
+        # Attach rooms to the regions of the runs containing the start of their labels
+        run_idx = 0
+        for order, start_x, _end_x, name in line_labels:
+            while runs[run_idx][1] <= start_x:
+                run_idx += 1
+            runs[run_idx][2].root().rooms.append((order, name))
+
+        # Regions of the previous row that have no cells in the current one are finished
+        open_regions = {id(region.root()) for _start, _end, region in runs}
+        for region in _roots(previous_runs):
+            if id(region) not in open_regions:
+                yield from finish_region(region)
+
+        previous_runs = runs
+
+    def finish_region(region: _StreamRegion) -> Iterator[list[tuple[int, str, dict[str, int]]]]:
+        if region.rooms and region.unmargined_chair is not None:
+            _y, _x, chair_char = region.unmargined_chair
+            raise ValueError(f"The chair '{chair_char}' must have at least one space margin from each wall.")
+
+        if region.rooms:
+            yield [(order, name, dict(zip(Constants.CHAIR_CHARS, region.chairs))) for order, name in region.rooms]
+
+    y = -1
+    for y, raw_line in enumerate(plan_rows(lines)):
+        if len(raw_line) > width:
+            raise ValueError(f"The floor plan row {y} is longer than the width ({width}).")
+        raw_line = raw_line.ljust(width)
+
+        # Remove labels from the row so they don't interfere with the chair counting
+        line_labels = []
+        line = raw_line
+        for match in ROOM_LABEL_PATTERN.finditer(raw_line):
+            start_x, end_x = match.start(), match.end() - 1
+            line_labels.append((label_order, start_x, end_x, match.group(1)))
+            line = line[:start_x] + Constants.FLOOR_CHAR * (end_x - start_x + 1) + line[end_x + 1 :]
+            label_order += 1
+
+        validate_non_chair_chars(
+            [line], lambda char: f"The floor plan should have only room labels and chair characters, '{char}' found."
+        )
+
+        window.append((raw_line, line, line_labels))
+        if len(window) > 3:
+            window.pop(0)
+
+        # Process the previous row when the row below it is read
+        if y > 0:
+            yield from process_row(y - 1, row_idx=len(window) - 2)
+
+    if y >= 0:
+        # The last row has no row below it
+        yield from process_row(y, row_idx=len(window) - 1)
+
+    for region in _roots(previous_runs):
+        yield from finish_region(region)
+
+
+def _check_unique_room(room_names: Collection[str], room: str) -> None:
+    # The repeated label is an invalid character of the plan, as the validator finds it
+    # after the labels of the whole plan are extracted by name
+    if room in room_names:
+        raise ValueError("The floor plan should have only room labels and chair characters, '(' found.")
+
+
+def _roots(runs: list[tuple[int, int, _StreamRegion]]) -> list[_StreamRegion]:
+    # Returns the distinct root regions of the runs in the order of the runs
+    roots = {id(root): root for root in (region.root() for _start, _end, region in runs)}
+    return list(roots.values())
+
+
+def iter_chair_stats(plan_file: TextIO) -> Iterator[tuple[str | None, dict[str, int], list[str]]]:
+    """Yields the chair statistics of each room reading the floor plan file line by line as soon as it's finished.
+
+    The room is finished when the last row of its region is read, so the first rooms are yielded
+    long before the whole plan is read. The total comes last, and the region shared by several rooms
+    is counted in it once. Only the names of the yielded rooms are kept to reject the repeated ones,
+    so the memory is bounded by the width of the plan and the number of rooms rather than by the area.
+    Room labels must start and end on the same row.
+
+    Args:
+        plan_file (TextIO): The seekable text file with the floor plan.
+
+    Yields:
+        tuple[str | None, dict[str, int], list[str]]: The (room name, chair statistics, names of the other rooms
+            labeled in the same region sorted alphabetically) records in the order of regions finishing,
+            then the (None, total, []) record.
+
+    Raises:
+        ValueError: If any room label or chair has no margin from walls, the plan has text
+            other than room labels and chair characters, or a room name is labeled more than once.
+            The rooms finished before the error are yielded.
+    """
+    width = plan_width(plan_file)
+    plan_file.seek(0)
+
+    totals = {chair_char: 0 for chair_char in Constants.CHAIR_CHARS}
+    room_names: set[str] = set()
+    for region_rooms in iter_region_rooms(plan_file, width):
+        # Every room of the region has the chairs of the whole region
+        _order, _room, region_stats = region_rooms[0]
+        for chair_char in Constants.CHAIR_CHARS:
+            totals[chair_char] += region_stats[chair_char]
+
+        region_room_names = [room for _order, room, _stats in region_rooms]
+        for _order, room, stats in region_rooms:
+            _check_unique_room(room_names, room)
+            room_names.add(room)
+            yield room, stats, sorted(other_room for other_room in region_room_names if other_room != room)
+
+    yield None, totals, []
+
+
+def stream_stats_per_room(plan_file: TextIO) -> dict[str, dict[str, int]]:
+    """Calculates chair statistics per room reading the floor plan file line by line.
+
+    The file is read twice, first to find the width of the plan and then to label the rooms,
+    so the memory is bounded by the width of the plan rather than by its area.
+
+    Args:
+        plan_file (TextIO): The seekable text file with the floor plan.
+
+    Returns:
+        dict[str, dict[str, int]]: A dictionary mapping room names sorted alphabetically to their chair statistics.
+            A room name labeled more than once makes the plan invalid.
+
+    Raises:
+        ValueError: If any room label or chair has no margin from walls, the plan has text
+            other than room labels and chair characters, or a room name is labeled more than once.
+    """
+    return stream_plan_stats(plan_file).rooms
+
+
+def stream_plan_stats(plan_file: TextIO) -> PlanStats:
+    """Calculates chair statistics of the floor plan reading its file line by line.
+
+    See the `stream_stats_per_room` function, the rooms labeled in the same region are reported as shared
+    and their chairs are counted once in the total.
+
+    Args:
+        plan_file (TextIO): The seekable text file with the floor plan.
+
+    Returns:
+        PlanStats: The chair statistics total for apartment and per each room, rooms are sorted alphabetically.
+
+    Raises:
+        ValueError: If any room label or chair has no margin from walls, the plan has text
+            other than room labels and chair characters, or a room name is labeled more than once.
+    """
+    width = plan_width(plan_file)
+    plan_file.seek(0)
+
+    # The chair statistics and the index of the region in the finishing order per room
+    room_labels: dict[str, tuple[dict[str, int], int]] = {}
+    for region_idx, region_rooms in enumerate(iter_region_rooms(plan_file, width)):
+        for _order, room, stats in region_rooms:
+            _check_unique_room(room_labels.keys(), room)
+            room_labels[room] = (stats, region_idx)
+
+    rooms = sorted(room_labels)
+    return PlanStats.from_rooms(
+        {room: room_labels[room][0] for room in rooms}, shared_rooms({room: room_labels[room][1] for room in rooms})
+    )
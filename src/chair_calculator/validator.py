@@ -1,9 +1,9 @@
-from typing import Callable
+from typing import Callable, Sequence
 
-from src.chair_calculator.constants import Constants
+from src.chair_calculator.char_classes import LABEL, WALL, char_classes
 
 
-def validate_margin(floor_plan: list[str], start: tuple[int, int], end: tuple[int, int], error_text: str) -> None:
+def validate_margin(floor_plan: Sequence[str], start: tuple[int, int], end: tuple[int, int], error_text: str) -> None:
     """Validates the margin of a given label within the specified start and end coordinates.
 
     Can validate the margin around chair charecter when start tuple equals end one.
@@ -23,7 +23,7 @@ def validate_margin(floor_plan: list[str], start: tuple[int, int], end: tuple[in
     ```
 
     Args:
-        floor_plan (list[str]): The floor plan represented as a list of strings.
+        floor_plan (Sequence[str]): The floor plan represented as a sequence of strings.
         start (tuple[int, int]): The starting coordinates (x, y) of the label.
         end (tuple[int, int]): The ending coordinates (x, y) of the label.
         error_text (str): The error message to be raised if the margin is invalid.
@@ -45,19 +45,115 @@ def validate_margin(floor_plan: list[str], start: tuple[int, int], end: tuple[in
         margin += floor_plan[start_y + 1][start_x - 1 : end_x + 2]
         margin += floor_plan[start_y][end_x + 1]
         margin += floor_plan[start_y - 1][start_x - 1 : end_x + 2]
-        for char in margin:
-            if char not in Constants.ROOM_MARKUP_CHARS:
-                raise ValueError
+        if margin.translate(char_classes().translate_table).find(WALL) != -1:
+            raise ValueError
 
     except Exception as _e:
         raise ValueError(error_text)
 
 
-def validate_non_chair_chars(floor_plan: list[str], error_message_fun: Callable[[str], str]) -> None:
+class WallMap:
+    """Bitmap of the walls of the floor plan for checking the margin of chairs and labels in constant time.
+
+    Each row is kept as an integer having the bit set for every wall cell, and the cells touching walls
+    are kept the same way for the chair checks. The row is built once on the first margin check next to it,
+    so the rows far from chairs and labels are never read.
+    The checks give the same result as the `validate_margin` function.
+    """
+
+    def __init__(self, floor_plan: Sequence[str]):
+        """Initializes the empty bitmap of the floor plan.
+
+        Args:
+            floor_plan (Sequence[str]): The floor plan represented as a sequence of strings.
+        """
+        self._floor_plan = floor_plan
+        self._room_run_pattern = char_classes().room_run_pattern
+        self._wall_rows: dict[int, int] = {}
+        self._near_wall_rows: dict[int, int] = {}
+
+    def has_margin(self, start: tuple[int, int], end: tuple[int, int]) -> bool:
+        """Checks that the label or the chair has one character wide margin without walls around it.
+
+        Args:
+            start (tuple[int, int]): The starting coordinates (x, y) of the label or the chair.
+            end (tuple[int, int]): The ending coordinates (x, y) of the label or the chair.
+
+        Returns:
+            bool: True if every cell of the margin is inside the floor plan and is not a wall.
+        """
+        start_x, start_y = start
+        end_x, _end_y = end
+
+        if start_x == 0 or start_y == 0 or start_y + 1 >= len(self._floor_plan):
+            return False
+
+        if end_x + 1 >= len(self._floor_plan[start_y]):
+            return False
+
+        window = ((1 << max(end_x - start_x + 3, 0)) - 1) << (start_x - 1)
+        sides = (1 << (start_x - 1)) | (1 << (end_x + 1))
+
+        return not (
+            self._walls(start_y - 1) & window or self._walls(start_y + 1) & window or self._walls(start_y) & sides
+        )
+
+    def touches_wall(self, x: int, y: int) -> bool:
+        """Checks that the cell has a wall or the floor plan border among its eight neighbours.
+
+        The chair has a margin when its cell doesn't touch a wall. The wall cell always touches a wall itself.
+
+        Args:
+            x (int): The x coordinate of the cell.
+            y (int): The y coordinate of the cell.
+
+        Returns:
+            bool: True if any neighbour of the cell is a wall or is outside of the floor plan.
+        """
+        near_walls = self._near_wall_rows.get(y)
+        if near_walls is None:
+            width = len(self._floor_plan[y])
+            if y == 0 or y + 1 >= len(self._floor_plan):
+                near_walls = (1 << width) - 1
+            else:
+                near_walls = self._walls(y - 1) | self._walls(y) | self._walls(y + 1)
+                near_walls |= (near_walls << 1) | (near_walls >> 1) | 1 | (1 << (width - 1))
+            self._near_wall_rows[y] = near_walls
+
+        return bool((near_walls >> x) & 1)
+
+    def validate_margin(self, start: tuple[int, int], end: tuple[int, int], error_text: str) -> None:
+        """Validates the margin of the label or the chair like the `validate_margin` function.
+
+        Args:
+            start (tuple[int, int]): The starting coordinates (x, y) of the label or the chair.
+            end (tuple[int, int]): The ending coordinates (x, y) of the label or the chair.
+            error_text (str): The error message to be raised if the margin is invalid.
+
+        Raises:
+            ValueError: If the margin is invalid.
+        """
+        if not self.has_margin(start, end):
+            raise ValueError(error_text)
+
+    def _walls(self, y: int) -> int:
+        walls = self._wall_rows.get(y)
+        if walls is None:
+            line = self._floor_plan[y]
+            walls = (1 << len(line)) - 1
+            for match in self._room_run_pattern.finditer(line):
+                start, end = match.span()
+                walls ^= ((1 << (end - start)) - 1) << start
+            self._wall_rows[y] = walls
+
+        return walls
+
+
+def validate_non_chair_chars(floor_plan: Sequence[str], error_message_fun: Callable[[str], str]) -> None:
     """Validates the non-chair characters in the given floor plan.
 
     Args:
-        floor_plan (list[str]): The floor plan represented as a list of strings without room labels.
+        floor_plan (Sequence[str]): The floor plan represented as a sequence of strings without room labels.
         error_message_fun (Callable[[str], str]): A function that takes a non-chair character as input
             and returns an error message.
 
@@ -67,13 +163,9 @@ def validate_non_chair_chars(floor_plan: list[str], error_message_fun: Callable[
     Returns:
         None
     """
-    non_chair_floor_wall_chars = [
-        char
-        for char in Constants.ROOM_MARKUP_CHARS
-        if char != Constants.FLOOR_CHAR and char not in Constants.CHAIR_CHARS
-    ]
-
+    # Room label characters left in the plan are neither the floor, chairs, nor walls
+    translate_table = char_classes().translate_table
     for line in floor_plan:
-        for char in line:
-            if char in non_chair_floor_wall_chars:
-                raise ValueError(error_message_fun(char))
+        label_x = line.translate(translate_table).find(LABEL)
+        if label_x != -1:
+            raise ValueError(error_message_fun(line[label_x]))
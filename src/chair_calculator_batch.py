@@ -0,0 +1,134 @@
+import glob
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Iterator, Literal, NamedTuple
+
+from src.chair_calculator.cache import ResultCache
+from src.chair_calculator.output import PlanStats
+from src.chair_calculator.room_memo import RoomMemo
+from src.chair_calculator_main import chair_stats_file
+
+# Statistics of the room geometries seen by the worker process, set when the process is started
+# by the pool of the `chairs_per_room_files` function, so it's kept only for the files of one batch
+_worker_memo: RoomMemo | None = None
+
+
+class FileResult(NamedTuple):
+    """Result of calculating the chair statistics for one floor plan file.
+
+    Attributes:
+        file_path (str): The path to the file with the floor plan.
+        stats (PlanStats | None): The chair statistics of the floor plan, or None if calculation failed.
+        error (str | None): The error message, or None if calculation succeeded.
+    """
+
+    file_path: str
+    stats: PlanStats | None
+    error: str | None
+
+
+def plan_file_paths(paths: list[str]) -> list[str]:
+    """Expands the given paths to the list of floor plan files.
+
+    Args:
+        paths (list[str]): The paths to the files, to the directories with the files,
+            or the glob patterns matching the files.
+
+    Returns:
+        list[str]: The file paths in the order of the given paths, files of each directory
+            and each glob pattern are sorted. Paths to missing files are kept to be reported as errors.
+    """
+    file_paths: list[str] = []
+    for path in paths:
+        if os.path.isdir(path):
+            dir_paths = (os.path.join(path, name) for name in sorted(os.listdir(path)))
+            file_paths.extend(dir_path for dir_path in dir_paths if os.path.isfile(dir_path))
+        elif any(char in path for char in "*?["):
+            file_paths.extend(sorted(glob_path for glob_path in glob.glob(path) if os.path.isfile(glob_path)))
+        else:
+            file_paths.append(path)
+
+    return file_paths
+
+
+def chairs_per_room_files(
+    file_paths: list[str],
+    workers: int | None = None,
+    chunksize: int = 1,
+    input_mode: Literal["read", "stream", "mmap"] = "read",
+    cache_dir: str | None = None,
+    cache_size: int = 10000,
+) -> Iterator[FileResult]:
+    """Calculates the chair statistics for many floor plan files in parallel worker processes.
+
+    Files are sent to workers in chunks, and the results of each chunk are yielded as soon as it is done.
+    Each worker remembers the statistics of the rooms it has seen by their geometry with its own `RoomMemo`
+    created for this call, so the rooms repeated in other files read into memory are not labeled again.
+    The error in one file is reported in its result without stopping the others.
+
+    Args:
+        file_paths (list[str]): The paths to the files with the floor plans.
+        workers (int | None): The number of worker processes, defaults to the number of CPUs.
+            With one worker the files are processed in the current process.
+        chunksize (int): The number of files sent to a worker at once.
+        input_mode (Literal["read", "stream", "mmap"]): How to read each file, see the `chair_stats_file` function.
+        cache_dir (str | None): The directory of the result cache shared by the workers, or None to not use it.
+        cache_size (int): The maximum number of results in the cache.
+
+    Yields:
+        FileResult: The result for each file in the order of completion.
+
+    Raises:
+        ValueError: If the number of workers or the chunk size is less than one.
+    """
+    if workers is not None and workers < 1:
+        raise ValueError("The number of workers must be at least one.")
+
+    if chunksize < 1:
+        raise ValueError("The chunk size must be at least one.")
+
+    chunks = [file_paths[idx : idx + chunksize] for idx in range(0, len(file_paths), chunksize)]
+
+    if workers == 1:
+        memo = RoomMemo()
+        for chunk in chunks:
+            yield from _process_chunk(chunk, input_mode, cache_dir, cache_size, memo)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_start_worker) as executor:
+        futures = [
+            executor.submit(_process_worker_chunk, chunk, input_mode, cache_dir, cache_size) for chunk in chunks
+        ]
+        for future in as_completed(futures):
+            yield from future.result()
+
+
+def _process_chunk(
+    file_paths: list[str],
+    input_mode: Literal["read", "stream", "mmap"],
+    cache_dir: str | None,
+    cache_size: int,
+    memo: RoomMemo | None,
+) -> list[FileResult]:
+    cache = ResultCache(cache_dir, cache_size) if cache_dir is not None else None
+
+    results = []
+    for file_path in file_paths:
+        try:
+            results.append(FileResult(file_path, chair_stats_file(file_path, input_mode, cache, memo=memo), None))
+        except (OSError, ValueError) as e:
+            results.append(FileResult(file_path, None, str(e)))
+
+    return results
+
+
+def _start_worker() -> None:
+    # Runs in each worker process of the pool when it starts
+    global _worker_memo
+    _worker_memo = RoomMemo()
+
+
+def _process_worker_chunk(
+    file_paths: list[str], input_mode: Literal["read", "stream", "mmap"], cache_dir: str | None, cache_size: int
+) -> list[FileResult]:
+    return _process_chunk(file_paths, input_mode, cache_dir, cache_size, _worker_memo)
@@ -0,0 +1,159 @@
+import os
+import re
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Callable, Iterable, Iterator, NamedTuple, TextIO
+
+from src.chair_calculator.cache import ResultCache
+from src.chair_calculator.output import PlanStats
+from src.chair_calculator.room import stats_totals
+from src.chair_calculator.room_memo import RoomMemo
+from src.chair_calculator_main import chair_stats
+
+# The line starting each floor plan in the building file, for example, `=== 1st floor ===`
+FLOOR_DELIMITER_PATTERN = re.compile(r"=== (.+) ===")
+
+# Statistics of the room geometries seen by the worker process, set when the process is started
+# by the pool of the `chairs_per_floor` function, so it's kept only for the floors of one building
+_worker_memo: RoomMemo | None = None
+
+
+class FloorResult(NamedTuple):
+    """Result of calculating the chair statistics for one floor of the building.
+
+    Attributes:
+        floor (str): The name of the floor from its delimiter line.
+        stats (PlanStats | None): The chair statistics of the floor plan, or None if calculation failed.
+        error (str | None): The error message, or None if calculation succeeded.
+    """
+
+    floor: str
+    stats: PlanStats | None
+    error: str | None
+
+
+def read_floors(file: TextIO) -> Iterator[tuple[str, str]]:
+    """Reads the floor plans of the building file one at a time.
+
+    Each floor plan starts after the `=== name ===` delimiter line and ends before the next one,
+    so only one floor plan is kept in memory. Blank lines before the first delimiter are skipped.
+
+    Args:
+        file (TextIO): The text file with the floor plans of the building.
+
+    Yields:
+        tuple[str, str]: The name and the plan content of each floor in the order of the file.
+
+    Raises:
+        ValueError: If the file has text before the first delimiter line.
+    """
+    floor = None
+    lines: list[str] = []
+    for line in file:
+        delimiter = FLOOR_DELIMITER_PATTERN.fullmatch(line.rstrip("\r\n"))
+        if delimiter is not None:
+            if floor is not None:
+                yield floor, "".join(lines)
+            floor = delimiter.group(1)
+            lines = []
+        elif floor is not None:
+            lines.append(line)
+        elif line.strip():
+            raise ValueError("The building file should start with the floor delimiter line like '=== name ==='.")
+
+    if floor is not None:
+        yield floor, "".join(lines)
+
+
+def chairs_per_floor(
+    floors: Iterable[tuple[str, str]],
+    workers: int | None = None,
+    cache_dir: str | None = None,
+    cache_size: int = 10000,
+) -> Iterator[FloorResult]:
+    """Calculates the chair statistics for each floor of the building in parallel worker processes.
+
+    Floors are taken from the iterable as the workers get free, at most two floors per worker are waiting
+    in the queue, so a lazily read building file is not loaded into memory at once.
+    Each worker remembers the statistics of the rooms it has seen by their geometry with its own `RoomMemo`
+    created for this call, so the rooms repeated on other floors are not labeled again.
+    The error in one floor is reported in its result without stopping the others.
+
+    Args:
+        floors (Iterable[tuple[str, str]]): The name and the plan content of each floor,
+            for example, from the `read_floors` function.
+        workers (int | None): The number of worker processes, defaults to the number of CPUs.
+            With one worker the floors are processed in the current process.
+        cache_dir (str | None): The directory of the result cache shared by the workers, or None to not use it.
+        cache_size (int): The maximum number of results in the cache.
+
+    Yields:
+        FloorResult: The result for each floor in the order of the floors.
+
+    Raises:
+        ValueError: If the number of workers is less than one.
+    """
+    if workers is not None and workers < 1:
+        raise ValueError("The number of workers must be at least one.")
+
+    if workers == 1:
+        memo = RoomMemo()
+        for floor, plan_content in floors:
+            yield _floor_result(floor, lambda: _floor_stats(plan_content, cache_dir, cache_size, memo))
+        return
+
+    max_pending = (workers or os.cpu_count() or 1) * 2
+    with ProcessPoolExecutor(max_workers=workers, initializer=_start_floor_worker) as executor:
+        pending: deque[tuple[str, Future]] = deque()
+        for floor, plan_content in floors:
+            pending.append((floor, executor.submit(_worker_floor_stats, plan_content, cache_dir, cache_size)))
+            if len(pending) >= max_pending:
+                floor, future = pending.popleft()
+                yield _floor_result(floor, future.result)
+
+        while pending:
+            floor, future = pending.popleft()
+            yield _floor_result(floor, future.result)
+
+
+def building_stats(floor_stats: Iterable[PlanStats]) -> PlanStats:
+    """Rolls the chair statistics of the floors up to the building.
+
+    Args:
+        floor_stats (Iterable[PlanStats]): The chair statistics of each floor.
+
+    Returns:
+        PlanStats: The total count of each chair character on all floors, without rooms.
+
+    Raises:
+        ValueError: If the statistics of any floor have no total, for example, of only the selected rooms.
+    """
+    floor_totals = []
+    for stats in floor_stats:
+        if stats.total is None:
+            raise ValueError("The statistics of every floor should have the total.")
+        floor_totals.append(stats.total)
+
+    return PlanStats(stats_totals(floor_totals), {})
+
+
+def _floor_stats(plan_content: str, cache_dir: str | None, cache_size: int, memo: RoomMemo | None) -> PlanStats:
+    cache = ResultCache(cache_dir, cache_size) if cache_dir is not None else None
+    return chair_stats(plan_content, cache=cache, memo=memo)
+
+
+def _start_floor_worker() -> None:
+    # Runs in each worker process of the pool when it starts
+    global _worker_memo
+    _worker_memo = RoomMemo()
+
+
+def _worker_floor_stats(plan_content: str, cache_dir: str | None, cache_size: int) -> PlanStats:
+    return _floor_stats(plan_content, cache_dir, cache_size, _worker_memo)
+
+
+def _floor_result(floor: str, stats_fun: Callable[[], PlanStats]) -> FloorResult:
+    try:
+        return FloorResult(floor, stats_fun(), None)
+    except (OSError, ValueError) as e:
+        return FloorResult(floor, None, str(e))
@@ -1,53 +1,398 @@
-from src.chair_calculator.floor_plan import filter_chairs, normalize_floor_plan, room_label_coordinates
-from src.chair_calculator.room import mask_room, stats_for_masked_chairs, stats_totals, str_stats
+import contextlib
+from typing import Collection, ContextManager, Iterator, Literal, Sequence, TextIO
 
+from src.chair_calculator.cache import ResultCache, plan_cache_key
+from src.chair_calculator.editable_floor_plan import FloorPlan
+from src.chair_calculator.floor_plan import (
+    filter_chairs,
+    label_spans,
+    load_floor_plan_mmap,
+    normalize_floor_plan,
+    room_label_coordinates,
+)
+from src.chair_calculator.labeling import label_points, label_regions_tiled, region_chair_stats
+from src.chair_calculator.output import PlanStats, shared_rooms, stats_text
+from src.chair_calculator.profiling import Profile
+from src.chair_calculator.room_memo import RoomMemo
+from src.chair_calculator.room_selection import selected_room_stats
+from src.chair_calculator.streaming import iter_chair_stats, stream_plan_stats
+from src.chair_calculator.validator import validate_non_chair_chars
 
-def chairs_per_room(plan_content: str) -> str:
+
+def chairs_per_room(
+    plan_content: str, cache: ResultCache | None = None, tiles: int | None = None, profile: Profile | None = None
+) -> str:
     """Calculates the number of chairs for appartment and per each room based on the given floor plan.
 
     Args:
         plan_content (str): The floor plan containing room labels and chair characters.
+        cache (ResultCache | None): The cache of the chair statistics per room to reuse them for the same plan.
+        tiles (int | None): The number of row bands to split the plan into to label them in parallel processes,
+            or None to label the plan in the current process.
+        profile (Profile | None): The profile to record the time and the memory of each phase
+            and the counters of the calculation.
 
     Returns:
         str: The output text containing the chair statistics total for apartment and per each room.
 
+    """
+    stats = chair_stats(plan_content, cache=cache, tiles=tiles, profile=profile)
+
+    with _phase(profile, "output"):
+        return stats_text(stats)
+
+
+def chair_stats(
+    plan_content: str,
+    cache: ResultCache | None = None,
+    tiles: int | None = None,
+    profile: Profile | None = None,
+    memo: RoomMemo | None = None,
+) -> PlanStats:
+    """Calculates the chair statistics for appartment and per each room based on the given floor plan.
+
+    Args:
+        plan_content (str): The floor plan containing room labels and chair characters.
+        cache (ResultCache | None): The cache of the chair statistics per room to reuse them for the same plan.
+        tiles (int | None): The number of row bands to split the plan into to label them in parallel processes,
+            or None to label the plan in the current process.
+        profile (Profile | None): The profile to record the time and the memory of each phase
+            and the counters of the calculation.
+        memo (RoomMemo | None): The memo of the chair statistics per room geometry shared by the plans,
+            when every room of the plan is found in it, the plan is not labeled.
+
+    Returns:
+        PlanStats: The chair statistics total for apartment and per each room.
+
     """
     floor_plan: list[str]
     dimensions: tuple[int, int]
-    floor_plan, dimensions = normalize_floor_plan(plan_content)
+    with _phase(profile, "normalize"):
+        floor_plan, dimensions = normalize_floor_plan(plan_content)
+
+    cache_key = None
+    if cache is not None:
+        with _phase(profile, "cache"):
+            cache_key = plan_cache_key(floor_plan)
+            cached_stats = cache.get(cache_key)
+        if cached_stats is not None:
+            return PlanStats.from_rooms(cached_stats["rooms"], cached_stats["shared_with"])
 
     # The following function will crash for room labels having no margin from walls
-    coords_by_room = room_label_coordinates(floor_plan, dimensions=dimensions)
+    with _phase(profile, "labels"):
+        coords_by_room = room_label_coordinates(floor_plan, dimensions=dimensions)
 
     # Remove labels from the plan so they don't interfere with the chair counting
     # because labels might containt chair characters.
-    label_coords = []
-    for _room, (label_start, label_end) in coords_by_room.items():
-        label_start_x, label_start_y = label_start
-        label_end_x, _label_end_y = label_end
-        label_coords.append(((label_start_x, label_end_x), label_start_y))
+    label_coords = label_spans(coords_by_room)
 
     # The following function will remove labels by given coords,
     # it will crash for text characters left which are not chair characters, spaces, or walls.
-    unlabeled_plan = filter_chairs(floor_plan, label_coords=label_coords)
+    with _phase(profile, "filter"):
+        unlabeled_plan = filter_chairs(floor_plan, label_coords=label_coords)
+
+    stats_by_room, shared_with = _stats_by_room(unlabeled_plan, dimensions, coords_by_room, tiles, profile, memo)
+
+    if cache is not None and cache_key is not None:
+        with _phase(profile, "cache"):
+            cache.put(cache_key, {"rooms": stats_by_room, "shared_with": shared_with})
+
+    return PlanStats.from_rooms(stats_by_room, shared_with)
+
+
+def chair_stats_selected(
+    plan_content: str, rooms: Collection[str], with_total: bool = False, profile: Profile | None = None
+) -> PlanStats:
+    """Calculates the chair statistics only for the selected rooms of the floor plan.
+
+    The labels are looked up until all selected rooms are found, then only their regions are filled,
+    counted, and validated, see the `selected_room_stats` function. The total for apartment needs every room,
+    so the whole plan is calculated as the `chair_stats` function does only when the total is requested.
+
+    Args:
+        plan_content (str): The floor plan containing room labels and chair characters.
+        rooms (Collection[str]): The names of the selected rooms.
+        with_total (bool): Whether to calculate the total for apartment.
+        profile (Profile | None): The profile to record the time and the memory of each phase
+            and the counters of the calculation.
+
+    Returns:
+        PlanStats: The chair statistics of the selected rooms sorted by room names,
+            with the total for apartment only if it's requested.
+
+    Raises:
+        ValueError: If any selected room is not found on the floor plan, or the plan is invalid.
+
+    """
+    if with_total:
+        stats = chair_stats(plan_content, profile=profile)
+        missing_rooms = set(rooms) - stats.rooms.keys()
+        if missing_rooms:
+            raise ValueError(f"The room '{min(missing_rooms)}' is not found on the floor plan.")
+
+        selected_rooms = sorted(set(rooms))
+        shared_with = stats.shared_with or {}
+        return PlanStats(
+            stats.total,
+            {room: stats.rooms[room] for room in selected_rooms},
+            {room: shared_with[room] for room in selected_rooms if room in shared_with} or None,
+        )
+
+    with _phase(profile, "normalize"):
+        floor_plan, dimensions = normalize_floor_plan(plan_content)
+
+    with _phase(profile, "fill"):
+        stats_by_room, shared_with = selected_room_stats(floor_plan, dimensions, rooms)
+
+    return PlanStats(None, stats_by_room, shared_with or None)
+
+
+def chair_stats_diff(old_plan_content: str, new_plan_content: str) -> PlanStats:
+    """Calculates the change of the chair statistics between two revisions of the floor plan.
+
+    The old plan is labeled as a whole, then only the rooms around the cells changed in the new plan
+    are labeled again, see the `FloorPlan.revise` method. To follow many revisions of the same plan,
+    keep the `FloorPlan` object and revise it with each of them.
+
+    Args:
+        old_plan_content (str): The floor plan before the revision.
+        new_plan_content (str): The floor plan after the revision.
+
+    Returns:
+        PlanStats: The difference of the chair statistics total for apartment and per each changed room.
+
+    """
+    floor_plan = FloorPlan.from_text(old_plan_content)
+    old_stats = floor_plan.plan_stats()
+
+    floor_plan.revise(new_plan_content)
+
+    return old_stats.delta(floor_plan.plan_stats())
+
+
+def chairs_per_room_mapped(file_path: str, tiles: int | None = None, profile: Profile | None = None) -> str:
+    """Calculates the number of chairs for appartment and per each room based on the memory mapped floor plan file.
+
+    The file is not read into memory at once, its rows are decoded when accessed.
+
+    Args:
+        file_path (str): The path to the file with the floor plan.
+        tiles (int | None): The number of row bands to split the plan into to label them in parallel processes,
+            or None to label the plan in the current process.
+        profile (Profile | None): The profile to record the time and the memory of each phase
+            and the counters of the calculation.
+
+    Returns:
+        str: The output text containing the chair statistics total for apartment and per each room.
+
+    """
+    stats = _chair_stats_mapped(file_path, tiles=tiles, profile=profile)
+
+    with _phase(profile, "output"):
+        return stats_text(stats)
+
 
-    # Aggregate chair stats for each room
+def chairs_per_room_streamed(plan_file: TextIO, profile: Profile | None = None) -> str:
+    """Calculates the number of chairs for appartment and per each room reading the floor plan file line by line.
+
+    The memory is bounded by the width of the floor plan rather than by its area.
+    Room labels must start and end on the same row.
+
+    Args:
+        plan_file (TextIO): The seekable text file with the floor plan.
+        profile (Profile | None): The profile to record the time and the memory of the calculation,
+            all steps are done in the single "stream" phase reading the file.
+
+    Returns:
+        str: The output text containing the chair statistics total for apartment and per each room.
+
+    """
+    stats = _chair_stats_streamed(plan_file, profile=profile)
+
+    with _phase(profile, "output"):
+        return stats_text(stats)
+
+
+def chairs_per_room_file(
+    file_path: str,
+    input_mode: Literal["read", "stream", "mmap"] = "read",
+    cache: ResultCache | None = None,
+    tiles: int | None = None,
+    profile: Profile | None = None,
+) -> str:
+    """Calculates the number of chairs for appartment and per each room based on the floor plan file.
+
+    Args:
+        file_path (str): The path to the file with the floor plan.
+        input_mode (Literal["read", "stream", "mmap"]): How to read the file, see the `chair_stats_file` function.
+        cache (ResultCache | None): The cache of the chair statistics per room, used only when the file is read
+            into memory at once.
+        tiles (int | None): The number of row bands to label in parallel processes, not used when streaming the file.
+        profile (Profile | None): The profile to record the time and the memory of each phase
+            and the counters of the calculation.
+
+    Returns:
+        str: The output text containing the chair statistics total for apartment and per each room.
+
+    """
+    stats = chair_stats_file(file_path, input_mode=input_mode, cache=cache, tiles=tiles, profile=profile)
+
+    with _phase(profile, "output"):
+        return stats_text(stats)
+
+
+def chair_stats_file(
+    file_path: str,
+    input_mode: Literal["read", "stream", "mmap"] = "read",
+    cache: ResultCache | None = None,
+    tiles: int | None = None,
+    profile: Profile | None = None,
+    memo: RoomMemo | None = None,
+) -> PlanStats:
+    """Calculates the chair statistics for appartment and per each room based on the floor plan file.
+
+    Args:
+        file_path (str): The path to the file with the floor plan.
+        input_mode (Literal["read", "stream", "mmap"]): How to read the file, "read" reads it into memory at once,
+            "stream" reads it line by line as the `chairs_per_room_streamed` function does, and "mmap" maps it
+            to memory as the `chairs_per_room_mapped` function does.
+        cache (ResultCache | None): The cache of the chair statistics per room, used only when the file is read
+            into memory at once.
+        tiles (int | None): The number of row bands to label in parallel processes, not used when streaming the file.
+        profile (Profile | None): The profile to record the time and the memory of each phase
+            and the counters of the calculation.
+        memo (RoomMemo | None): The memo of the chair statistics per room geometry shared by the plans,
+            used only when the file is read into memory at once.
+
+    Returns:
+        PlanStats: The chair statistics total for apartment and per each room.
+
+    """
+    if input_mode == "mmap":
+        return _chair_stats_mapped(file_path, tiles=tiles, profile=profile)
+
+    with open(file_path, "r") as file:
+        if input_mode == "stream":
+            return _chair_stats_streamed(file, profile=profile)
+
+        with _phase(profile, "read"):
+            plan_content = file.read()
+        return chair_stats(plan_content, cache=cache, tiles=tiles, profile=profile, memo=memo)
+
+
+def chair_stats_incremental(file_path: str) -> Iterator[tuple[str | None, dict[str, int], list[str]]]:
+    """Yields the chair statistics of each room of the floor plan file as soon as the room is finished.
+
+    The file is read line by line as the `chairs_per_room_streamed` function does, see the `iter_chair_stats`
+    function. Write the records with the `StatsWriter.write_records` method to flush each of them as it comes.
+
+    Args:
+        file_path (str): The path to the file with the floor plan.
+
+    Yields:
+        tuple[str | None, dict[str, int], list[str]]: The (room name, chair statistics, other rooms of the region)
+            records in the order of rooms finishing, then the (None, total, []) record.
+
+    """
+    with open(file_path, "r") as file:
+        yield from iter_chair_stats(file)
+
+
+def _chair_stats_mapped(file_path: str, tiles: int | None, profile: Profile | None) -> PlanStats:
+    with _phase(profile, "normalize"):
+        floor_plan = load_floor_plan_mmap(file_path)
+
+    with floor_plan:
+        dimensions = floor_plan.dimensions
+
+        # The following function will crash for room labels having no margin from walls
+        with _phase(profile, "labels"):
+            coords_by_room = room_label_coordinates(floor_plan, dimensions=dimensions)
+
+        # Erase labels on reading rows of the plan
+        with _phase(profile, "filter"):
+            unlabeled_plan = floor_plan.without_labels(label_spans(coords_by_room))
+            validate_non_chair_chars(
+                unlabeled_plan,
+                lambda char: f"The floor plan should have only room labels and chair characters, '{char}' found.",
+            )
+
+        stats_by_room, shared_with = _stats_by_room(unlabeled_plan, dimensions, coords_by_room, tiles, profile)
+
+    return PlanStats.from_rooms(stats_by_room, shared_with)
+
+
+def _chair_stats_streamed(plan_file: TextIO, profile: Profile | None) -> PlanStats:
+    with _phase(profile, "stream"):
+        return stream_plan_stats(plan_file)
+
+
+def _stats_by_room(
+    unlabeled_plan: Sequence[str],
+    dimensions: tuple[int, int],
+    coords_by_room: dict[str, tuple[tuple[int, int], tuple[int, int]]],
+    tiles: int | None = None,
+    profile: Profile | None = None,
+    memo: RoomMemo | None = None,
+) -> tuple[dict[str, dict[str, int]], dict[str, list[str]]]:
+    # Returns the chair statistics per room and the rooms sharing the region per room
+    if memo is not None:
+        # Labeling only the missed rooms would fill them one by one, which is slower than labeling the plan at once,
+        # so the lookups stop at the first missed room.
+        hits = {}
+        with _phase(profile, "memo"):
+            for room, (label_start, _label_end) in coords_by_room.items():
+                memo_room = memo.get(unlabeled_plan, dimensions, room, label_start)
+                if memo_room is None:
+                    break
+                hits[room] = memo_room
+        if profile is not None:
+            profile.count("memo_hits", len(hits))
+            profile.count("memo_misses", len(coords_by_room) - len(hits))
+        # Rooms with different bounding boxes are in different regions, the ones with the same box are labeled
+        # to find out if they share the region.
+        bounding_boxes = {bounding_box for bounding_box, _stats in hits.values()}
+        if len(hits) == len(coords_by_room) and len(bounding_boxes) == len(hits):
+            return {room: stats for room, (_bounding_box, stats) in hits.items()}, {}
+
+    # Label all rooms of the plan at once, that gives the same rooms as masking each of them from the label
+    label_starts = [label_start for label_start, _label_end in coords_by_room.values()]
+    with _phase(profile, "fill"):
+        if tiles is None:
+            # Only the regions of the label starts are needed, so the label of every cell isn't built
+            region_ids, regions = label_points(unlabeled_plan, dimensions, points=label_starts)
+        else:
+            region_ids, regions = label_regions_tiled(unlabeled_plan, dimensions, points=label_starts, tiles=tiles)
+
+    if profile is not None:
+        # Every region is filled once, and the margin is checked once for every label and every chair
+        profile.count("fills", len(regions))
+        profile.count("cells_visited", sum(region.area for region in regions.values()))
+        profile.count(
+            "margin_checks", len(coords_by_room) + sum(sum(region.chairs.values()) for region in regions.values())
+        )
+
+    # Aggregate chair stats for each room, the region shared by several rooms is filled once
     stats_by_room = {}
+    region_by_room = {room: region_ids[label_start] for room, (label_start, _label_end) in coords_by_room.items()}
+
+    with _phase(profile, "stats"):
+        for room, (label_start, _label_end) in coords_by_room.items():
+            region = regions[region_by_room[room]]
+            # The following function will crash for chair characters having no margin from walls
+            stats = region_chair_stats(unlabeled_plan, region)
+            stats_by_room[room] = stats
+
+    if memo is not None:
+        with _phase(profile, "memo"):
+            for room, (label_start, _label_end) in coords_by_room.items():
+                bounding_box = regions[region_by_room[room]].bounding_box
+                memo.put(unlabeled_plan, dimensions, room, label_start, bounding_box, stats_by_room[room])
 
-    for room, (label_start, _label_end) in coords_by_room.items():
-        mask = mask_room(unlabeled_plan, dimensions=dimensions, seed_point=label_start, filler="*")
-        # The following function will crash for chair characters having no margin from walls
-        stats = stats_for_masked_chairs(unlabeled_plan, mask=mask, filler="*")
-        stats_by_room[room] = stats
+    return stats_by_room, shared_rooms(region_by_room)
 
-    # Aggregate output text
-    output = ""
-    # Totals
-    totals = stats_totals(list(stats_by_room.values()))
-    output += f"total:\n{str_stats(totals)}\n"
 
-    # Stats
-    for room, stats in stats_by_room.items():
-        output += f"{room}:\n{str_stats(stats)}\n"
+def _phase(profile: Profile | None, name: str) -> ContextManager:
+    # Measures the phase when profiling, otherwise does nothing
+    return profile.phase(name) if profile is not None else contextlib.nullcontext()
 
-    return output
@@ -0,0 +1,313 @@
+import asyncio
+import hashlib
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from http import HTTPStatus
+from typing import NamedTuple
+
+from src.chair_calculator.cache import MemoryCache
+from src.chair_calculator.output import PlanStats, stats_document
+from src.chair_calculator_main import chair_stats
+
+# Maximum size of the request line and headers, longer requests are answered with 431 status
+MAX_HEADER_SIZE = 64 * 1024
+
+
+class ChairStatsServer:
+    """HTTP server calculating the chair statistics of the floor plans sent in the request body.
+
+    The `POST /chairs` request with the floor plan text in the body is answered with the JSON object
+    having the "total" and the "rooms" statistics, or with the "error" message and 400 status for an invalid plan,
+    or 500 status if the calculation failed otherwise.
+    The `GET /health` request is answered with `{"status": "ok"}`, or with `{"status": "broken"}` and 503 status
+    if a worker process has died, for example, killed on running out of memory.
+
+    The pool of worker processes can't run anything after any of its workers died, so the broken pool is replaced
+    with a new one when the request or the health check finds it, and the failed calculation is retried once.
+
+    The calculations run in the pool of worker processes started with the server, so requests don't pay
+    for starting the process. The results of the recent plans are kept in memory keyed by the hash of the body.
+    Requests with the body larger than the maximum size are answered with 413 status, and requests exceeding
+    the maximum number of the requests in progress are answered with 503 status, so the memory held by bodies
+    is bounded and clients can retry later instead of queueing up behind the busy workers.
+    """
+
+    def __init__(
+        self,
+        workers: int | None = None,
+        max_body_size: int = 16 * 1024 * 1024,
+        max_pending: int | None = None,
+        cache_size: int = 1000,
+    ):
+        """Initializes the server.
+
+        Args:
+            workers (int | None): The number of worker processes, defaults to the number of CPUs.
+            max_body_size (int): The maximum size of the floor plan in the request body in bytes.
+            max_pending (int | None): The maximum number of the requests in progress, defaults to
+                four requests per worker.
+            cache_size (int): The maximum number of the recent results kept in memory.
+
+        Raises:
+            ValueError: If the number of workers, the maximum body size, or the maximum number of the requests
+                in progress is less than one.
+        """
+        if workers is not None and workers < 1:
+            raise ValueError("The number of workers must be at least one.")
+
+        if max_body_size < 1:
+            raise ValueError("The maximum body size must be at least one byte.")
+
+        if max_pending is not None and max_pending < 1:
+            raise ValueError("The maximum number of pending requests must be at least one.")
+
+        self.workers = workers or os.cpu_count() or 1
+        self.max_body_size = max_body_size
+        self.max_pending = max_pending if max_pending is not None else self.workers * 4
+        self.cache = MemoryCache(cache_size)
+        self._pending = 0
+        self._executor: ProcessPoolExecutor | None = None
+        self._server: asyncio.Server | None = None
+
+    async def start(self, host: str = "127.0.0.1", port: int = 8080) -> tuple[str, int]:
+        """Starts the worker processes and begins accepting connections.
+
+        Args:
+            host (str): The host to listen on.
+            port (int): The port to listen on, zero to pick a free one.
+
+        Returns:
+            tuple[str, int]: The host and the port the server listens on.
+        """
+        self._executor = ProcessPoolExecutor(max_workers=self.workers)
+        # Start all workers now, the pool starts a new process only when no idle one is left
+        warm_up = [self._executor.submit(_warm_up) for _worker in range(self.workers)]
+        await asyncio.gather(*map(asyncio.wrap_future, warm_up))
+
+        self._server = await asyncio.start_server(self._handle_connection, host, port, limit=MAX_HEADER_SIZE)
+        address = self._server.sockets[0].getsockname()
+
+        return address[0], address[1]
+
+    async def serve_forever(self) -> None:
+        """Accepts connections until the server is closed or the task is cancelled."""
+        if self._server is None:
+            raise RuntimeError("The server should be started first.")
+
+        await self._server.serve_forever()
+
+    async def close(self) -> None:
+        """Stops accepting connections and shuts the worker processes down."""
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+
+        if self._executor is not None:
+            self._executor.shutdown(cancel_futures=True)
+            self._executor = None
+
+    async def _handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while True:
+                response = await self._handle_request(reader)
+                if response is None:
+                    break
+                await _respond(writer, response)
+                if not response.keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            # The client has gone away
+            pass
+        finally:
+            writer.close()
+
+    async def _handle_request(self, reader: asyncio.StreamReader) -> "_Response | None":
+        # Reads one request and returns the response to it, or None if the client closed the connection
+        try:
+            head = await reader.readuntil(b"\r\n\r\n")
+        except asyncio.IncompleteReadError as e:
+            if e.partial:
+                raise
+            return None
+        except asyncio.LimitOverrunError:
+            return _Response(HTTPStatus.REQUEST_HEADER_FIELDS_TOO_LARGE, {"error": "The headers are too large."})
+
+        try:
+            method, path, headers = _parse_head(head)
+        except ValueError as e:
+            return _Response(HTTPStatus.BAD_REQUEST, {"error": str(e)})
+
+        keep_alive = headers.get("connection", "").lower() != "close"
+
+        if path == "/health":
+            if method != "GET":
+                return _Response(HTTPStatus.METHOD_NOT_ALLOWED, {"error": "Use the GET method."}, (("Allow", "GET"),))
+            if self._executor is not None and _is_broken(self._executor):
+                self._replace_broken_executor(self._executor)
+                return _Response(HTTPStatus.SERVICE_UNAVAILABLE, {"status": "broken"}, keep_alive=keep_alive)
+            return _Response(HTTPStatus.OK, {"status": "ok"}, keep_alive=keep_alive)
+
+        if path != "/chairs":
+            return _Response(HTTPStatus.NOT_FOUND, {"error": f"Unknown path {path}."})
+
+        if method != "POST":
+            return _Response(HTTPStatus.METHOD_NOT_ALLOWED, {"error": "Use the POST method."}, (("Allow", "POST"),))
+
+        if "content-length" not in headers:
+            return _Response(HTTPStatus.LENGTH_REQUIRED, {"error": "The Content-Length header is required."})
+
+        body_size = int(headers["content-length"]) if headers["content-length"].isdigit() else -1
+        if body_size < 0:
+            return _Response(HTTPStatus.BAD_REQUEST, {"error": "The Content-Length header is invalid."})
+
+        # The body isn't read in the following cases, so the connection is closed after the response
+        if body_size > self.max_body_size:
+            error = f"The floor plan should be at most {self.max_body_size} bytes, {body_size} bytes found."
+            return _Response(HTTPStatus.REQUEST_ENTITY_TOO_LARGE, {"error": error})
+
+        if self._pending >= self.max_pending:
+            error = "The server is busy, retry later."
+            return _Response(HTTPStatus.SERVICE_UNAVAILABLE, {"error": error}, (("Retry-After", "1"),))
+
+        self._pending += 1
+        try:
+            body = await reader.readexactly(body_size)
+            status, document = await self._chair_stats_response(body)
+        finally:
+            self._pending -= 1
+
+        return _Response(status, document, keep_alive=keep_alive)
+
+    async def _chair_stats_response(self, body: bytes) -> tuple[HTTPStatus, dict]:
+        if self._executor is None:
+            raise RuntimeError("The server should be started first.")
+
+        cache_key = hashlib.sha256(body).hexdigest()
+        stats: PlanStats | None = self.cache.get(cache_key)
+        if stats is None:
+            try:
+                plan_content = body.decode("utf-8")
+            except UnicodeDecodeError:
+                return HTTPStatus.BAD_REQUEST, {"error": "The floor plan should be UTF-8 text."}
+
+            try:
+                stats = await self._calculate(plan_content)
+            except ValueError as e:
+                return HTTPStatus.BAD_REQUEST, {"error": str(e)}
+            except Exception as e:
+                # Answer instead of dropping the connection, for example, when the worker process has crashed
+                print(f"Failed to calculate the floor plan: {e!r}", file=sys.stderr, flush=True)
+                return HTTPStatus.INTERNAL_SERVER_ERROR, {"error": "The floor plan could not be calculated."}
+            self.cache.put(cache_key, stats)
+
+        return HTTPStatus.OK, stats_document(stats)
+
+    async def _calculate(self, plan_content: str) -> PlanStats:
+        # Calculates the stats in the worker process, retrying once in the new pool if the current one is broken
+        executor = self._executor
+        if executor is None:
+            raise RuntimeError("The server should be started first.")
+
+        try:
+            return await asyncio.wrap_future(executor.submit(chair_stats, plan_content))
+        except BrokenProcessPool:
+            self._replace_broken_executor(executor)
+
+        if self._executor is None:
+            raise RuntimeError("The server is closed.")
+        return await asyncio.wrap_future(self._executor.submit(chair_stats, plan_content))
+
+    def _replace_broken_executor(self, broken_executor: ProcessPoolExecutor) -> None:
+        # Several requests can find the same pool broken, only the first one replaces it
+        if self._executor is not broken_executor:
+            return
+
+        print("The worker process has died, starting the new worker pool.", file=sys.stderr, flush=True)
+        broken_executor.shutdown(wait=False, cancel_futures=True)
+        self._executor = ProcessPoolExecutor(max_workers=self.workers)
+
+
+class _Response(NamedTuple):
+    # The response to one request, the connection is closed after it unless it's kept alive
+    status: HTTPStatus
+    document: dict
+    headers: tuple[tuple[str, str], ...] = ()
+    keep_alive: bool = False
+
+
+def serve(host: str = "127.0.0.1", port: int = 8080, **server_options) -> None:
+    """Runs the chair statistics HTTP server until interrupted.
+
+    Args:
+        host (str): The host to listen on.
+        port (int): The port to listen on.
+        **server_options: The options of the `ChairStatsServer` class.
+    """
+
+    async def run():
+        server = ChairStatsServer(**server_options)
+        try:
+            host_name, port_number = await server.start(host, port)
+            print(f"Serving on http://{host_name}:{port_number}", flush=True)
+            await server.serve_forever()
+        finally:
+            await server.close()
+
+    try:
+        asyncio.run(run())
+    except KeyboardInterrupt:
+        pass
+
+
+def _warm_up() -> None:
+    # Runs in each worker process when the server starts, so the process is started and the modules are imported
+    pass
+
+
+def _is_broken(executor: ProcessPoolExecutor) -> bool:
+    # The pool refuses new tasks once any of its worker processes has died, the submitted one does nothing
+    try:
+        executor.submit(_warm_up)
+    except BrokenProcessPool:
+        return True
+
+    return False
+
+
+def _parse_head(head: bytes) -> tuple[str, str, dict[str, str]]:
+    # Parses the request line and the headers, names of the headers are lowercased
+    lines = head.decode("latin-1").split("\r\n")
+    request_line = lines[0].split(" ")
+    if len(request_line) != 3 or not request_line[2].startswith("HTTP/"):
+        raise ValueError("The request line is invalid.")
+
+    method, target, _version = request_line
+    headers = {}
+    for line in lines[1:]:
+        if not line:
+            continue
+        name, separator, value = line.partition(":")
+        if not separator:
+            raise ValueError("The header line is invalid.")
+        headers[name.strip().lower()] = value.strip()
+
+    return method, target.partition("?")[0], headers
+
+
+async def _respond(writer: asyncio.StreamWriter, response: _Response) -> None:
+    body = json.dumps(response.document).encode()
+    head = [
+        f"HTTP/1.1 {response.status.value} {response.status.phrase}",
+        "Content-Type: application/json",
+        f"Content-Length: {len(body)}",
+        *(f"{name}: {value}" for name, value in response.headers),
+    ]
+    if not response.keep_alive:
+        head.append("Connection: close")
+
+    writer.write(("\r\n".join(head) + "\r\n\r\n").encode() + body)
+    await writer.drain()
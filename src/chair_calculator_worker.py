@@ -0,0 +1,74 @@
+import json
+from typing import BinaryIO, Iterator, TextIO
+
+from src.chair_calculator.output import StatsWriter
+from src.chair_calculator_main import chair_stats
+
+# Separator of the floor plans in the input of the worker
+PLAN_SEPARATOR = b"\0"
+
+# Number of bytes read from the input at once, a read returns earlier with the bytes available so far
+READ_SIZE = 64 * 1024
+
+
+def read_plans(file: BinaryIO) -> Iterator[bytes]:
+    """Reads the floor plans separated with the NUL character from the binary file.
+
+    Each plan is yielded as soon as its separator is read, so the caller can wait for the result
+    before sending the next plan. The text after the last separator is the last plan unless it's empty.
+
+    Args:
+        file (BinaryIO): The file to read from, for example, the standard input.
+
+    Yields:
+        bytes: The content of each floor plan.
+    """
+    # Read only the bytes available, the buffered read of the full size would wait for more plans
+    read = file.read1 if hasattr(file, "read1") else file.read
+    # Parts of the plan read so far, large plans span many chunks
+    pending: list[bytes] = []
+    while chunk := read(READ_SIZE):
+        plans = chunk.split(PLAN_SEPARATOR)
+        if len(plans) > 1:
+            yield b"".join(pending) + plans[0]
+            yield from plans[1:-1]
+            pending = []
+        if plans[-1]:
+            pending.append(plans[-1])
+
+    if pending:
+        yield b"".join(pending)
+
+
+def run_worker(input_file: BinaryIO, output_file: TextIO) -> int:
+    """Calculates the chair statistics for each floor plan from the input until it ends.
+
+    The plans are separated with the NUL character. For each plan, one JSON line is written to the output
+    as soon as the plan is done: the object with the "total" and the "rooms" statistics,
+    or with the "error" message for an invalid plan. The error in one plan doesn't stop the others.
+
+    Args:
+        input_file (BinaryIO): The file to read the floor plans from.
+        output_file (TextIO): The file to write the results to.
+
+    Returns:
+        int: The number of the plans with errors.
+    """
+    errors = 0
+    with StatsWriter(output_file, "json") as writer:
+        for plan in read_plans(input_file):
+            try:
+                writer.write(chair_stats(plan.decode("utf-8")))
+            except UnicodeDecodeError:
+                errors += 1
+                _write_error(output_file, "The floor plan should be UTF-8 text.")
+            except ValueError as e:
+                errors += 1
+                _write_error(output_file, str(e))
+
+    return errors
+
+
+def _write_error(file: TextIO, error: str) -> None:
+    file.write(f"{json.dumps({'error': error})}\n")
+    file.flush()
@@ -0,0 +1,64 @@
+from pathlib import Path
+
+from src.chair_calculator_batch import FileResult, chairs_per_room_files, plan_file_paths
+from src.chair_calculator_main import chair_stats
+
+ROOMS_PATH = Path(__file__).parents[2] / "rooms.txt"
+
+
+def test_plan_file_paths_pass_when_expands_directories_and_glob_patterns(tmp_path):
+    (tmp_path / "plans").mkdir()
+    (tmp_path / "plans" / "b.txt").write_text("")
+    (tmp_path / "plans" / "a.txt").write_text("")
+    (tmp_path / "plans" / "nested").mkdir()
+    (tmp_path / "c.txt").write_text("")
+    (tmp_path / "c.md").write_text("")
+
+    assert plan_file_paths([str(tmp_path / "plans"), str(tmp_path / "*.txt"), str(tmp_path / "missing.txt")]) == [
+        str(tmp_path / "plans" / "a.txt"),
+        str(tmp_path / "plans" / "b.txt"),
+        str(tmp_path / "c.txt"),
+        str(tmp_path / "missing.txt"),
+    ]
+
+
+def test_chairs_per_room_files_fails_when_workers_or_chunksize_less_than_one():
+    try:
+        list(chairs_per_room_files([], workers=0))
+        assert False, "ValueError should be raised when the number of workers is less than one."
+    except ValueError as e:
+        assert "The number of workers must be at least one." == str(e)
+
+    try:
+        list(chairs_per_room_files([], chunksize=0))
+        assert False, "ValueError should be raised when the chunk size is less than one."
+    except ValueError as e:
+        assert "The chunk size must be at least one." == str(e)
+
+
+def test_chairs_per_room_files_pass_when_reports_errors_per_file_without_stopping(tmp_path):
+    (tmp_path / "text.txt").write_text("hello")
+    file_paths = [str(ROOMS_PATH), str(tmp_path / "text.txt"), str(tmp_path / "missing.txt")]
+
+    results = list(chairs_per_room_files(file_paths, workers=1))
+
+    assert results[0] == FileResult(str(ROOMS_PATH), chair_stats(ROOMS_PATH.read_text()), None)
+    assert results[1] == FileResult(
+        str(tmp_path / "text.txt"),
+        None,
+        "The floor plan should have only room labels and chair characters, 'h' found.",
+    )
+    assert results[2].file_path == str(tmp_path / "missing.txt")
+    assert results[2].stats is None
+    assert "No such file or directory" in results[2].error
+
+
+def test_chairs_per_room_files_pass_when_processes_files_in_worker_processes():
+    file_paths = [str(ROOMS_PATH)] * 5
+
+    # Files read into memory reuse the rooms seen by the worker in the previous files
+    for input_mode in ["read", "stream"]:
+        results = list(chairs_per_room_files(file_paths, workers=2, chunksize=2, input_mode=input_mode))
+
+        assert len(results) == 5
+        assert [result.stats for result in results] == [chair_stats(ROOMS_PATH.read_text())] * 5
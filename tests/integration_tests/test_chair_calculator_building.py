@@ -0,0 +1,45 @@
+import io
+from pathlib import Path
+
+from src.chair_calculator.output import PlanStats
+from src.chair_calculator_building import FloorResult, building_stats, chairs_per_floor, read_floors
+from src.chair_calculator_main import chair_stats
+
+ROOMS_PATH = Path(__file__).parents[2] / "rooms.txt"
+
+
+def test_read_floors_pass_when_splits_building_file_by_delimiter_lines():
+    building_file = io.StringIO("\n=== 1st floor ===\n+--+\n|  |\n=== roof ===\r\n=== 3 ===\n+-+\n")
+
+    assert list(read_floors(building_file)) == [("1st floor", "+--+\n|  |\n"), ("roof", ""), ("3", "+-+\n")]
+    assert list(read_floors(io.StringIO(""))) == []
+
+
+def test_read_floors_fails_when_text_before_first_delimiter():
+    try:
+        list(read_floors(io.StringIO("+--+\n=== 1st floor ===\n")))
+        assert False, "ValueError should be raised when the text is before the first delimiter."
+    except ValueError as e:
+        assert "The building file should start with the floor delimiter line like '=== name ==='." == str(e)
+
+
+def test_chairs_per_floor_pass_when_processes_floors_in_worker_processes():
+    plan_content = ROOMS_PATH.read_text()
+    floors = [(f"floor {idx}", plan_content) for idx in range(5)] + [("attic", "hello")]
+    error = "The floor plan should have only room labels and chair characters, 'h' found."
+
+    for workers in [1, 2]:
+        results = list(chairs_per_floor(iter(floors), workers=workers))
+
+        assert results == [FloorResult(f"floor {idx}", chair_stats(plan_content), None) for idx in range(5)] + [
+            FloorResult("attic", None, error)
+        ]
+
+
+def test_building_stats_pass_when_sums_totals_of_floors():
+    floor_stats = [
+        PlanStats.from_rooms({"kitchen": {"W": 1, "P": 0, "S": 2, "C": 0}}),
+        PlanStats.from_rooms({"office": {"W": 3, "P": 1, "S": 0, "C": 0}}),
+    ]
+
+    assert building_stats(floor_stats) == PlanStats({"W": 4, "P": 1, "S": 2, "C": 0}, {})
@@ -1,4 +1,21 @@
-from src.chair_calculator_main import chairs_per_room
+import os
+from pathlib import Path
+
+from src.chair_calculator.cache import ResultCache, plan_cache_key
+from src.chair_calculator.floor_plan import normalize_floor_plan
+from src.chair_calculator.output import PlanStats, stats_text
+from src.chair_calculator.profiling import Profile
+from src.chair_calculator.room_memo import RoomMemo
+from src.chair_calculator_main import (
+    chair_stats,
+    chair_stats_diff,
+    chair_stats_file,
+    chair_stats_incremental,
+    chair_stats_selected,
+    chairs_per_room,
+    chairs_per_room_mapped,
+    chairs_per_room_streamed,
+)
 
 
 def test_chairs_calculator_pass_returning_list_of_cahirs_per_room():
@@ -112,3 +129,184 @@ def test_chairs_calculator_pass_returning_list_of_cahirs_for_larger_room():
         "W: 0, P: 0, S: 0, C: 1\n"
     )
     # fmt: on
+
+
+def test_chairs_per_room_streamed_pass_returning_same_output_as_chairs_per_room():
+    with open(Path(__file__).parents[2] / "rooms.txt", "r") as file:
+        plan_content = file.read()
+        file.seek(0)
+
+        assert chairs_per_room_streamed(file) == chairs_per_room(plan_content)
+
+
+def test_chairs_per_room_mapped_pass_returning_same_output_as_chairs_per_room():
+    file_path = Path(__file__).parents[2] / "rooms.txt"
+    with open(file_path, "r") as file:
+        plan_content = file.read()
+
+    assert chairs_per_room_mapped(str(file_path)) == chairs_per_room(plan_content)
+
+
+def test_chairs_per_room_pass_returning_same_output_when_labeling_tiles_in_parallel():
+    plan_content = (Path(__file__).parents[2] / "rooms.txt").read_text()
+
+    assert chairs_per_room(plan_content, tiles=3) == chairs_per_room(plan_content)
+
+
+def test_chair_stats_pass_returning_structured_stats_of_chairs_per_room_output():
+    file_path = Path(__file__).parents[2] / "rooms.txt"
+    plan_content = file_path.read_text()
+
+    stats = chair_stats(plan_content)
+
+    assert stats.total == {"W": 14, "P": 7, "S": 3, "C": 1}
+    assert stats.rooms["kitchen"] == {"W": 4, "P": 0, "S": 0, "C": 0}
+    assert stats_text(stats) == chairs_per_room(plan_content)
+    for input_mode in ["read", "stream", "mmap"]:
+        assert chair_stats_file(str(file_path), input_mode=input_mode) == stats
+
+
+def test_chair_stats_file_fails_in_every_input_mode_when_room_name_is_labeled_twice(tmp_path):
+    # fmt: off
+    plan_content = "\n".join([
+        "+-----+-----+",
+        "|     |     |",
+        "| (a) | (a) |",
+        "|  W  |  P  |",
+        "|     |     |",
+        "+-----+-----+",
+    ])
+    # fmt: on
+    file_path = tmp_path / "plan.txt"
+    file_path.write_text(plan_content)
+
+    for input_mode in ["read", "stream", "mmap"]:
+        try:
+            chair_stats_file(str(file_path), input_mode=input_mode)
+            assert False, f"ValueError should be raised in {input_mode} mode when the room name is labeled twice."
+        except ValueError as e:
+            assert "The floor plan should have only room labels and chair characters, '(' found." == str(e)
+
+
+def test_chair_stats_incremental_pass_yielding_same_stats_as_chair_stats_with_total_last():
+    file_path = Path(__file__).parents[2] / "rooms.txt"
+    stats = chair_stats(file_path.read_text())
+
+    records = list(chair_stats_incremental(str(file_path)))
+
+    assert records[-1] == (None, stats.total, [])
+    assert {room: room_stats for room, room_stats, _other_rooms in records[:-1]} == stats.rooms
+    assert {room: other_rooms for room, _room_stats, other_rooms in records[:-1] if other_rooms} == (
+        stats.shared_with or {}
+    )
+    assert len(records) == len(stats.rooms) + 1
+
+
+def test_chairs_per_room_pass_recording_profile_of_each_phase():
+    plan_content = (Path(__file__).parents[2] / "rooms.txt").read_text()
+    profile = Profile()
+
+    assert chairs_per_room(plan_content, profile=profile) == chairs_per_room(plan_content)
+
+    report = profile.report()
+    assert list(report["phases"]) == ["normalize", "labels", "filter", "fill", "stats", "output"]
+    assert report["counters"] == {"fills": 9, "cells_visited": 2108, "margin_checks": 33}
+
+
+def test_chairs_per_room_pass_returning_cached_output_for_same_plan(tmp_path):
+    plan_content = (Path(__file__).parents[2] / "rooms.txt").read_text()
+    cache = ResultCache(str(tmp_path))
+
+    output = chairs_per_room(plan_content, cache=cache)
+
+    assert len(os.listdir(tmp_path)) == 1, "should store stats of the plan"
+    assert chairs_per_room(plan_content, cache=cache) == output
+
+    floor_plan, _dimensions = normalize_floor_plan(plan_content)
+    cache.put(plan_cache_key(floor_plan), {"rooms": {"hall": {"W": 1, "P": 0, "S": 0, "C": 0}}, "shared_with": {}})
+
+    # fmt: off
+    assert chairs_per_room(plan_content, cache=cache) == (
+        "total:\n"
+        "W: 1, P: 0, S: 0, C: 0\n"
+        "hall:\n"
+        "W: 1, P: 0, S: 0, C: 0\n"
+    )
+    # fmt: on
+
+
+def test_chair_stats_diff_pass_returning_stats_change_of_revised_plan():
+    old_plan_content = (Path(__file__).parents[2] / "rooms.txt").read_text()
+    new_plan_content = old_plan_content.replace("(toilet)", "(bath)  ").replace("W", "S", 1)
+
+    delta = chair_stats_diff(old_plan_content, new_plan_content)
+
+    assert delta == chair_stats(old_plan_content).delta(chair_stats(new_plan_content))
+    assert delta.total == {"W": -1, "P": 0, "S": 1, "C": 0}
+    assert set(delta.rooms) == {"bath", "toilet", "sleeping room"}
+
+
+def test_chair_stats_pass_counting_region_shared_by_rooms_once(tmp_path):
+    # fmt: off
+    plan_content = "\n".join([
+        "+--------------------+------+",
+        "|                    |      |",
+        "|  (office)     W    | (wc) |",
+        "|                    |  C   |",
+        "|  (desk area)  P    |      |",
+        "|                    |      |",
+        "+--------------------+------+",
+    ])
+    # fmt: on
+    file_path = tmp_path / "plan.txt"
+    file_path.write_text(plan_content)
+
+    stats = chair_stats(plan_content)
+
+    assert stats.total == {"W": 1, "P": 1, "S": 0, "C": 1}
+    assert stats.rooms["office"] == stats.rooms["desk area"] == {"W": 1, "P": 1, "S": 0, "C": 0}
+    assert stats.shared_with == {"desk area": ["office"], "office": ["desk area"]}
+    assert chair_stats(plan_content, tiles=2) == stats
+    for input_mode in ["stream", "mmap"]:
+        assert chair_stats_file(str(file_path), input_mode=input_mode) == stats
+
+    memo = RoomMemo()
+    assert chair_stats(plan_content, memo=memo) == stats
+    assert chair_stats(plan_content, memo=memo) == stats, "should label rooms of the same region from memo"
+
+    cache = ResultCache(str(tmp_path / "cache"))
+    assert chair_stats(plan_content, cache=cache) == stats
+    assert chair_stats(plan_content, cache=cache) == stats, "should keep shared rooms in cache"
+
+
+def test_chair_stats_selected_pass_returning_stats_of_selected_rooms():
+    plan_content = (Path(__file__).parents[2] / "rooms.txt").read_text()
+    stats = chair_stats(plan_content)
+
+    selected_stats = chair_stats_selected(plan_content, ["office", "kitchen"])
+
+    assert selected_stats.total is None
+    assert selected_stats.rooms == {"kitchen": stats.rooms["kitchen"], "office": stats.rooms["office"]}
+    assert stats_text(selected_stats) == (
+        "kitchen:\n"
+        "W: 4, P: 0, S: 0, C: 0\n"
+        "office:\n"
+        "W: 2, P: 1, S: 0, C: 0\n"
+    )
+    assert chair_stats_selected(plan_content, ["office"], with_total=True) == PlanStats(
+        stats.total, {"office": stats.rooms["office"]}
+    )
+    for with_total in [False, True]:
+        try:
+            chair_stats_selected(plan_content, ["office", "pantry"], with_total=with_total)
+            assert False, "ValueError should be raised when the room is not found."
+        except ValueError as e:
+            assert "The room 'pantry' is not found on the floor plan." == str(e)
+
+    labeled_twice_content = plan_content.replace("(balcony)", "(kitchen)")
+    for with_total in [False, True]:
+        try:
+            chair_stats_selected(labeled_twice_content, ["kitchen"], with_total=with_total)
+            assert False, "ValueError should be raised when the room is labeled twice."
+        except ValueError as e:
+            assert "The floor plan should have only room labels and chair characters, '(' found." == str(e)
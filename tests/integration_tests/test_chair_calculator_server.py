@@ -0,0 +1,202 @@
+import asyncio
+import json
+import os
+import signal
+from pathlib import Path
+
+from src.chair_calculator_main import chair_stats
+from src.chair_calculator_server import ChairStatsServer
+
+ROOMS_PATH = Path(__file__).parents[2] / "rooms.txt"
+
+
+def run_with_server(scenario, **server_options):
+    async def run():
+        server = ChairStatsServer(workers=1, **server_options)
+        try:
+            _host, port = await server.start("127.0.0.1", 0)
+            return await scenario(server, port)
+        finally:
+            await server.close()
+
+    return asyncio.run(run())
+
+
+async def request(port, method, path, body=b"", headers=None):
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    try:
+        headers = {"Content-Length": str(len(body)), **(headers or {})}
+        head = f"{method} {path} HTTP/1.1\r\n" + "".join(f"{name}: {value}\r\n" for name, value in headers.items())
+        writer.write(head.encode() + b"\r\n" + body)
+        await writer.drain()
+        return await read_response(reader)
+    finally:
+        writer.close()
+
+
+async def read_response(reader):
+    status_line, *header_lines = (await reader.readuntil(b"\r\n\r\n")).decode().strip().split("\r\n")
+    headers = dict(line.split(": ", 1) for line in header_lines)
+    body = await reader.readexactly(int(headers["Content-Length"]))
+
+    return int(status_line.split(" ")[1]), headers, json.loads(body)
+
+
+def test_chair_stats_server_fails_when_options_less_than_one():
+    for options, error in [
+        ({"workers": 0}, "The number of workers must be at least one."),
+        ({"max_body_size": 0}, "The maximum body size must be at least one byte."),
+        ({"max_pending": 0}, "The maximum number of pending requests must be at least one."),
+        ({"cache_size": 0}, "The cache size must be at least one."),
+    ]:
+        try:
+            ChairStatsServer(**options)
+            assert False, f"ValueError should be raised for {options}."
+        except ValueError as e:
+            assert error == str(e)
+
+
+def test_chair_stats_server_pass_when_answers_with_stats_and_caches_them():
+    plan_content = ROOMS_PATH.read_text()
+    expected_stats = chair_stats(plan_content)
+
+    async def scenario(server, port):
+        responses = [await request(port, "POST", "/chairs", plan_content.encode()) for _idx in range(2)]
+        return responses, len(server.cache)
+
+    responses, cache_length = run_with_server(scenario)
+
+    for status, headers, document in responses:
+        assert status == 200
+        assert headers["Content-Type"] == "application/json"
+        assert document == {"total": expected_stats.total, "rooms": expected_stats.rooms}
+    assert cache_length == 1
+
+
+def test_chair_stats_server_pass_when_answers_same_stats_for_crlf_line_ends():
+    # The carriage return would be the wall next to the chair in the short row
+    plan_content = "+-------+\n|       |\n| (a)   |\n|   W\n|       |\n+-------+\n"
+    expected_stats = chair_stats(plan_content)
+
+    async def scenario(_server, port):
+        return await request(port, "POST", "/chairs", plan_content.replace("\n", "\r\n").encode())
+
+    status, _headers, document = run_with_server(scenario)
+
+    assert status == 200
+    assert document == {"total": expected_stats.total, "rooms": expected_stats.rooms}
+
+
+def test_chair_stats_server_pass_when_answers_with_internal_error_if_calculation_fails():
+    async def scenario(server, port):
+        # Workers don't take new plans after the shutdown
+        server._executor.shutdown()
+        return await request(port, "POST", "/chairs", b"+-+")
+
+    status, _headers, document = run_with_server(scenario)
+
+    assert status == 500
+    assert document == {"error": "The floor plan could not be calculated."}
+
+
+def test_chair_stats_server_pass_when_replaces_pool_broken_by_killed_worker():
+    plan_content = ROOMS_PATH.read_text()
+    expected_stats = chair_stats(plan_content)
+
+    async def scenario(server, port):
+        await kill_worker(server)
+        chairs_response = await request(port, "POST", "/chairs", plan_content.encode())
+
+        await kill_worker(server)
+        health_responses = []
+        # The pool is found broken when its manager thread notices the killed process
+        for _attempt in range(100):
+            health_responses.append(await request(port, "GET", "/health"))
+            if health_responses[-1][0] != 200:
+                break
+            await asyncio.sleep(0.01)
+        health_responses.append(await request(port, "GET", "/health"))
+
+        return chairs_response, health_responses[-2:]
+
+    chairs_response, health_responses = run_with_server(scenario)
+
+    status, _headers, document = chairs_response
+    assert status == 200
+    assert document == {"total": expected_stats.total, "rooms": expected_stats.rooms}
+    assert [(status, document) for status, _headers, document in health_responses] == [
+        (503, {"status": "broken"}),
+        (200, {"status": "ok"}),
+    ]
+
+
+async def kill_worker(server):
+    pid = await asyncio.wrap_future(server._executor.submit(os.getpid))
+    os.kill(pid, signal.SIGKILL)
+
+
+def test_chair_stats_server_pass_when_keeps_connection_alive_between_requests():
+    plan_content = ROOMS_PATH.read_text().encode()
+
+    async def scenario(_server, port):
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        try:
+            request_head = f"POST /chairs HTTP/1.1\r\nContent-Length: {len(plan_content)}\r\n\r\n".encode()
+            writer.write((request_head + plan_content) * 2)
+            writer.write(b"GET /health HTTP/1.1\r\n\r\n")
+            await writer.drain()
+            return [await read_response(reader) for _idx in range(3)]
+        finally:
+            writer.close()
+
+    responses = run_with_server(scenario)
+
+    assert [status for status, _headers, _document in responses] == [200, 200, 200]
+    assert responses[0][2] == responses[1][2]
+    assert responses[2][2] == {"status": "ok"}
+
+
+def test_chair_stats_server_pass_when_answers_with_errors():
+    async def scenario(_server, port):
+        return [
+            await request(port, "POST", "/chairs", b"hello"),
+            await request(port, "POST", "/chairs", b"\xff"),
+            await request(port, "POST", "/chairs", b"x" * 11),
+            await request(port, "GET", "/chairs"),
+            await request(port, "POST", "/rooms"),
+        ]
+
+    responses = run_with_server(scenario, max_body_size=10)
+
+    assert [(status, document) for status, _headers, document in responses] == [
+        (400, {"error": "The floor plan should have only room labels and chair characters, 'h' found."}),
+        (400, {"error": "The floor plan should be UTF-8 text."}),
+        (413, {"error": "The floor plan should be at most 10 bytes, 11 bytes found."}),
+        (405, {"error": "Use the POST method."}),
+        (404, {"error": "Unknown path /rooms."}),
+    ]
+    assert responses[2][1]["Connection"] == "close"
+
+
+def test_chair_stats_server_pass_when_rejects_requests_over_max_pending():
+    async def scenario(_server, port):
+        # The first request is in progress while its body is not fully sent
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        try:
+            writer.write(b"POST /chairs HTTP/1.1\r\nContent-Length: 10\r\n\r\n+--")
+            await writer.drain()
+            await asyncio.sleep(0.1)
+            busy_response = await request(port, "POST", "/chairs", b"+-+")
+
+            writer.write(b"-----+\n")
+            await writer.drain()
+            return busy_response, await read_response(reader)
+        finally:
+            writer.close()
+
+    busy_response, response = run_with_server(scenario, max_pending=1)
+
+    assert busy_response[0] == 503
+    assert busy_response[1]["Retry-After"] == "1"
+    assert busy_response[2] == {"error": "The server is busy, retry later."}
+    assert response[0] == 200
@@ -0,0 +1,45 @@
+import io
+import json
+from pathlib import Path
+
+from src.chair_calculator_main import chair_stats
+from src.chair_calculator_worker import read_plans, run_worker
+
+ROOMS_PATH = Path(__file__).parents[2] / "rooms.txt"
+
+
+class ChunkedFile:
+    # Returns at most the given number of bytes per read like a pipe does
+    def __init__(self, content, chunk_size):
+        self.file = io.BytesIO(content)
+        self.chunk_size = chunk_size
+
+    def read1(self, size):
+        return self.file.read(min(size, self.chunk_size))
+
+
+def test_read_plans_pass_when_splits_plans_across_chunks():
+    content = b"+--+\0\0+-+\n|W|\0+-\0"
+
+    for chunk_size in range(1, len(content) + 1):
+        assert list(read_plans(ChunkedFile(content, chunk_size))) == [b"+--+", b"", b"+-+\n|W|", b"+-"]
+
+    assert list(read_plans(io.BytesIO(b"+-+\0+"))) == [b"+-+", b"+"]
+    assert list(read_plans(io.BytesIO(b""))) == []
+
+
+def test_run_worker_pass_when_writes_result_line_per_plan():
+    plan_content = ROOMS_PATH.read_text()
+    stats = chair_stats(plan_content)
+    input_file = io.BytesIO(b"\0".join([plan_content.encode(), b"hello", b"\xff", plan_content.encode()]))
+    output_file = io.StringIO()
+
+    errors = run_worker(input_file, output_file)
+
+    assert errors == 2
+    assert [json.loads(line) for line in output_file.getvalue().splitlines()] == [
+        {"total": stats.total, "rooms": stats.rooms},
+        {"error": "The floor plan should have only room labels and chair characters, 'h' found."},
+        {"error": "The floor plan should be UTF-8 text."},
+        {"total": stats.total, "rooms": stats.rooms},
+    ]
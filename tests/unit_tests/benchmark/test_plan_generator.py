@@ -0,0 +1,41 @@
+from src.benchmark.plan_generator import generate_floor_plan
+from src.chair_calculator.floor_plan import normalize_floor_plan, room_label_coordinates
+from src.chair_calculator_main import chairs_per_room
+
+
+def test_generate_floor_plan_pass_when_returns_same_plan_for_same_seed():
+    assert generate_floor_plan(80, 30, rooms=4, seed=1) == generate_floor_plan(80, 30, rooms=4, seed=1)
+    assert generate_floor_plan(80, 30, rooms=4, seed=1) != generate_floor_plan(80, 30, rooms=4, seed=2)
+
+
+def test_generate_floor_plan_pass_when_returns_valid_plan_for_each_style_and_placement():
+    for wall_style in ["straight", "diagonal"]:
+        for label_placement in ["center", "corner", "random"]:
+            plan_content = generate_floor_plan(
+                120, 40, rooms=6, wall_style=wall_style, chair_density=0.2, label_placement=label_placement
+            )
+
+            floor_plan, dimensions = normalize_floor_plan(plan_content)
+            assert dimensions == (120, 40)
+            assert list(room_label_coordinates(floor_plan, dimensions)) == [f"room {idx}" for idx in range(1, 7)]
+            assert chairs_per_room(plan_content).count(":\n") == 7
+            assert ("/" in plan_content or "\\" in plan_content) == (wall_style == "diagonal")
+
+
+def test_generate_floor_plan_pass_when_places_chairs_by_density():
+    assert not any(chair in generate_floor_plan(60, 20, chair_density=0) for chair in "WPSC")
+    assert chairs_per_room(generate_floor_plan(60, 20, chair_density=1)).startswith("total:\nW: ")
+
+
+def test_generate_floor_plan_fails_when_arguments_are_invalid():
+    for kwargs, error in [
+        ({"rooms": 20}, "The floor plan is too small for 20 rooms."),
+        ({"wall_style": "round"}, "The wall style must be one of 'straight', 'diagonal'."),
+        ({"label_placement": "top"}, "The label placement must be one of 'center', 'corner', 'random'."),
+        ({"chair_density": 2}, "The chair density must be in the range from 0 to 1."),
+    ]:
+        try:
+            generate_floor_plan(40, 12, **kwargs)
+            assert False, "ValueError should be raised when the plan can't be generated."
+        except ValueError as e:
+            assert error == str(e)
@@ -0,0 +1,24 @@
+from src.benchmark.plan_generator import generate_floor_plan
+from src.benchmark.runner import PHASES, run_benchmark, time_phases
+
+
+def test_time_phases_pass_when_returns_time_of_each_phase():
+    seconds = time_phases(generate_floor_plan(60, 20, rooms=2), repeats=2)
+
+    assert list(seconds) == list(PHASES) + ["total"]
+    assert seconds["total"] >= max(seconds[phase] for phase in PHASES)
+
+
+def test_time_phases_fails_when_number_of_repeats_is_less_than_one():
+    try:
+        time_phases("", repeats=0)
+        assert False, "ValueError should be raised when the number of repeats is less than one."
+    except ValueError as e:
+        assert "The number of repeats must be at least one." == str(e)
+
+
+def test_run_benchmark_pass_when_yields_result_for_each_size():
+    results = list(run_benchmark([(40, 20), (80, 40)], repeats=1))
+
+    assert [(result.width, result.height, result.rooms) for result in results] == [(40, 20, 2), (80, 40, 8)]
+    assert all(result.chairs > 0 for result in results)
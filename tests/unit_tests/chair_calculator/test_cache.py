@@ -0,0 +1,91 @@
+import os
+
+from src.chair_calculator.cache import MemoryCache, ResultCache, plan_cache_key
+from src.chair_calculator.constants import Constants
+
+
+def test_plan_cache_key_pass_when_depends_on_plan_content_and_constants(monkeypatch):
+    key = plan_cache_key(["+--+", "|  |"])
+
+    assert key == plan_cache_key(["+--+", "|  |"])
+    assert key != plan_cache_key(["+--+|  |"]), "should separate rows"
+    assert key != plan_cache_key(["+--+", "| W|"])
+
+    monkeypatch.setattr(Constants, "CHAIR_CHARS", "WPS")
+    assert key != plan_cache_key(["+--+", "|  |"]), "should depend on the chair characters"
+
+
+def test_result_cache_fails_when_size_less_than_one(tmp_path):
+    try:
+        ResultCache(str(tmp_path), max_entries=0)
+        assert False, "ValueError should be raised when the cache size is less than one."
+    except ValueError as e:
+        assert "The cache size must be at least one." == str(e)
+
+
+def test_result_cache_pass_when_returns_stored_stats(tmp_path):
+    cache = ResultCache(str(tmp_path / "cache"))
+    stats_by_room = {"B": {"W": 1, "P": 0, "S": 0, "C": 0}, "A": {"W": 0, "P": 2, "S": 0, "C": 0}}
+
+    assert cache.get("key") is None
+
+    cache.put("key", stats_by_room)
+
+    assert ResultCache(str(tmp_path / "cache")).get("key") == stats_by_room
+    assert list(cache.get("key")) == ["B", "A"], "should keep the order of rooms"
+
+
+def test_result_cache_pass_when_returns_stats_it_cant_mark_as_used(tmp_path, monkeypatch):
+    cache = ResultCache(str(tmp_path))
+    cache.put("key", {"A": {"W": 1, "P": 0, "S": 0, "C": 0}})
+
+    def utime(_path, *_args):
+        raise PermissionError("Read-only file system")
+
+    monkeypatch.setattr(os, "utime", utime)
+
+    assert cache.get("key") == {"A": {"W": 1, "P": 0, "S": 0, "C": 0}}
+
+
+def test_result_cache_pass_when_evicts_least_recently_used_stats(tmp_path):
+    cache = ResultCache(str(tmp_path), max_entries=3)
+    for idx, key in enumerate(["a", "b", "c"]):
+        cache.put(key, {})
+        os.utime(tmp_path / f"{key}.json", (idx, idx))
+
+    # Reading marks the result as recently used
+    assert cache.get("a") == {}
+
+    cache.put("d", {})
+
+    assert sorted(os.listdir(tmp_path)) == ["a.json", "d.json"]
+
+
+def test_result_cache_pass_when_scans_directory_only_to_evict(tmp_path, monkeypatch):
+    scans = []
+    scandir = os.scandir
+    monkeypatch.setattr(os, "scandir", lambda path: scans.append(path) or scandir(path))
+    cache = ResultCache(str(tmp_path), max_entries=100)
+
+    for idx in range(200):
+        cache.put(str(idx), {})
+    cache.put("199", {})
+
+    assert len(os.listdir(tmp_path)) == 90
+    # One scan counts the results, then each eviction scans on the 101st result leaving 90 of them,
+    # rewriting the stored result does not add to the count
+    assert len(scans) == 1 + 10
+
+
+def test_memory_cache_pass_when_evicts_least_recently_used_result():
+    cache = MemoryCache(max_entries=2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    assert cache.get("a") == 1
+
+    cache.put("c", 3)
+
+    assert len(cache) == 2
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
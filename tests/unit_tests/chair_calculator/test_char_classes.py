@@ -0,0 +1,35 @@
+from src.chair_calculator.char_classes import CHAIR, FLOOR, LABEL, WALL, char_classes
+from src.chair_calculator.constants import Constants
+
+
+def test_char_classes_pass_when_classifies_each_character_in_one_lookup():
+    classes = char_classes()
+
+    assert [classes.by_char[char] for char in " WPSCa(9|+-é"] == [
+        FLOOR,
+        CHAIR,
+        CHAIR,
+        CHAIR,
+        CHAIR,
+        LABEL,
+        LABEL,
+        LABEL,
+        WALL,
+        WALL,
+        WALL,
+        WALL,
+    ]
+    assert "| (kitchen) W é|".translate(classes.translate_table) == (
+        WALL + FLOOR + LABEL * 9 + FLOOR + CHAIR + FLOOR + WALL * 2
+    )
+
+
+def test_char_classes_pass_when_follows_characters_configuration(monkeypatch):
+    assert char_classes().by_char["#"] == WALL
+    assert char_classes().room_run_pattern.findall("|(a) #W|") == ["(a) ", "W"]
+
+    monkeypatch.setattr(Constants, "CHAIR_CHARS", "WPSC#")
+
+    assert char_classes().by_char["#"] == CHAIR
+    assert "|#|".translate(char_classes().translate_table) == WALL + CHAIR + WALL
+    assert char_classes().room_run_pattern.findall("|(a) #W|") == ["(a) #W"]
@@ -0,0 +1,181 @@
+import random
+
+from src.chair_calculator.editable_floor_plan import FloorPlan
+from src.chair_calculator.labeling import label_regions
+
+# fmt: off
+FLOOR_PLAN = "\n".join([
+    "+-----------+------+",
+    "|           |      |",
+    "|  (A)  W   | (B)  |",
+    "|           |      |",
+    "|     P     +      |",
+    "|                  |",
+    "+------------------+",
+])
+# fmt: on
+
+
+def test_from_text_pass_when_returns_same_stats_as_chairs_per_room():
+    floor_plan = FloorPlan.from_text(FLOOR_PLAN)
+
+    assert floor_plan.dimensions == (20, 7)
+    assert floor_plan.stats_by_room() == {
+        "A": {"W": 1, "P": 1, "S": 0, "C": 0},
+        "B": {"W": 1, "P": 1, "S": 0, "C": 0},
+    }
+    assert floor_plan.cell(3, 2) == " ", "should erase room labels"
+
+
+def test_plan_stats_pass_when_counts_region_shared_by_rooms_once():
+    floor_plan = FloorPlan.from_text(FLOOR_PLAN)
+
+    stats = floor_plan.plan_stats()
+    assert stats.total == {"W": 1, "P": 1, "S": 0, "C": 0}
+    assert stats.shared_with == {"A": ["B"], "B": ["A"]}
+
+    # Close the opening between the rooms
+    floor_plan.set_cell(12, 5, "|")
+    assert floor_plan.plan_stats().shared_with is None
+
+
+def test_place_chair_and_remove_chair_pass_when_update_stats():
+    floor_plan = FloorPlan.from_text(FLOOR_PLAN)
+
+    floor_plan.place_chair(16, 4, "S")
+    assert floor_plan.stats_by_room()["B"] == {"W": 1, "P": 1, "S": 1, "C": 0}
+
+    assert floor_plan.remove_chair(8, 2) == "W"
+    assert floor_plan.stats_by_room()["A"] == {"W": 0, "P": 1, "S": 1, "C": 0}
+
+
+def test_place_chair_fails_when_chair_is_invalid():
+    floor_plan = FloorPlan.from_text(FLOOR_PLAN)
+
+    for (x, y, chair), error in [
+        ((8, 2, "S"), "The chair can be placed only on the floor."),
+        ((8, 3, "X"), "The chair must be one of 'WPSC' characters."),
+        ((1, 1, "S"), "The chair 'S' must have at least one space margin from each wall."),
+        ((30, 3, "S"), "The cell (30, 3) is outside of the floor plan (20x7)."),
+    ]:
+        try:
+            floor_plan.place_chair(x, y, chair)
+            assert False, "ValueError should be raised when the chair can't be placed."
+        except ValueError as e:
+            assert error == str(e)
+
+
+def test_set_cell_fails_when_wall_breaks_margins():
+    floor_plan = FloorPlan.from_text(FLOOR_PLAN)
+
+    for (x, y, char), error in [
+        ((4, 2, "|"), "The cell of the room label can't be changed."),
+        ((6, 1, "-"), "The room label must have at least one space margin from each wall."),
+        ((7, 3, "-"), "The chair 'W' must have at least one space margin from each wall."),
+        ((7, 3, "x"), "The floor plan should have only room labels and chair characters, 'x' found."),
+    ]:
+        try:
+            floor_plan.set_cell(x, y, char)
+            assert False, "ValueError should be raised when the cell can't be set."
+        except ValueError as e:
+            assert error == str(e)
+
+
+def test_set_cell_pass_when_wall_splits_room_and_floor_merges_rooms():
+    floor_plan = FloorPlan.from_text(FLOOR_PLAN)
+
+    # Close the opening between the rooms
+    floor_plan.set_cell(12, 5, "|")
+    assert floor_plan.stats_by_room() == {
+        "A": {"W": 1, "P": 1, "S": 0, "C": 0},
+        "B": {"W": 0, "P": 0, "S": 0, "C": 0},
+    }
+
+    # Open the wall between the rooms
+    floor_plan.set_cell(12, 2, " ")
+    assert floor_plan.stats_by_room() == {
+        "A": {"W": 1, "P": 1, "S": 0, "C": 0},
+        "B": {"W": 1, "P": 1, "S": 0, "C": 0},
+    }
+
+
+def test_set_cell_pass_when_keeps_same_regions_as_labeling_from_scratch():
+    rng = random.Random(7)
+    width, height = 16, 10
+    lines = ["".join(rng.choice("    |-") for _x in range(width)) for _y in range(height)]
+    floor_plan = FloorPlan.from_text("\n".join(lines))
+
+    for _edit in range(300):
+        x, y = rng.randrange(width), rng.randrange(height)
+        floor_plan.set_cell(x, y, rng.choice("   +"))
+
+        chars = ["".join(floor_plan.cell(x, y) for x in range(width)) for y in range(height)]
+        labels, regions = label_regions(chars, (width, height))
+        cells_by_region: dict[int, set] = {}
+        for y in range(height):
+            for x in range(width):
+                cells_by_region.setdefault(floor_plan.region_at(x, y), set()).add((x, y))
+        expected_cells_by_region: dict[int, set] = {}
+        for y, row in enumerate(labels):
+            for x, region_id in enumerate(row):
+                expected_cells_by_region.setdefault(region_id, set()).add((x, y))
+
+        assert sorted(map(sorted, cells_by_region.values())) == sorted(map(sorted, expected_cells_by_region.values()))
+
+
+def test_revise_pass_when_returns_same_stats_as_parsing_revision():
+    floor_plan = FloorPlan.from_text(FLOOR_PLAN)
+
+    for revision in [
+        # Chairs are moved and changed
+        FLOOR_PLAN.replace("W", " ").replace("P", "S"),
+        # The opening between the rooms is closed, and the room B gets a chair
+        FLOOR_PLAN.replace("|     P     +      |", "|     P     |  C   |"),
+        # The label is renamed and moved
+        FLOOR_PLAN.replace("|  (A)  W", "|   W (D)"),
+        # The revision of other dimensions
+        FLOOR_PLAN + "\n  ",
+    ]:
+        floor_plan.revise(revision)
+
+        assert floor_plan.stats_by_room() == FloorPlan.from_text(revision).stats_by_room()
+
+
+def test_revise_fails_when_revision_is_invalid_leaving_plan_unchanged():
+    floor_plan = FloorPlan.from_text(FLOOR_PLAN)
+    stats_by_room = floor_plan.stats_by_room()
+
+    for revision, error in [
+        (FLOOR_PLAN.replace("  W", " |W"), "The chair 'W' must have at least one space margin from each wall."),
+        (FLOOR_PLAN.replace("P", "x"), "The floor plan should have only room labels and chair characters, 'x' found."),
+        (FLOOR_PLAN.replace(" (B)", "|(B)"), "The room label must have at least one space margin from each wall."),
+    ]:
+        try:
+            floor_plan.revise(revision)
+            assert False, "ValueError should be raised when the revision is invalid."
+        except ValueError as e:
+            assert error == str(e)
+
+        assert floor_plan.stats_by_room() == stats_by_room
+        assert floor_plan.cell(8, 2) == "W"
+
+
+def test_revise_pass_when_keeps_same_regions_as_labeling_from_scratch():
+    rng = random.Random(11)
+    width, height = 16, 10
+    lines = [list("".join(rng.choice("      |-") for _x in range(width))) for _y in range(height)]
+    floor_plan = FloorPlan.from_text("\n".join(map("".join, lines)))
+
+    for _revision in range(100):
+        for _edit in range(rng.randint(1, 5)):
+            lines[rng.randrange(height)][rng.randrange(width)] = rng.choice("   +")
+        floor_plan.revise("\n".join(map("".join, lines)))
+
+        labels, regions = label_regions(["".join(line) for line in lines], (width, height))
+        regions_by_cell = {}
+        for y, row in enumerate(labels):
+            for x, region_id in enumerate(row):
+                # Both labelings give the same id to the cells of one region
+                expected_id = regions_by_cell.setdefault(floor_plan.region_at(x, y), region_id)
+                assert expected_id == region_id
+        assert len(set(regions_by_cell.values())) == len(regions_by_cell)
@@ -1,4 +1,10 @@
-from src.chair_calculator.floor_plan import filter_chairs, normalize_floor_plan, room_label_coordinates
+from src.chair_calculator.floor_plan import (
+    filter_chairs,
+    label_spans,
+    load_floor_plan_mmap,
+    normalize_floor_plan,
+    room_label_coordinates,
+)
 
 
 def test_normalize_floor_plan_pass_when_returns_dimensions():
@@ -32,6 +38,11 @@ def test_normalize_floor_plan_pass_when_returns_plan_filled_with_spaces_up_to_wi
     # fmt: on
 
 
+def test_normalize_floor_plan_pass_when_splits_lines_ending_with_carriage_return():
+    for plan_content in ["  a\r\n          x\r\nb", "  a\r          x\rb", "  a\r\n          x\nb"]:
+        assert normalize_floor_plan(plan_content) == normalize_floor_plan("  a\n          x\nb")
+
+
 def test_room_label_coordinates_fails_when_floor_plan_mismatches_dimensions():
     try:
         room_label_coordinates(["     "], (2, 1))
@@ -118,6 +129,25 @@ def test_room_label_coordinates_pass_when_ignores_dangling_brackets():
     assert room_label_coordinates(floor_plan, (8, 3)) == {"A": ((4, 1), (6, 1)), "B": ((1, 1), (3, 1))}
 
 
+def test_room_label_coordinates_pass_when_label_continues_on_next_row():
+    # fmt: off
+    floor_plan = [
+        "          ",
+        "      (roo",
+        "m 1)      ",
+        "          ",
+    ]
+    # fmt: on
+
+    assert room_label_coordinates(floor_plan, (10, 4)) == {"room 1": ((6, 1), (3, 2))}
+
+
+def test_label_spans_pass_when_returns_label_coordinates_for_filter_chairs():
+    coords_by_room = {"A": ((4, 1), (6, 1)), "B": ((1, 2), (3, 2))}
+
+    assert label_spans(coords_by_room) == [((4, 6), 1), ((1, 3), 2)]
+
+
 def test_filter_chairs_pass_when_returns_plan_as_is_given_no_coordinates_to_erase():
     # fmt: off
     floor_plan = [
@@ -168,3 +198,41 @@ def test_filter_chairs_fails_when_non_chair_text_left_afer_filtering():
         assert False, "ValueError should be raised when the floor plan has non chair character text."
     except ValueError as e:
         assert "The floor plan should have only room labels and chair characters, 'c' found." == str(e)
+
+
+def test_load_floor_plan_mmap_pass_when_returns_same_plan_as_normalize_floor_plan(tmp_path):
+    for plan in ["", "   ", "  a\n          x\nb", "  a\r\n b\r\n", "\n\n", "  a\r b\r\r\n\r"]:
+        file_path = tmp_path / "plan.txt"
+        file_path.write_bytes(plan.encode())
+
+        with load_floor_plan_mmap(str(file_path)) as mapped_plan:
+            normalized_plan, dimensions = normalize_floor_plan(plan)
+
+            assert mapped_plan.dimensions == dimensions
+            assert list(mapped_plan) == normalized_plan[: dimensions[1]]
+            assert mapped_plan[-1:] == normalized_plan[dimensions[1] - 1 : dimensions[1]]
+
+
+def test_load_floor_plan_mmap_pass_when_returns_plan_with_labels_erased(tmp_path):
+    file_path = tmp_path / "plan.txt"
+    # fmt: off
+    file_path.write_text(
+        "+-------+\n"
+        "| C(B)  |\n"
+        "| (A) W |\n"
+        "+-------+"
+    )
+    # fmt: on
+
+    with load_floor_plan_mmap(str(file_path)) as mapped_plan:
+        unlabeled_plan = mapped_plan.without_labels([((3, 5), 1)]).without_labels([((2, 4), 2)])
+
+        # fmt: off
+        assert [
+            "+-------+",
+            "| C     |",
+            "|     W |",
+            "+-------+"
+        ] == list(unlabeled_plan)
+        # fmt: on
+        assert mapped_plan[1] == "| C(B)  |", "should keep the original plan intact"
@@ -0,0 +1,83 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from src.chair_calculator.grid import count_chairs, erase_labels, to_grid, validate_non_chair_codes  # noqa: E402
+from src.chair_calculator.labeling import label_regions  # noqa: E402
+
+
+def test_to_grid_fails_when_floor_plan_mismatch_dimensions():
+    try:
+        to_grid(["     "], dimensions=(2, 1))
+        assert False, "ValueError should be raised when the floor plan length does not match the dimensions."
+    except ValueError as e:
+        assert "The floor plan length (5) does not match the dimensions (2x1=2)." == str(e)
+
+
+def test_to_grid_pass_when_returns_character_codes():
+    grid = to_grid(["+-+", "|é|"], dimensions=(3, 2))
+
+    assert grid.dtype == np.uint8
+    assert grid.shape == (2, 3)
+    assert grid.tolist() == [[ord("+"), ord("-"), ord("+")], [ord("|"), ord("?"), ord("|")]]
+
+
+def test_erase_labels_pass_when_removes_labels_at_given_coordinates():
+    # fmt: off
+    floor_plan = [
+        "+-------+",
+        "| C(B)  |",
+        "| (A) W |",
+        "+-------+"
+    ]
+    # fmt: on
+    grid = to_grid(floor_plan, dimensions=(9, 4))
+
+    erased_grid = erase_labels(grid, label_coords=[((3, 5), 1), ((2, 4), 2)])
+
+    # fmt: off
+    assert erased_grid.tobytes().decode() == (
+        "+-------+"
+        "| C     |"
+        "|     W |"
+        "+-------+"
+    )
+    # fmt: on
+    assert grid.tobytes().decode()[12:15] == "(B)", "should keep the given grid intact"
+
+
+def test_validate_non_chair_codes_fails_when_non_chair_text_found():
+    grid = to_grid(["| C   P  |", "| note W |"], dimensions=(10, 2))
+
+    try:
+        validate_non_chair_codes(grid, lambda c: f"Non chair chars error '{c}'.")
+        assert False, "ValueError should be raised when given non spaces, chair, or wall character text."
+    except ValueError as e:
+        assert "Non chair chars error 'n'." == str(e)
+
+
+def test_validate_non_chair_codes_passes_given_spaces_chairs_walls():
+    grid = to_grid([r"WPSC +/\|-   "], dimensions=(13, 1))
+
+    validate_non_chair_codes(grid, lambda _c: "Non chair chars error.")
+
+
+def test_count_chairs_pass_when_returns_same_stats_as_labeling():
+    # fmt: off
+    floor_plan = [
+       r"+----------+",
+       r"|  S     C |",
+       r"|  +-+   + |",
+       r"| /   \ / \|",
+       r"|/  C  +   +",
+       r"+  W       |",
+       r"|  SS P  S |",
+       r"|          |",
+       r"+----------+"
+    ]
+    # fmt: on
+    labels, regions = label_regions(floor_plan, dimensions=(12, 9))
+
+    count_by_region = count_chairs(to_grid(floor_plan, dimensions=(12, 9)), labels)
+
+    assert count_by_region == {region_id: region.chairs for region_id, region in regions.items()}
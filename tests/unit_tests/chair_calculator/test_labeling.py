@@ -0,0 +1,194 @@
+import random
+
+from src.chair_calculator import labeling
+from src.chair_calculator.labeling import Region, label_points, label_regions, label_regions_tiled, region_chair_stats
+from src.chair_calculator.room import mask_room
+
+
+def test_label_regions_fails_when_floor_plan_mismatch_dimensions():
+    try:
+        label_regions(["     "], dimensions=(2, 1))
+        assert False, "ValueError should be raised when the floor plan length does not match the dimensions."
+    except ValueError as e:
+        assert "The floor plan length (5) does not match the dimensions (2x1=2)." == str(e)
+
+
+def test_label_regions_pass_when_returns_no_regions_for_empty_floor_plan():
+    assert label_regions([""], dimensions=(0, 0)) == ([], {})
+
+
+def test_label_regions_pass_when_labels_rooms_in_reading_order():
+    # fmt: off
+    floor_plan = [
+        "+---+---+",
+        "|   |   |",
+        "+---+   |",
+        "|       |",
+        "+-------+",
+    ]
+    # fmt: on
+
+    labels, regions = label_regions(floor_plan, dimensions=(9, 5))
+
+    # fmt: off
+    assert [
+        [0, 0, 0, 0, 0, 0, 0, 0, 0],
+        [0, 1, 1, 1, 0, 2, 2, 2, 0],
+        [0, 0, 0, 0, 0, 2, 2, 2, 0],
+        [0, 2, 2, 2, 2, 2, 2, 2, 0],
+        [0, 0, 0, 0, 0, 0, 0, 0, 0],
+    ] == labels
+    # fmt: on
+    assert list(regions.keys()) == [1, 2]
+    assert regions[1].area == 3
+    assert regions[1].bounding_box == ((1, 1), (3, 1))
+    assert regions[2].area == 13
+    assert regions[2].bounding_box == ((1, 1), (7, 3))
+
+
+def test_label_regions_pass_when_labels_same_cells_as_mask_room_for_polygonal_shape():
+    # fmt: off
+    floor_plan = [
+       r"+----------+",
+       r"|  S     C |",
+       r"|  +-+   + |",
+       r"| /   \ / \|",
+       r"|/  C  +   +",
+       r"+  W       |",
+       r"|  SS P  S |",
+       r"|          |",
+       r"+----------+"
+    ]
+    # fmt: on
+
+    labels, regions = label_regions(floor_plan, dimensions=(12, 9))
+
+    for seed_point in [(4, 6), (2, 1), (4, 3)]:
+        seed_x, seed_y = seed_point
+        region_id = labels[seed_y][seed_x]
+        mask = mask_room(floor_plan, dimensions=(12, 9), seed_point=seed_point, filler="*")
+        masked_cells = {(x, y) for y, line in enumerate(mask) for x, char in enumerate(line) if char == "*"}
+        labeled_cells = {(x, y) for y, row in enumerate(labels) for x, label in enumerate(row) if label == region_id}
+
+        assert masked_cells == labeled_cells
+        assert regions[region_id].area == len(masked_cells)
+
+    assert regions[labels[6][4]].chairs == {"W": 1, "P": 1, "S": 3, "C": 1}
+    assert regions[labels[1][2]].chairs == {"W": 0, "P": 0, "S": 1, "C": 1}
+
+
+def test_label_regions_pass_when_keeps_first_chair_without_margin_in_reading_order():
+    # fmt: off
+    floor_plan = [
+       r"+----------+",
+       r"|  P   C   |",
+       r"|   W    S |",
+       r"|        P |",
+       r"+----------+"
+    ]
+    # fmt: on
+
+    _labels, regions = label_regions(floor_plan, dimensions=(12, 5))
+
+    assert regions[1].unmargined_chair == (3, 1)
+
+
+def test_region_chair_stats_fails_when_no_margin_around_chair():
+    # fmt: off
+    floor_plan = [
+       r"+----------+",
+       r"|  C       |",
+       r"|          |",
+       r"+----------+"
+    ]
+    # fmt: on
+
+    labels, regions = label_regions(floor_plan, dimensions=(12, 4))
+
+    try:
+        region_chair_stats(floor_plan, regions[labels[2][2]])
+        assert False, "ValueError should be raised when chair label is not surrounded by room markup chars."
+    except ValueError as e:
+        assert "The chair 'C' must have at least one space margin from each wall." == str(e)
+
+
+def test_region_chair_stats_pass_when_returns_chairs_stats():
+    region = Region(
+        area=4, bounding_box=((1, 1), (2, 2)), chairs={"W": 1, "P": 0, "S": 2, "C": 0}, unmargined_chair=None
+    )
+
+    assert region_chair_stats([], region) == {"W": 1, "P": 0, "S": 2, "C": 0}
+
+
+def test_label_points_pass_when_returns_same_regions_as_label_regions():
+    rng = random.Random(7)
+    width, height = 24, 30
+    floor_plan = ["".join(rng.choice("    |-/WP") for _x in range(width)) for _y in range(height)]
+    labels, regions = label_regions(floor_plan, dimensions=(width, height))
+    points = [(x, y) for y in range(height) for x in range(0, width, 3)]
+
+    point_regions, point_label_regions = label_points(floor_plan, (width, height), points)
+
+    assert point_label_regions == regions
+    assert point_regions == {(x, y): labels[y][x] for x, y in points}
+
+
+def test_label_regions_tiled_fails_when_number_of_tiles_is_less_than_one():
+    try:
+        label_regions_tiled(["   "], dimensions=(3, 1), points=[], tiles=0)
+        assert False, "ValueError should be raised when the number of tiles is less than one."
+    except ValueError as e:
+        assert "The number of tiles must be at least one." == str(e)
+
+
+def test_label_regions_tiled_pass_when_merges_regions_across_seams():
+    # fmt: off
+    floor_plan = [
+        "+-------+",
+        "| W |   |",
+        "|   |   |",
+        "|   +-+ |",
+        "|  /    |",
+        "| /  P  |",
+        "+-------+",
+    ]
+    # fmt: on
+    labels, regions = label_regions(floor_plan, dimensions=(9, 7))
+    points = [(2, 1), (6, 1), (4, 1)]
+
+    for tiles in range(1, 8):
+        point_regions, tiled_regions = label_regions_tiled(floor_plan, (9, 7), points, tiles=tiles, workers=1)
+
+        assert tiled_regions == regions
+        assert point_regions == {(2, 1): labels[1][2], (6, 1): labels[1][6], (4, 1): 0}
+
+
+def test_label_regions_tiled_pass_when_returns_same_regions_as_label_regions_in_worker_processes():
+    rng = random.Random(5)
+    width, height = 24, 30
+    floor_plan = ["".join(rng.choice("    |-/WP") for _x in range(width)) for _y in range(height)]
+    labels, regions = label_regions(floor_plan, dimensions=(width, height))
+    points = [(x, y) for y in range(height) for x in range(0, width, 5)]
+
+    point_regions, tiled_regions = label_regions_tiled(floor_plan, (width, height), points, tiles=4, workers=2)
+
+    assert tiled_regions == regions
+    assert point_regions == {(x, y): labels[y][x] for x, y in points}
+
+
+def test_label_regions_tiled_pass_when_starts_no_more_processes_than_bands_or_cpus(monkeypatch):
+    started_workers = []
+
+    class RecordingExecutor(labeling.ProcessPoolExecutor):
+        def __init__(self, max_workers=None, **kwargs):
+            started_workers.append(max_workers)
+            super().__init__(max_workers=max_workers, **kwargs)
+
+    monkeypatch.setattr(labeling, "ProcessPoolExecutor", RecordingExecutor)
+    monkeypatch.setattr(labeling.os, "cpu_count", lambda: 3)
+    floor_plan = ["|  |"] * 8
+
+    for tiles in [1, 2, 8]:
+        label_regions_tiled(floor_plan, (4, 8), [(1, 0)], tiles=tiles)
+
+    assert started_workers == [2, 3]
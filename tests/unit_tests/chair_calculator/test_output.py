@@ -0,0 +1,264 @@
+import csv
+import io
+import json
+
+from src.chair_calculator.output import PlanStats, StatsWriter, shared_rooms, stats_document, stats_text
+
+STATS = PlanStats.from_rooms(
+    {
+        "kitchen": {"W": 1, "P": 0, "S": 2, "C": 0},
+        "office": {"W": 0, "P": 1, "S": 0, "C": 0},
+    }
+)
+
+
+def test_plan_stats_pass_when_sums_total_of_rooms():
+    assert STATS.total == {"W": 1, "P": 1, "S": 2, "C": 0}
+
+
+def test_plan_stats_pass_when_counts_region_shared_by_rooms_once_in_total():
+    shared_with = shared_rooms({"desk area": 1, "office": 1, "kitchen": 2})
+    stats = PlanStats.from_rooms(
+        {
+            "desk area": {"W": 0, "P": 1, "S": 0, "C": 0},
+            "kitchen": {"W": 1, "P": 0, "S": 2, "C": 0},
+            "office": {"W": 0, "P": 1, "S": 0, "C": 0},
+        },
+        shared_with,
+    )
+
+    assert shared_with == {"desk area": ["office"], "office": ["desk area"]}
+    assert stats.total == {"W": 1, "P": 1, "S": 2, "C": 0}
+    assert stats.shared_with == shared_with
+
+
+def test_stats_writer_pass_when_writes_shared_rooms_in_every_format():
+    stats = PlanStats.from_rooms(
+        {"desk area": {"W": 1, "P": 0, "S": 0, "C": 0}, "office": {"W": 1, "P": 0, "S": 0, "C": 0}},
+        {"desk area": ["office"], "office": ["desk area"]},
+    )
+    outputs = {output_format: io.StringIO() for output_format in ["text", "json", "jsonl", "csv"]}
+
+    for output_format, output in outputs.items():
+        with StatsWriter(output, output_format) as writer:
+            writer.write(stats)
+
+    # fmt: off
+    assert outputs["text"].getvalue() == (
+        "total:\n"
+        "W: 1, P: 0, S: 0, C: 0\n"
+        "desk area (shared with office):\n"
+        "W: 1, P: 0, S: 0, C: 0\n"
+        "office (shared with desk area):\n"
+        "W: 1, P: 0, S: 0, C: 0\n"
+        "\n"
+    )
+    # fmt: on
+    assert json.loads(outputs["json"].getvalue())["shared_with"] == {"desk area": ["office"], "office": ["desk area"]}
+    assert [record.get("shared_with") for record in map(json.loads, outputs["jsonl"].getvalue().splitlines())] == [
+        None,
+        ["office"],
+        ["desk area"],
+    ]
+    assert [row["shared_with"] for row in csv.DictReader(io.StringIO(outputs["csv"].getvalue()))] == [
+        "",
+        '["office"]',
+        '["desk area"]',
+    ]
+
+
+def test_stats_text_pass_when_returns_text_of_total_and_each_room():
+    assert stats_text(STATS) == (
+        "total:\n"
+        "W: 1, P: 1, S: 2, C: 0\n"
+        "kitchen:\n"
+        "W: 1, P: 0, S: 2, C: 0\n"
+        "office:\n"
+        "W: 0, P: 1, S: 0, C: 0\n"
+    )
+
+
+def test_stats_writer_fails_when_output_format_is_unknown():
+    try:
+        StatsWriter(io.StringIO(), "xml")
+        assert False, "ValueError should be raised when the output format is unknown."
+    except ValueError as e:
+        assert "The output format must be one of 'text', 'json', 'jsonl', 'csv'." == str(e)
+
+
+def test_stats_writer_pass_when_writes_text_with_headers_for_many_files():
+    output = io.StringIO()
+
+    with StatsWriter(output, "text", with_file_path=True) as writer:
+        writer.write(STATS, "a.txt")
+        writer.write(STATS, "b.txt")
+
+    assert output.getvalue() == f"==> a.txt <==\n{stats_text(STATS)}\n==> b.txt <==\n{stats_text(STATS)}\n"
+
+
+def test_stats_writer_pass_when_writes_json_object_or_array_for_many_files():
+    output = io.StringIO()
+    with StatsWriter(output, "json") as writer:
+        writer.write(STATS)
+
+    assert json.loads(output.getvalue()) == {"total": STATS.total, "rooms": STATS.rooms}
+
+    for file_paths in [[], ["a.txt", "b.txt"]]:
+        output = io.StringIO()
+        with StatsWriter(output, "json", with_file_path=True) as writer:
+            for file_path in file_paths:
+                writer.write(STATS, file_path)
+
+        assert json.loads(output.getvalue()) == [
+            {"file": file_path, "total": STATS.total, "rooms": STATS.rooms} for file_path in file_paths
+        ]
+
+
+def test_stats_writer_pass_when_writes_record_per_line_for_total_and_each_room():
+    output = io.StringIO()
+    with StatsWriter(output, "jsonl", with_file_path=True) as writer:
+        writer.write(STATS, "a.txt")
+
+    assert [json.loads(line) for line in output.getvalue().splitlines()] == [
+        {"file": "a.txt", "kind": "total", "room": None, "W": 1, "P": 1, "S": 2, "C": 0},
+        {"file": "a.txt", "kind": "room", "room": "kitchen", "W": 1, "P": 0, "S": 2, "C": 0},
+        {"file": "a.txt", "kind": "room", "room": "office", "W": 0, "P": 1, "S": 0, "C": 0},
+    ]
+
+    output = io.StringIO()
+    with StatsWriter(output, "csv") as writer:
+        writer.write(STATS)
+        writer.write(PlanStats.from_rooms({}))
+
+    assert output.getvalue() == (
+        "kind,room,W,P,S,C,shared_with\n"
+        "total,,1,1,2,0,\n"
+        "room,kitchen,1,0,2,0,\n"
+        "room,office,0,1,0,0,\n"
+        "total,,0,0,0,0,\n"
+    )
+
+
+def test_stats_writer_pass_when_leaves_out_total_not_calculated():
+    stats = PlanStats(None, {"kitchen": {"W": 1, "P": 0, "S": 2, "C": 0}})
+    outputs = {output_format: io.StringIO() for output_format in ["json", "jsonl", "csv"]}
+
+    for output_format, output in outputs.items():
+        with StatsWriter(output, output_format) as writer:
+            writer.write(stats)
+
+    assert stats_text(stats) == "kitchen:\nW: 1, P: 0, S: 2, C: 0\n"
+    assert json.loads(outputs["json"].getvalue()) == {"rooms": stats.rooms}
+    assert [json.loads(line)["kind"] for line in outputs["jsonl"].getvalue().splitlines()] == ["room"]
+    assert outputs["csv"].getvalue() == "kind,room,W,P,S,C,shared_with\nroom,kitchen,1,0,2,0,\n"
+
+
+def test_stats_writer_pass_when_writes_records_as_taken_with_total_last():
+    stats = PlanStats.from_rooms(
+        {
+            "office": {"W": 0, "P": 1, "S": 0, "C": 0},
+            "desk area": {"W": 0, "P": 1, "S": 0, "C": 0},
+            "kitchen": {"W": 1, "P": 0, "S": 2, "C": 0},
+        },
+        {"office": ["desk area"], "desk area": ["office"]},
+    )
+    records = [
+        (room, room_stats, (stats.shared_with or {}).get(room, [])) for room, room_stats in stats.rooms.items()
+    ] + [(None, stats.total, [])]
+    outputs = {output_format: io.StringIO() for output_format in ["text", "json", "jsonl", "csv"]}
+    expected_outputs = {output_format: io.StringIO() for output_format in outputs}
+
+    for output_format, output in outputs.items():
+        with StatsWriter(output, output_format) as writer:
+            writer.write_records(iter(records))
+        with StatsWriter(expected_outputs[output_format], output_format) as writer:
+            writer.write(stats)
+
+    # fmt: off
+    assert outputs["text"].getvalue() == (
+        "office (shared with desk area):\n"
+        "W: 0, P: 1, S: 0, C: 0\n"
+        "desk area (shared with office):\n"
+        "W: 0, P: 1, S: 0, C: 0\n"
+        "kitchen:\n"
+        "W: 1, P: 0, S: 2, C: 0\n"
+        "total:\n"
+        "W: 1, P: 1, S: 2, C: 0\n"
+        "\n"
+    )
+    # fmt: on
+    assert json.loads(outputs["json"].getvalue()) == json.loads(expected_outputs["json"].getvalue())
+    expected_lines = expected_outputs["jsonl"].getvalue().splitlines()
+    assert outputs["jsonl"].getvalue().splitlines() == expected_lines[1:] + expected_lines[:1]
+    assert outputs["csv"].getvalue() == (
+        "kind,room,W,P,S,C,shared_with\n"
+        "room,office,0,1,0,0,\"[\"\"desk area\"\"]\"\n"
+        "room,desk area,0,1,0,0,\"[\"\"office\"\"]\"\n"
+        "room,kitchen,1,0,2,0,\n"
+        "total,,1,1,2,0,\n"
+    )
+
+    output = io.StringIO()
+    with StatsWriter(output, "json", with_file_path=True) as writer:
+        for file_path in ["a.txt", "b.txt"]:
+            writer.write_records(iter(records), file_path)
+
+    assert json.loads(output.getvalue()) == [
+        {"file": file_path, **stats_document(stats)} for file_path in ["a.txt", "b.txt"]
+    ]
+
+
+def test_stats_writer_pass_when_closes_json_document_on_failed_record():
+    def failing_records():
+        yield "kitchen", STATS.rooms["kitchen"], []
+        raise ValueError("The floor plan is broken.")
+
+    for with_file_path in [False, True]:
+        output = io.StringIO()
+        try:
+            with StatsWriter(output, "json", with_file_path) as writer:
+                writer.write_records(failing_records(), "a.txt")
+            assert False, "ValueError should be raised when taking the record fails."
+        except ValueError as e:
+            assert "The floor plan is broken." == str(e)
+
+        document = {"rooms": {"kitchen": STATS.rooms["kitchen"]}}
+        expected_document = [{"file": "a.txt", **document}] if with_file_path else document
+        assert json.loads(output.getvalue()) == expected_document
+
+
+def test_stats_writer_pass_when_leaves_out_json_document_on_failed_first_record():
+    def failing_records():
+        raise ValueError("The floor plan is broken.")
+        yield
+
+    for with_file_path, expected_output in [(False, ""), (True, "[]\n")]:
+        output = io.StringIO()
+        try:
+            with StatsWriter(output, "json", with_file_path) as writer:
+                writer.write_records(failing_records(), "a.txt")
+            assert False, "ValueError should be raised when taking the record fails."
+        except ValueError as e:
+            assert "The floor plan is broken." == str(e)
+
+        assert output.getvalue() == expected_output
+
+
+def test_plan_stats_delta_pass_when_returns_changes_of_total_and_changed_rooms():
+    revised = PlanStats.from_rooms(
+        {
+            "kitchen": {"W": 0, "P": 0, "S": 2, "C": 1},
+            "office": {"W": 0, "P": 1, "S": 0, "C": 0},
+            "toilet": {"W": 0, "P": 0, "S": 0, "C": 1},
+        }
+    )
+
+    assert STATS.delta(revised) == PlanStats(
+        {"W": -1, "P": 0, "S": 0, "C": 2},
+        {
+            "kitchen": {"W": -1, "P": 0, "S": 0, "C": 1},
+            "toilet": {"W": 0, "P": 0, "S": 0, "C": 1},
+        },
+    )
+    assert revised.delta(STATS).rooms["toilet"] == {"W": 0, "P": 0, "S": 0, "C": -1}
+
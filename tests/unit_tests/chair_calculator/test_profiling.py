@@ -0,0 +1,52 @@
+from src.chair_calculator.profiling import PhaseStats, Profile
+
+
+def test_profile_pass_when_reports_phases_in_order_of_first_run():
+    profile = Profile()
+
+    with profile.phase("labels"):
+        pass
+    with profile.phase("fill"):
+        pass
+    with profile.phase("labels"):
+        pass
+
+    report = profile.report()
+    assert list(report["phases"]) == ["labels", "fill"]
+    assert report["phases"]["labels"]["calls"] == 2
+    assert report["phases"]["labels"]["peak_memory"] is None
+    assert report["total_seconds"] == sum(stats.seconds for stats in profile.phases)
+
+
+def test_profile_pass_when_traces_peak_memory_of_phase():
+    profile = Profile(trace_memory=True)
+
+    with profile.phase("allocate"):
+        buffer = bytearray(1_000_000)
+        del buffer
+
+    assert profile.report()["phases"]["allocate"]["peak_memory"] >= 1_000_000
+
+
+def test_profile_pass_when_calls_back_on_each_phase_and_sums_counters():
+    measured: list[PhaseStats] = []
+    profile = Profile(on_phase=measured.append)
+
+    with profile.phase("fill"):
+        profile.count("fills")
+        profile.count("fills", 2)
+
+    assert [stats.name for stats in measured] == ["fill"]
+    assert profile.report()["counters"] == {"fills": 3}
+
+
+def test_profile_pass_when_records_phase_that_raised():
+    profile = Profile()
+
+    try:
+        with profile.phase("labels"):
+            raise ValueError("Invalid plan.")
+    except ValueError:
+        pass
+
+    assert [stats.name for stats in profile.phases] == ["labels"]
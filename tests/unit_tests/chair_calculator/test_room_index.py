@@ -0,0 +1,57 @@
+import random
+
+from src.chair_calculator import room_index
+from src.chair_calculator.room_index import RoomIndex
+
+# fmt: off
+FLOOR_PLAN = "\n".join([
+    "+-----------+------+",
+    "|           |      |",
+    "|  (A)  W   | (B)  |",
+    "|           |      |",
+    "|     P     +------+",
+    "|           |      |",
+    "+------------------+",
+])
+# fmt: on
+
+
+def test_room_at_pass_when_returns_room_name_of_cell():
+    index = RoomIndex.from_text(FLOOR_PLAN)
+
+    assert index.room_at(1, 1) == "A"
+    assert index.room_at(3, 2) == "A", "should find room of label cells"
+    assert index.room_at(8, 2) == "A", "should find room of chair cells"
+    assert index.room_at(18, 1) == "B"
+    assert index.room_at(0, 0) is None, "should return None for walls"
+    assert index.room_at(15, 5) is None, "should return None for regions without label"
+
+
+def test_room_at_fails_when_cell_is_outside_of_plan():
+    index = RoomIndex.from_text(FLOOR_PLAN)
+
+    for x, y in [(-1, 0), (20, 0), (0, 7)]:
+        try:
+            index.room_at(x, y)
+            assert False, "ValueError should be raised when the cell is outside of the plan."
+        except ValueError as e:
+            assert f"The cell ({x}, {y}) is outside of the floor plan (20x7)." == str(e)
+
+
+def test_rooms_at_pass_when_returns_same_rooms_as_room_at_with_and_without_numpy(monkeypatch):
+    index = RoomIndex.from_text(FLOOR_PLAN)
+    points = [(x, y) for y in range(7) for x in range(20)]
+    random.Random(0).shuffle(points)
+    expected_rooms = [index.room_at(x, y) for x, y in points]
+
+    assert index.rooms_at(points) == expected_rooms
+    assert index.rooms_at([]) == []
+
+    monkeypatch.setattr(room_index, "np", None)
+    assert index.rooms_at(points) == expected_rooms
+
+    try:
+        index.rooms_at([(1, 1), (1, 7)])
+        assert False, "ValueError should be raised when the cell is outside of the plan."
+    except ValueError as e:
+        assert "The cell (1, 7) is outside of the floor plan (20x7)." == str(e)
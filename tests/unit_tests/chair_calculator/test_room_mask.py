@@ -1,4 +1,4 @@
-from src.chair_calculator.room import mask_room, print_mask
+from src.chair_calculator.room import RoomMask, mask_room, mask_room_spans, print_mask
 
 
 def test_mask_room_fails_when_floor_plan_mismatch_dimensions():
@@ -156,3 +156,64 @@ def test_mask_room_passes_when_fills_room_of_polygonal_shape():
 
 def test_print_mask_pass_when_returns_mask_as_str():
     assert print_mask(["*", " "]) == "*\n "
+
+
+def test_print_mask_fails_when_room_mask_given_without_floor_plan():
+    try:
+        print_mask(RoomMask([(0, 0, 0)]))
+        assert False, "ValueError should be raised when the room mask is given without the floor plan."
+    except ValueError as e:
+        assert "The floor plan is required to print the room mask." == str(e)
+
+
+def test_print_mask_pass_when_renders_room_mask_over_floor_plan():
+    assert print_mask(RoomMask([(1, 0, 1)]), floor_plan=["+-", "  "], filler="*") == "+-\n**"
+
+
+def test_mask_room_spans_fails_when_floor_plan_mismatch_dimensions():
+    try:
+        mask_room_spans(["     "], dimensions=(2, 1), seed_point=(1, 1))
+        assert False, "ValueError should be raised when the floor plan length does not match the dimensions."
+    except ValueError as e:
+        assert "The floor plan length (5) does not match the dimensions (2x1=2)." == str(e)
+
+
+def test_mask_room_spans_passes_when_fills_same_cells_as_mask_room():
+    # fmt: off
+    floor_plan = [
+       r"+----------+",
+       r"|          |",
+       r"|  +-+   + |",
+       r"| /   \ / \|",
+       r"|/     +   +",
+       r"+  W       |",
+       r"|          |",
+       r"+----------+"
+    ]
+    # fmt: on
+
+    room_mask = mask_room_spans(floor_plan, dimensions=(12, 8), seed_point=(4, 6))
+    mask = mask_room(floor_plan, dimensions=(12, 8), seed_point=(4, 6), filler="*")
+
+    assert room_mask.to_lines(floor_plan, "*") == mask
+    assert room_mask.area == 32
+    assert len(room_mask) == 32
+    assert list(room_mask.spans())[:3] == [(3, 3, 5), (3, 9, 9), (4, 2, 6)]
+    assert set(room_mask) == {(x, y) for y, line in enumerate(mask) for x, char in enumerate(line) if char == "*"}
+
+
+def test_room_mask_pass_when_checks_membership_of_points():
+    room_mask = RoomMask([(2, 4, 6), (1, 1, 2), (1, 5, 5)])
+
+    assert (1, 1) in room_mask
+    assert (2, 1) in room_mask
+    assert (5, 1) in room_mask
+    assert (6, 2) in room_mask
+
+    assert (3, 1) not in room_mask
+    assert (0, 1) not in room_mask
+    assert (6, 1) not in room_mask
+    assert (1, 0) not in room_mask
+    assert (7, 2) not in room_mask
+    assert (4, 3) not in room_mask
+    assert "point" not in room_mask
@@ -0,0 +1,94 @@
+from src.chair_calculator.floor_plan import filter_chairs, label_spans, normalize_floor_plan, room_label_coordinates
+from src.chair_calculator.profiling import Profile
+from src.chair_calculator.room_memo import RoomMemo, room_fingerprint
+from src.chair_calculator_main import chair_stats
+
+# fmt: off
+FLOOR_PLAN = "\n".join([
+    "+--------+--------+",
+    "|        |        |",
+    "| (A) W  | (B) W  |",
+    "|        |        |",
+    "+--------+--------+",
+])
+# fmt: on
+
+
+def unlabeled(plan_content):
+    floor_plan, dimensions = normalize_floor_plan(plan_content)
+    coords_by_room = room_label_coordinates(floor_plan, dimensions=dimensions)
+    return filter_chairs(floor_plan, label_coords=label_spans(coords_by_room)), dimensions
+
+
+def test_room_fingerprint_pass_when_same_for_same_geometry_at_other_place():
+    floor_plan, dimensions = unlabeled(FLOOR_PLAN)
+
+    room_a = room_fingerprint(floor_plan, dimensions, ((1, 1), (8, 3)), (2, 2))
+    room_b = room_fingerprint(floor_plan, dimensions, ((10, 1), (17, 3)), (11, 2))
+    other_point = room_fingerprint(floor_plan, dimensions, ((1, 1), (8, 3)), (3, 2))
+
+    assert room_a == room_b
+    assert room_a != other_point, "should differ for other point in the room"
+
+
+def test_room_fingerprint_pass_when_differs_for_changed_chair_or_wall():
+    floor_plan, dimensions = unlabeled(FLOOR_PLAN)
+    fingerprint = room_fingerprint(floor_plan, dimensions, ((1, 1), (8, 3)), (2, 2))
+
+    moved_chair = floor_plan.copy()
+    moved_chair[2] = "|      W |      W |"
+    open_wall = floor_plan.copy()
+    open_wall[2] = "|      W        W |"
+
+    assert room_fingerprint(moved_chair, dimensions, ((1, 1), (8, 3)), (2, 2)) != fingerprint
+    assert room_fingerprint(open_wall, dimensions, ((1, 1), (8, 3)), (2, 2)) != fingerprint
+
+
+def test_chair_stats_pass_when_skips_labeling_for_rooms_in_memo():
+    memo = RoomMemo()
+    chair_stats(FLOOR_PLAN, memo=memo)
+
+    profile = Profile()
+    stats = chair_stats(FLOOR_PLAN.replace("(A)", "(C)"), memo=memo, profile=profile)
+
+    assert stats == chair_stats(FLOOR_PLAN.replace("(A)", "(C)"))
+    assert profile.counters == {"memo_hits": 2, "memo_misses": 0}
+    assert "fill" not in [phase.name for phase in profile.phases]
+
+
+def test_chair_stats_pass_when_finds_rooms_of_same_name_moved_in_memo():
+    memo = RoomMemo()
+    chair_stats(FLOOR_PLAN, memo=memo)
+    moved_plan = "\n  " + FLOOR_PLAN.replace("\n", "\n  ")
+
+    profile = Profile()
+    stats = chair_stats(moved_plan, memo=memo, profile=profile)
+
+    assert stats == chair_stats(moved_plan)
+    assert profile.counters == {"memo_hits": 2, "memo_misses": 0}
+    assert "fill" not in [phase.name for phase in profile.phases]
+
+
+def test_chair_stats_pass_when_labels_plan_with_room_changed_since_memo():
+    memo = RoomMemo()
+    chair_stats(FLOOR_PLAN, memo=memo)
+    changed_plan = FLOOR_PLAN.replace("| (B) W  |", "| (B)  S |")
+
+    profile = Profile()
+    stats = chair_stats(changed_plan, memo=memo, profile=profile)
+
+    assert stats == chair_stats(changed_plan)
+    assert profile.counters["memo_hits"] == 1
+    assert profile.counters["memo_misses"] == 1
+    assert profile.counters["fills"] == 2
+
+
+def test_room_memo_pass_when_evicts_least_recently_used_rooms():
+    floor_plan, dimensions = unlabeled(FLOOR_PLAN)
+    memo = RoomMemo(max_entries=1)
+
+    memo.put(floor_plan, dimensions, "A", (2, 2), ((1, 1), (8, 3)), {"W": 1})
+    memo.put(floor_plan, dimensions, "B", (11, 2), ((10, 1), (17, 3)), {"W": 1})
+
+    assert memo.get(floor_plan, dimensions, "A", (2, 2)) is None
+    assert memo.get(floor_plan, dimensions, "B", (11, 2)) == (((10, 1), (17, 3)), {"W": 1})
@@ -0,0 +1,74 @@
+from src.chair_calculator.floor_plan import normalize_floor_plan
+from src.chair_calculator.room_selection import erase_room_labels, find_room_labels, selected_room_stats
+
+# fmt: off
+FLOOR_PLAN = "\n".join([
+    "+------------+-------+",
+    "|            |       |",
+    "| (office) W | (wc)  |",
+    "|            |   C   |",
+    "| (desk) P   |       |",
+    "|            +-------+",
+    "|            |   x   |",
+    "+------------+-------+",
+])
+# fmt: on
+
+
+def test_find_room_labels_pass_when_stops_after_selected_rooms_are_found():
+    floor_plan, dimensions = normalize_floor_plan(FLOOR_PLAN)
+    # The label after the selected ones has no margin, it's not reached
+    floor_plan[6] = "|            |(bad)  |"
+
+    assert find_room_labels(floor_plan, dimensions, ["office", "wc"]) == {"office": (2, 2), "wc": (15, 2)}
+
+
+def test_find_room_labels_fails_when_room_is_not_found():
+    floor_plan, dimensions = normalize_floor_plan(FLOOR_PLAN)
+
+    try:
+        find_room_labels(floor_plan, dimensions, ["office", "kitchen"])
+        assert False, "ValueError should be raised when the room is not found."
+    except ValueError as e:
+        assert "The room 'kitchen' is not found on the floor plan." == str(e)
+
+
+def test_find_room_labels_fails_when_selected_room_is_labeled_twice():
+    floor_plan, dimensions = normalize_floor_plan(FLOOR_PLAN)
+    floor_plan[6] = "|            | (wc)  |"
+
+    assert find_room_labels(floor_plan, dimensions, ["office"]) == {"office": (2, 2)}
+    try:
+        find_room_labels(floor_plan, dimensions, ["office", "wc"])
+        assert False, "ValueError should be raised when the selected room is labeled twice."
+    except ValueError as e:
+        assert "The floor plan should have only room labels and chair characters, '(' found." == str(e)
+
+
+def test_erase_room_labels_pass_when_replaces_labels_with_floor():
+    assert erase_room_labels(["| (a|b) W |", "+-------+"]) == ["|       W |", "+-------+"]
+
+
+def test_selected_room_stats_pass_when_fills_only_selected_regions():
+    floor_plan, dimensions = normalize_floor_plan(FLOOR_PLAN)
+
+    # The unlabeled region with the stray text is not validated
+    assert selected_room_stats(floor_plan, dimensions, ["wc", "desk"]) == (
+        {"desk": {"W": 1, "P": 1, "S": 0, "C": 0}, "wc": {"W": 0, "P": 0, "S": 0, "C": 1}},
+        {"desk": ["office"]},
+    )
+
+
+def test_selected_room_stats_fails_when_selected_region_is_invalid():
+    for y, row, error in [
+        (3, "|            |C      |", "The chair 'C' must have at least one space margin from each wall."),
+        (1, "| x          |       |", "The floor plan should have only room labels and chair characters, 'x' found."),
+    ]:
+        floor_plan, dimensions = normalize_floor_plan(FLOOR_PLAN)
+        floor_plan[y] = row
+
+        try:
+            selected_room_stats(floor_plan, dimensions, ["office", "wc"])
+            assert False, "ValueError should be raised when the selected region is invalid."
+        except ValueError as e:
+            assert error == str(e)
@@ -1,4 +1,4 @@
-from src.chair_calculator.room import stats_for_masked_chairs, stats_totals, str_stats
+from src.chair_calculator.room import measure_room, stats_for_masked_chairs, stats_totals, str_stats
 
 
 def test_stats_for_masked_chairs_fail_given_mask_smaller_than_floor_plan():
@@ -62,6 +62,61 @@ def test_stats_for_masked_chairs_pass_when_returns_chairs_stats_for_masked_room(
     assert stats_for_masked_chairs(floor_plan, mask=mask, filler="*") == {"W": 1, "P": 1, "S": 3, "C": 1}
 
 
+def test_measure_room_fails_when_floor_plan_mismatch_dimensions():
+    try:
+        measure_room(["     "], dimensions=(2, 1), seed_point=(1, 0))
+        assert False, "ValueError should be raised when the floor plan length does not match the dimensions."
+    except ValueError as e:
+        assert "The floor plan length (5) does not match the dimensions (2x1=2)." == str(e)
+
+
+def test_measure_room_fails_when_no_margin_around_chair():
+    # fmt: off
+    floor_plan = [
+       r"+----------+",
+       r"|        S |",
+       r"|  C       |",
+       r"+----------+"
+    ]
+    # fmt: on
+
+    try:
+        measure_room(floor_plan, dimensions=(12, 4), seed_point=(5, 1))
+        assert False, "ValueError should be raised when chair label is not surrounded by room markup chars."
+    except ValueError as e:
+        assert "The chair 'S' must have at least one space margin from each wall." == str(e)
+
+
+def test_measure_room_pass_when_returns_nothing_for_seed_point_on_wall_edge():
+    measure = measure_room(["+--+"], dimensions=(4, 1), seed_point=(3, 0))
+
+    assert measure.area == 0
+    assert measure.bounding_box is None
+    assert measure.chairs == {"W": 0, "P": 0, "S": 0, "C": 0}
+
+
+def test_measure_room_pass_when_returns_chairs_stats_bounding_box_and_area():
+    # fmt: off
+    floor_plan = [
+       r"+----------+",
+       r"|  S     C |",
+       r"|  +-+   + |",
+       r"| /   \ / \|",
+       r"|/  C  +   +",
+       r"+  W       |",
+       r"|  SS P  S |",
+       r"|          |",
+       r"+----------+"
+    ]
+    # fmt: on
+
+    measure = measure_room(floor_plan, dimensions=(12, 9), seed_point=(4, 6))
+
+    assert measure.chairs == {"W": 1, "P": 1, "S": 3, "C": 1}
+    assert measure.bounding_box == ((1, 3), (10, 7))
+    assert measure.area == 3 + 1 + 5 + 3 + 10 + 10 + 10
+
+
 def test_stats_totals_pass_when_return_zeroes_for_no_stats():
     assert stats_totals([]) == {"W": 0, "P": 0, "S": 0, "C": 0}
 
@@ -0,0 +1,182 @@
+import io
+
+from src.chair_calculator.streaming import (
+    iter_chair_stats,
+    iter_room_stats,
+    plan_rows,
+    plan_width,
+    stream_stats_per_room,
+)
+
+
+def test_plan_rows_pass_when_returns_same_rows_as_splitting_plan():
+    for plan in ["", "\n", "  a", "  a\n", "  a\n\n b", " \n  \n"]:
+        assert list(plan_rows(io.StringIO(plan))) == ([] if plan == "" else plan.split("\n"))
+
+    # Lines read without translating newlines keep their line ends
+    for plan in ["  a\r\n b\r\n", "  a\r b\r\r\n\r"]:
+        assert list(plan_rows(io.StringIO(plan, newline=""))) == io.StringIO(plan, newline=None).read().split("\n")
+
+
+def test_plan_width_pass_when_returns_longest_row_length():
+    assert plan_width(io.StringIO("")) == 0
+    assert plan_width(io.StringIO("  \n          x\n ")) == 11
+
+
+def test_iter_room_stats_fails_when_row_is_longer_than_width():
+    try:
+        list(iter_room_stats(io.StringIO("    \n     "), width=4))
+        assert False, "ValueError should be raised when the row is longer than the width."
+    except ValueError as e:
+        assert "The floor plan row 1 is longer than the width (4)." == str(e)
+
+
+def test_iter_room_stats_fails_when_no_margin_around_label():
+    try:
+        list(iter_room_stats(io.StringIO("            \n    (room 1)\n            "), width=12))
+        assert False, "ValueError should be raised when room label is not surrounded by room markup chars."
+    except ValueError as e:
+        assert "The room label must have at least one space margin from each wall." == str(e)
+
+
+def test_iter_room_stats_fails_when_non_chair_text_found():
+    try:
+        list(iter_room_stats(io.StringIO("+-----------+\n| C   P     |\n| comment W |\n+-----------+"), width=13))
+        assert False, "ValueError should be raised when the floor plan has non chair character text."
+    except ValueError as e:
+        assert "The floor plan should have only room labels and chair characters, 'c' found." == str(e)
+
+
+def test_iter_room_stats_fails_when_no_margin_around_chair_in_room():
+    # fmt: off
+    floor_plan = (
+        "+----------+\n"
+        "|  C       |\n"
+        "|   (A)    |\n"
+        "|          |\n"
+        "+----------+"
+    )
+    # fmt: on
+
+    try:
+        list(iter_room_stats(io.StringIO(floor_plan), width=12))
+        assert False, "ValueError should be raised when chair label is not surrounded by room markup chars."
+    except ValueError as e:
+        assert "The chair 'C' must have at least one space margin from each wall." == str(e)
+
+
+def test_iter_room_stats_pass_when_yields_rooms_as_their_regions_finish():
+    # The region of the room B is finished first although the label of the room A is read first
+    # fmt: off
+    floor_plan = (
+        "+-----+-----+\n"
+        "|     |     |\n"
+        "| (A) | (B) |\n"
+        "|     |     |\n"
+        "|  +--+-----+\n"
+        "|  |    P   |\n"
+        "|  |        |\n"
+        "|  +---+    |\n"
+        "|      |    |\n"
+        "|   C  |    |\n"
+        "|      |    |\n"
+        "+------+----+"
+    )
+    # fmt: on
+
+    assert list(iter_room_stats(io.StringIO(floor_plan), width=13)) == [
+        (1, "B", {"W": 0, "P": 0, "S": 0, "C": 0}),
+        (0, "A", {"W": 0, "P": 0, "S": 0, "C": 1}),
+    ]
+
+
+def test_stream_stats_per_room_pass_when_merges_regions_connected_below():
+    # fmt: off
+    floor_plan = (
+        "+-----+---+-----+\n"
+        "|     |   |     |\n"
+        "| (A) |   | (B) |\n"
+        "|     |   |     |\n"
+        "|  W  |   |     |\n"
+        "|     +---+     |\n"
+        "| S           C |\n"
+        "|               |\n"
+        "+---------------+\n"
+    )
+    # fmt: on
+
+    assert stream_stats_per_room(io.StringIO(floor_plan)) == {
+        "A": {"W": 1, "P": 0, "S": 1, "C": 1},
+        "B": {"W": 1, "P": 0, "S": 1, "C": 1},
+    }
+
+
+def test_stream_stats_per_room_fails_when_room_name_is_labeled_twice():
+    # fmt: off
+    floor_plan = (
+        "+-----+\n"
+        "|     |\n"
+        "| (A) |\n"
+        "|     |\n"
+        "+-----+\n"
+        "|     |\n"
+        "| (A) |\n"
+        "|  S  |\n"
+        "|     |\n"
+        "+-----+"
+    )
+    # fmt: on
+
+    try:
+        stream_stats_per_room(io.StringIO(floor_plan))
+        assert False, "ValueError should be raised when the room name is labeled twice."
+    except ValueError as e:
+        assert "The floor plan should have only room labels and chair characters, '(' found." == str(e)
+
+
+def test_iter_chair_stats_pass_when_yields_rooms_as_regions_finish_and_total_last():
+    # fmt: off
+    floor_plan = "\n".join([
+        "+-----+-------+",
+        "|     |       |",
+        "| (A) |  (C)  |",
+        "|  W  |       |",
+        "|     |  (D)  |",
+        "+-----+   P   |",
+        "|     |       |",
+        "| (B) |       |",
+        "|  S  |       |",
+        "|     |       |",
+        "+-----+-------+",
+    ])
+    # fmt: on
+
+    assert list(iter_chair_stats(io.StringIO(floor_plan))) == [
+        ("A", {"W": 1, "P": 0, "S": 0, "C": 0}, []),
+        ("B", {"W": 0, "P": 0, "S": 1, "C": 0}, []),
+        ("C", {"W": 0, "P": 1, "S": 0, "C": 0}, ["D"]),
+        ("D", {"W": 0, "P": 1, "S": 0, "C": 0}, ["C"]),
+        (None, {"W": 1, "P": 1, "S": 1, "C": 0}, []),
+    ]
+
+
+def test_iter_chair_stats_fails_when_room_name_is_labeled_twice():
+    # fmt: off
+    floor_plan = "\n".join([
+        "+-----+-----+",
+        "|     |     |",
+        "| (A) | (A) |",
+        "|  W  |  P  |",
+        "|     |     |",
+        "+-----+-----+",
+    ])
+    # fmt: on
+
+    records = iter_chair_stats(io.StringIO(floor_plan))
+
+    assert next(records) == ("A", {"W": 1, "P": 0, "S": 0, "C": 0}, [])
+    try:
+        next(records)
+        assert False, "ValueError should be raised when the room name is labeled twice."
+    except ValueError as e:
+        assert "The floor plan should have only room labels and chair characters, '(' found." == str(e)
@@ -1,5 +1,7 @@
+import random
+
 from src.chair_calculator.constants import Constants
-from src.chair_calculator.validator import validate_margin, validate_non_chair_chars
+from src.chair_calculator.validator import WallMap, validate_margin, validate_non_chair_chars
 
 
 def test_validate_margin_fails_when_no_margin_from_plan_border():
@@ -124,6 +126,60 @@ def test_validate_margin_fails_when_no_margin_from_room_walls():
         assert "No margin." == str(e)
 
 
+def test_wall_map_has_margin_pass_when_checks_chairs_and_labels():
+    # fmt: off
+    floor_plan = [
+        "+----------+",
+        "|          |",
+        "| (room) P |",
+        "|         S|",
+        "+----------+",
+    ]
+    # fmt: on
+    wall_map = WallMap(floor_plan)
+
+    assert wall_map.has_margin(start=(2, 2), end=(7, 2))
+    assert wall_map.has_margin(start=(9, 2), end=(9, 2))
+    assert not wall_map.has_margin(start=(10, 3), end=(10, 3))
+    assert not wall_map.has_margin(start=(1, 1), end=(10, 1))
+    assert not wall_map.touches_wall(9, 2)
+    assert wall_map.touches_wall(10, 3)
+
+    try:
+        wall_map.validate_margin(start=(10, 3), end=(10, 3), error_text="No margin.")
+        assert False, "ValueError should be raised when the chair is not surrounded by room markup chars."
+    except ValueError as e:
+        assert "No margin." == str(e)
+
+
+def test_wall_map_has_margin_pass_when_matches_validate_margin():
+    rng = random.Random(3)
+    for _plan in range(200):
+        height = rng.randint(1, 6)
+        floor_plan = ["".join(rng.choice("     |(a)W+") for _x in range(8)) for _y in range(height)]
+        wall_map = WallMap(floor_plan)
+
+        for y in range(height):
+            for start_x in range(8):
+                end_x = rng.randrange(8)
+                try:
+                    validate_margin(floor_plan, start=(start_x, y), end=(end_x, y), error_text="")
+                    has_margin = True
+                except ValueError:
+                    has_margin = False
+
+                assert wall_map.has_margin(start=(start_x, y), end=(end_x, y)) == has_margin
+
+                if floor_plan[y][start_x] in Constants.ROOM_MARKUP_CHARS:
+                    try:
+                        validate_margin(floor_plan, start=(start_x, y), end=(start_x, y), error_text="")
+                        has_margin = True
+                    except ValueError:
+                        has_margin = False
+
+                    assert wall_map.touches_wall(start_x, y) != has_margin
+
+
 def test_validate_non_chair_char_passes_given_spaces_chairs_walls():
     floor_plan = [f"{Constants.CHAIR_CHARS}" r" +/\|-   "]
 